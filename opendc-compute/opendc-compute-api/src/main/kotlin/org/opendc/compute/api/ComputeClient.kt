@@ -113,6 +113,30 @@ public interface ComputeClient : AutoCloseable {
         start: Boolean = true
     ): Server
 
+    /**
+     * Create a batch of new [Server] instances at this compute service in a single call, such as the servers of the
+     * tasks that become ready in the same scheduling cycle. The servers are created, watched and started in the order
+     * of [requests].
+     *
+     * @param requests The servers to deploy.
+     * @param watcher A [ServerWatcher] to register on every server before it is started, or `null`.
+     * @param start A flag to indicate that the servers should be started immediately.
+     */
+    public suspend fun newServers(
+        requests: List<ServerRequest>,
+        watcher: ServerWatcher? = null,
+        start: Boolean = true
+    ): List<Server> = requests.map { request ->
+        val server = newServer(request.name, request.image, request.flavor, request.labels, request.meta, start = false)
+        if (watcher != null) {
+            server.watch(watcher)
+        }
+        if (start) {
+            server.start()
+        }
+        server
+    }
+
     /**
      * Release the resources associated with this client, preventing any further API calls.
      */
@@ -28,7 +28,9 @@ import org.opendc.compute.api.ComputeClient
 import org.opendc.compute.api.Flavor
 import org.opendc.compute.api.Image
 import org.opendc.compute.api.Server
+import org.opendc.compute.api.ServerRequest
 import org.opendc.compute.api.ServerState
+import org.opendc.compute.api.ServerWatcher
 import org.opendc.compute.service.ComputeService
 import org.opendc.compute.service.driver.Host
 import org.opendc.compute.service.driver.HostListener
@@ -197,6 +199,47 @@ internal class ComputeServiceImpl(
             ): Server {
                 check(!isClosed) { "Client is closed" }
 
+                val server = createServer(name, image, flavor, labels, meta)
+
+                if (start) {
+                    server.start()
+                }
+
+                return ClientServer(server)
+            }
+
+            override suspend fun newServers(
+                requests: List<ServerRequest>,
+                watcher: ServerWatcher?,
+                start: Boolean
+            ): List<Server> {
+                check(!isClosed) { "Client is closed" }
+
+                val result = ArrayList<Server>(requests.size)
+                for (request in requests) {
+                    val server = ClientServer(createServer(request.name, request.image, request.flavor, request.labels, request.meta))
+
+                    if (watcher != null) {
+                        server.watch(watcher)
+                    }
+
+                    if (start) {
+                        server.start()
+                    }
+
+                    result.add(server)
+                }
+
+                return result
+            }
+
+            private fun createServer(
+                name: String,
+                image: Image,
+                flavor: Flavor,
+                labels: Map<String, String>,
+                meta: Map<String, Any>
+            ): InternalServer {
                 val uid = UUID(clock.millis(), random.nextLong())
                 val server = InternalServer(
                     this@ComputeServiceImpl,
@@ -210,12 +253,7 @@ internal class ComputeServiceImpl(
 
                 serverById[uid] = server
                 servers.add(server)
-
-                if (start) {
-                    server.start()
-                }
-
-                return ClientServer(server)
+                return server
             }
 
             override suspend fun findServer(id: UUID): Server? {
@@ -387,6 +425,7 @@ internal class ComputeServiceImpl(
                 hv.instanceCount++
                 hv.provisionedCores += server.flavor.cpuCount
                 hv.availableMemory -= server.flavor.memorySize
+                scheduler.updateHost(hv)
 
                 activeServers[server] = host
             } catch (e: Throwable) {
@@ -454,6 +493,7 @@ internal class ComputeServiceImpl(
                 hv.provisionedCores -= server.flavor.cpuCount
                 hv.instanceCount--
                 hv.availableMemory += server.flavor.memorySize
+                scheduler.updateHost(hv)
             } else {
                 logger.error { "Unknown host $host" }
             }
@@ -40,6 +40,11 @@ public interface ComputeScheduler {
      */
     public fun removeHost(host: HostView)
 
+    /**
+     * Notify the scheduler that the provisioned capacity of the specified [host] has changed.
+     */
+    public fun updateHost(host: HostView) {}
+
     /**
      * Select a host for the specified [server].
      *
@@ -26,14 +26,16 @@ import org.opendc.compute.api.Server
 import org.opendc.compute.service.internal.HostView
 import java.time.Clock
 import java.util.Random
+import kotlin.math.abs
+import kotlin.math.max
 import kotlin.math.min
 
 /**
- * A [ComputeScheduler] implementation that uses filtering and weighing passes to select
- * the host to schedule a [Server] on.
+ * A [ComputeScheduler] implementation that places a task on the most power-efficient host that fits it and is
+ * capable of executing it within its slack.
 
- * This implementation is based on the filter scheduler from OpenStack Nova.
- * See: https://docs.openstack.org/nova/latest/user/filter-scheduler.html
+ * The hosts are kept in an index ordered by power efficiency, which tracks the free capacity of every host (see
+ * [ComputeScheduler.updateHost]), so a placement does not filter and sort all hosts.
  *
  * @param clock The clock from the provisioner
  * @param subsetSize The size of the subset of best hosts from which a target is randomly chosen.
@@ -49,7 +51,7 @@ public class TaskFlowScheduler(
     /**
      * The pool of hosts available to the scheduler.
      */
-    private val hosts = mutableListOf<HostView>()
+    private val hosts = HostIndex()
 
     private val WORKFLOW_TASK_SLACK: String = "workflow:task:slack"
     private val WORKFLOW_TASK_MINIMAL_START_TIME: String = "workflow:task:minimalStartTime"
@@ -71,6 +73,10 @@ public class TaskFlowScheduler(
         hosts.remove(host)
     }
 
+    override fun updateHost(host: HostView) {
+        hosts.update(host)
+    }
+
     override fun select(server: Server): HostView? {
         // Get the simulated time. Starts at 0 when the simulator starts.
         val currentTime: Long = clock.millis()
@@ -95,40 +101,201 @@ public class TaskFlowScheduler(
         // We know the amount of FLOPs for the task. This is the total amount of FLOPs, so we can divide by the core count.
         val flopWorkload = server.meta[TASK_WORKLOAD] as Long
 
-        // Filter the hosts according to the requirements of the task.
-        val filteredHosts1: MutableList<HostView> = hosts
-        val filteredHosts2 = filteredHosts1.filter { host -> (host.host.model.cpuCount - host.provisionedCores) > cpuDemand }
-        val filteredHosts3 = filteredHosts2.filter { host -> (host.availableMemory) > ramDemand }
-
-        val sorted = filteredHosts3.sortedWith { a, b ->
-            val eff1: Double = (a.host.meta[HOSTSPEC_POWEREFFICIENCY] as Double)
-            val eff2: Double = (b.host.meta[HOSTSPEC_POWEREFFICIENCY] as Double)
-            when {
-                eff1 > eff2 -> 1
-                eff1 < eff2 -> -1
-                else -> 0
+        // Choose the host that is the most efficient and capable of executing the task in time.
+        val host = hosts.firstFit(cpuDemand, ramDemand, flopWorkload, slack)
+        if (host != null) {
+            return host
+        }
+
+        // If we get here, there is no best host, so return one at random.
+        val candidates = hosts.fits(cpuDemand, ramDemand)
+        return when (val maxSize = candidates.size) {
+            0 -> null
+            1 -> candidates[0]
+            else -> candidates[random.nextInt(maxSize)]
+        }
+    }
+
+    /**
+     * The specification of a host, read once from its metadata when the host is added.
+     */
+    private inner class HostEntry(val view: HostView, val sequence: Long) {
+        val powerEfficiency: Double = view.host.meta[HOSTSPEC_POWEREFFICIENCY] as Double
+
+        // Assume one FLOP per cycle.
+        val fastestFreq: Double = (view.host.meta[HOSTSPEC_FASTESTFREQ] as? Number)?.toDouble() ?: 1000.0
+        val normalizedSpeed: Double = (view.host.meta[HOSTSPEC_NORMALIZEDSPEED] as? Number)?.toDouble() ?: 1.0
+
+        /**
+         * The delay of a task on this host compared to a host of normalized speed 1, per FLOP per core.
+         */
+        val delay: Double = (1 / normalizedSpeed - 1) / fastestFreq
+
+        /**
+         * The sum of the normal and expected runtime per FLOP per core, which bounds the rounding error of a
+         * comparison of the two.
+         */
+        val scale: Double = (1 + 1 / normalizedSpeed) / fastestFreq
+
+        /**
+         * The index of the host in the order of power efficiency.
+         */
+        var position: Int = -1
+
+        val freeCores: Int
+            get() = view.host.model.cpuCount - view.provisionedCores
+
+        /**
+         * Determine whether a task of [flopWorkload] FLOPs on [cpuDemand] cores finishes within its [slack] here.
+         */
+        fun fitsInTime(flopWorkload: Long, cpuDemand: Int, slack: Long): Boolean {
+            val normalRuntime = flopWorkload / (fastestFreq * cpuDemand)
+            val expectedRuntime = normalRuntime / normalizedSpeed
+            return expectedRuntime <= normalRuntime + slack
+        }
+    }
+
+    /**
+     * An index of the hosts in the order of power efficiency (ties in the order in which the hosts were added).
+     *
+     * The index is a segment tree over this order, in which every node holds the maximum free cores and free memory
+     * and the minimum [HostEntry.delay] of the hosts below it. A placement descends into the leftmost subtrees that
+     * may hold a fitting host, so it costs logarithmic time in the number of hosts unless many hosts fit one of the
+     * bounds but not the others. The order is rebuilt lazily after hosts are added or removed.
+     */
+    private inner class HostIndex {
+        private val entries = HashMap<HostView, HostEntry>()
+        private var sorted = emptyArray<HostEntry>()
+        private var sequence = 0L
+        private var isDirty = false
+
+        /**
+         * The number of leaves of the tree, a power of two. Node 1 is the root and node `i` has children `2i` and
+         * `2i + 1`.
+         */
+        private var leaves = 1
+        private var maxCores = IntArray(2)
+        private var maxMemory = LongArray(2)
+        private var minDelay = DoubleArray(2)
+        private var maxScale = DoubleArray(2)
+
+        fun add(host: HostView) {
+            entries[host] = HostEntry(host, sequence++)
+            isDirty = true
+        }
+
+        fun remove(host: HostView) {
+            if (entries.remove(host) != null) {
+                isDirty = true
             }
         }
 
-        // Choose the host that is the most efficient and capable of executing the task in time.
-        for (host in sorted) {
-            // Assume one FLOP per cycle. Default value is not used.
-            val normalFlopsPerSecond = host.host.meta.getOrDefault(HOSTSPEC_FASTESTFREQ, 1000) as Double
-            val normalizedSpeed = host.host.meta.getOrDefault(HOSTSPEC_NORMALIZEDSPEED, 1.0) as Double
-            val normalRuntime = flopWorkload / (normalFlopsPerSecond * cpuDemand)
-            val expectedRuntime = normalRuntime /  normalizedSpeed
-
-            // Task fits, so we select this host.
-            if (expectedRuntime <= normalRuntime + slack) {
-                return host
+        fun update(host: HostView) {
+            if (isDirty) {
+                return
+            }
+
+            val entry = entries[host] ?: return
+            var node = leaves + entry.position
+            setLeaf(node, entry)
+            node = node shr 1
+            while (node >= 1) {
+                pull(node)
+                node = node shr 1
             }
         }
 
-        // If we get here, there is no best host, so return one at random.
-        return when (val maxSize = sorted.size) {
-            0 -> null
-            1 -> sorted[0]
-            else -> sorted[random.nextInt(maxSize)]
+        /**
+         * Return the first host in the order of power efficiency with more than [cpuDemand] free cores and more than
+         * [ramDemand] free memory on which a task of [flopWorkload] FLOPs finishes within its [slack].
+         */
+        fun firstFit(cpuDemand: Int, ramDemand: Long, flopWorkload: Long, slack: Long): HostView? {
+            refresh()
+            return firstFit(1, cpuDemand, ramDemand, flopWorkload, flopWorkload.toDouble() / cpuDemand, slack)
+        }
+
+        private fun firstFit(node: Int, cpuDemand: Int, ramDemand: Long, flopWorkload: Long, flopsPerCore: Double, slack: Long): HostView? {
+            if (maxCores[node] <= cpuDemand || maxMemory[node] <= ramDemand) {
+                return null
+            }
+
+            // Skip the subtree if no host finishes in time, with a margin for the rounding of the exact check below
+            val margin = 1e-9 * (flopsPerCore * maxScale[node] + abs(slack.toDouble()))
+            if (flopsPerCore * minDelay[node] - slack > margin) {
+                return null
+            }
+
+            if (node >= leaves) {
+                val entry = sorted[node - leaves]
+                return if (entry.fitsInTime(flopWorkload, cpuDemand, slack)) entry.view else null
+            }
+
+            return firstFit(2 * node, cpuDemand, ramDemand, flopWorkload, flopsPerCore, slack)
+                ?: firstFit(2 * node + 1, cpuDemand, ramDemand, flopWorkload, flopsPerCore, slack)
+        }
+
+        /**
+         * Return the hosts with more than [cpuDemand] free cores and more than [ramDemand] free memory, in the order
+         * of power efficiency.
+         */
+        fun fits(cpuDemand: Int, ramDemand: Long): List<HostView> {
+            refresh()
+            val result = ArrayList<HostView>()
+            collect(1, cpuDemand, ramDemand, result)
+            return result
+        }
+
+        private fun collect(node: Int, cpuDemand: Int, ramDemand: Long, result: MutableList<HostView>) {
+            if (maxCores[node] <= cpuDemand || maxMemory[node] <= ramDemand) {
+                return
+            } else if (node >= leaves) {
+                result.add(sorted[node - leaves].view)
+                return
+            }
+
+            collect(2 * node, cpuDemand, ramDemand, result)
+            collect(2 * node + 1, cpuDemand, ramDemand, result)
+        }
+
+        /**
+         * Rebuild the order and the tree if hosts were added or removed.
+         */
+        private fun refresh() {
+            if (!isDirty) {
+                return
+            }
+
+            isDirty = false
+            sorted = entries.values.sortedWith(compareBy<HostEntry> { it.powerEfficiency }.thenBy { it.sequence }).toTypedArray()
+            leaves = Integer.highestOneBit(max(1, sorted.size - 1)) shl 1
+            maxCores = IntArray(2 * leaves) { Int.MIN_VALUE }
+            maxMemory = LongArray(2 * leaves) { Long.MIN_VALUE }
+            minDelay = DoubleArray(2 * leaves) { Double.POSITIVE_INFINITY }
+            maxScale = DoubleArray(2 * leaves)
+
+            for ((position, entry) in sorted.withIndex()) {
+                entry.position = position
+                setLeaf(leaves + position, entry)
+            }
+            for (node in leaves - 1 downTo 1) {
+                pull(node)
+            }
+        }
+
+        private fun setLeaf(node: Int, entry: HostEntry) {
+            maxCores[node] = entry.freeCores
+            maxMemory[node] = entry.view.availableMemory
+            minDelay[node] = entry.delay
+            maxScale[node] = entry.scale
+        }
+
+        private fun pull(node: Int) {
+            val left = 2 * node
+            val right = left + 1
+            maxCores[node] = max(maxCores[left], maxCores[right])
+            maxMemory[node] = max(maxMemory[left], maxMemory[right])
+            minDelay[node] = min(minDelay[left], minDelay[right])
+            maxScale[node] = max(maxScale[left], maxScale[right])
         }
     }
 }
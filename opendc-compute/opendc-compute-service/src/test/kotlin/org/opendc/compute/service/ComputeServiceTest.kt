@@ -25,7 +25,9 @@ package org.opendc.compute.service
 import io.mockk.coEvery
 import io.mockk.coVerify
 import io.mockk.every
+import io.mockk.just
 import io.mockk.mockk
+import io.mockk.runs
 import io.mockk.slot
 import io.mockk.verify
 import kotlinx.coroutines.delay
@@ -37,6 +39,7 @@ import org.junit.jupiter.api.assertThrows
 import org.opendc.compute.api.Flavor
 import org.opendc.compute.api.Image
 import org.opendc.compute.api.Server
+import org.opendc.compute.api.ServerRequest
 import org.opendc.compute.api.ServerState
 import org.opendc.compute.api.ServerWatcher
 import org.opendc.compute.service.driver.Host
@@ -91,6 +94,7 @@ internal class ComputeServiceTest {
         assertThrows<IllegalStateException> { client.newFlavor("test", 1, 2) }
         assertThrows<IllegalStateException> { client.newImage("test") }
         assertThrows<IllegalStateException> { client.newServer("test", mockk(), mockk()) }
+        assertThrows<IllegalStateException> { client.newServers(emptyList()) }
     }
 
     @Test
@@ -119,6 +123,31 @@ internal class ComputeServiceTest {
         assertThrows<IllegalStateException> { server.start() }
     }
 
+    @Test
+    fun testClientCreateBatch() = scope.runSimulation {
+        val client = service.newClient()
+
+        val small = client.newFlavor("small", 1, 512)
+        val large = client.newFlavor("large", 2, 512)
+        val image = client.newImage("test")
+        val watcher = mockk<ServerWatcher>(relaxUnitFun = true)
+        val requests = listOf(
+            ServerRequest("a", image, small),
+            ServerRequest("b", image, large, labels = mapOf("key" to "value")),
+            ServerRequest("c", image, small)
+        )
+
+        val servers = client.newServers(requests, watcher, start = false)
+        assertEquals(listOf("a", "b", "c"), servers.map { it.name })
+        assertEquals(listOf(small, large, small), servers.map { it.flavor })
+        assertEquals(mapOf("key" to "value"), servers[1].labels)
+        assertEquals(servers.toSet(), client.queryServers().toSet())
+        assertEquals(listOf(ServerState.TERMINATED, ServerState.TERMINATED, ServerState.TERMINATED), servers.map { it.state })
+
+        val empty = client.newServers(emptyList())
+        assertEquals(emptyList<Server>(), empty)
+    }
+
     @Test
     fun testClientOnClose() = scope.runSimulation {
         service.close()
@@ -366,6 +395,46 @@ internal class ComputeServiceTest {
         verify { watcher.onStateChanged(server, ServerState.TERMINATED) }
     }
 
+    @Test
+    fun testServerDeployBatch() = scope.runSimulation {
+        val host = mockk<Host>(relaxUnitFun = true)
+        val listeners = mutableListOf<HostListener>()
+        val spawned = mutableListOf<Server>()
+
+        every { host.uid } returns UUID.randomUUID()
+        every { host.model } returns HostModel(4 * 2600.0, 4, 2048)
+        every { host.state } returns HostState.UP
+        every { host.canFit(any()) } returns true
+        every { host.addListener(any()) } answers { listeners.add(it.invocation.args[0] as HostListener) }
+        every { host.spawn(capture(spawned)) } just runs
+
+        service.addHost(host)
+
+        val client = service.newClient()
+        val flavor = client.newFlavor("test", 1, 512)
+        val image = client.newImage("test")
+        val watcher = mockk<ServerWatcher>(relaxUnitFun = true)
+        val requests = List(3) { ServerRequest("test-$it", image, flavor) }
+
+        // Start servers
+        val servers = client.newServers(requests, watcher)
+        assertEquals(listOf(ServerState.PROVISIONING, ServerState.PROVISIONING, ServerState.PROVISIONING), servers.map { it.state })
+
+        delay(5L * 60 * 1000)
+        assertEquals(listOf("test-0", "test-1", "test-2"), spawned.map { it.name })
+
+        for (server in spawned) {
+            listeners.forEach { it.onStateChanged(host, server, ServerState.RUNNING) }
+        }
+
+        for (server in servers) {
+            server.refresh()
+            assertEquals(ServerState.RUNNING, server.state)
+
+            verify { watcher.onStateChanged(server, ServerState.RUNNING) }
+        }
+    }
+
     @Test
     fun testServerDeployFailure() = scope.runSimulation {
         val host = mockk<Host>(relaxUnitFun = true)
@@ -0,0 +1,131 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.compute.service.scheduler
+
+import io.mockk.every
+import io.mockk.mockk
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertNull
+import org.junit.jupiter.api.Test
+import org.junit.jupiter.api.assertAll
+import org.opendc.compute.api.Server
+import org.opendc.compute.service.internal.HostView
+import java.time.Clock
+import java.time.Instant
+import java.time.ZoneOffset
+
+/**
+ * Test suite for the [TaskFlowScheduler].
+ */
+internal class TaskFlowSchedulerTest {
+    private val clock = Clock.fixed(Instant.EPOCH, ZoneOffset.UTC)
+
+    @Test
+    fun testNoHosts() {
+        val scheduler = TaskFlowScheduler(clock)
+
+        assertNull(scheduler.select(createServer(cpuCount = 2, slack = 0)))
+    }
+
+    @Test
+    fun testMostEfficientInTime() {
+        val scheduler = TaskFlowScheduler(clock)
+
+        val hostA = createHost(powerEfficiency = 1.0, normalizedSpeed = 0.5)
+        val hostB = createHost(powerEfficiency = 2.0, normalizedSpeed = 1.0)
+        val hostC = createHost(powerEfficiency = 3.0, normalizedSpeed = 1.0)
+
+        scheduler.addHost(hostC)
+        scheduler.addHost(hostA)
+        scheduler.addHost(hostB)
+
+        // The task runs for 1000 ms on a host of normalized speed 1 and twice as long on host A
+        assertAll(
+            { assertEquals(hostB, scheduler.select(createServer(cpuCount = 2, slack = 0))) },
+            { assertEquals(hostA, scheduler.select(createServer(cpuCount = 2, slack = 1000))) }
+        )
+    }
+
+    @Test
+    fun testCapacity() {
+        val scheduler = TaskFlowScheduler(clock)
+
+        val hostA = createHost(powerEfficiency = 1.0, normalizedSpeed = 1.0)
+        val hostB = createHost(powerEfficiency = 2.0, normalizedSpeed = 1.0)
+
+        scheduler.addHost(hostA)
+        scheduler.addHost(hostB)
+
+        val server = createServer(cpuCount = 2, slack = 0)
+        assertEquals(hostA, scheduler.select(server))
+
+        every { hostA.provisionedCores } returns 6
+        scheduler.updateHost(hostA)
+        assertEquals(hostB, scheduler.select(server))
+
+        every { hostA.provisionedCores } returns 0
+        scheduler.updateHost(hostA)
+        every { hostA.availableMemory } returns 512
+        scheduler.updateHost(hostA)
+        assertEquals(hostB, scheduler.select(server))
+
+        scheduler.removeHost(hostB)
+        assertNull(scheduler.select(server))
+    }
+
+    @Test
+    fun testRandomWhenNotInTime() {
+        val scheduler = TaskFlowScheduler(clock)
+
+        val hostA = createHost(powerEfficiency = 1.0, normalizedSpeed = 0.5)
+
+        scheduler.addHost(hostA)
+
+        assertEquals(hostA, scheduler.select(createServer(cpuCount = 2, slack = 0)))
+    }
+
+    private fun createHost(powerEfficiency: Double, normalizedSpeed: Double): HostView {
+        val host = mockk<HostView>()
+        every { host.host.meta } returns mapOf(
+            "hostspec:powerEfficiency" to powerEfficiency,
+            "hostspec:normalizedSpeed" to normalizedSpeed,
+            "hostspec:fastestFreq" to 1000.0
+        )
+        every { host.host.model.cpuCount } returns 8
+        every { host.provisionedCores } returns 0
+        every { host.availableMemory } returns 2048
+        return host
+    }
+
+    private fun createServer(cpuCount: Int, slack: Long): Server {
+        val server = mockk<Server>()
+        every { server.flavor.cpuCount } returns cpuCount
+        every { server.flavor.memorySize } returns 1024
+        every { server.meta } returns mapOf(
+            "workflow:task:slack" to slack,
+            "workflow:task:minimalStartTime" to 0L,
+            "workload_flops" to 2_000_000L
+        )
+        return server
+    }
+}
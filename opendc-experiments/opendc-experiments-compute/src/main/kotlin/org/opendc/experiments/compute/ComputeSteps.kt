@@ -55,13 +55,16 @@ public fun setupComputeService(
  * @param serviceDomain The service domain at which the [ComputeService] is located.
  * @param monitor The [ComputeMonitor] to install.
  * @param exportInterval The interval between which to collect the metrics.
+ * @param changeThreshold The threshold for change-driven sampling, or `null` to export every host and server every
+ * interval (see [ComputeMetricReader]).
  */
 public fun registerComputeMonitor(
     serviceDomain: String,
     monitor: ComputeMonitor,
-    exportInterval: Duration = Duration.ofMinutes(5)
+    exportInterval: Duration = Duration.ofMinutes(5),
+    changeThreshold: Double? = null
 ): ProvisioningStep {
-    return ComputeMonitorProvisioningStep(serviceDomain, monitor, exportInterval)
+    return ComputeMonitorProvisioningStep(serviceDomain, monitor, exportInterval, changeThreshold)
 }
 
 /**
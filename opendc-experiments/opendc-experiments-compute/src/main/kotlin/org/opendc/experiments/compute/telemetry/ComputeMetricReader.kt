@@ -38,6 +38,7 @@ import org.opendc.experiments.compute.telemetry.table.ServiceTableReader
 import java.time.Clock
 import java.time.Duration
 import java.time.Instant
+import kotlin.math.abs
 
 /**
  * A helper class to collect metrics from a [ComputeService] instance and automatically export the metrics every
@@ -48,13 +49,20 @@ import java.time.Instant
  * @param service The [ComputeService] to monitor.
  * @param monitor The monitor to export the metrics to.
  * @param exportInterval The export interval.
+ * @param changeThreshold The threshold for change-driven sampling, or `null` to export every host and server every
+ * export interval. With a threshold, a host or server is only exported when its state changed since its last export:
+ * its guests, capacity or availability changed, or its CPU utilization (or share of active CPU time) moved by more
+ * than the threshold, or its power draw by more than the threshold as a fraction. The cumulative metrics of an export
+ * (such as the energy usage) then span all intervals since the previous export of the host or server, and the pending
+ * intervals are exported when the reader is closed. The service is exported every export interval in both modes.
  */
 public class ComputeMetricReader(
     scope: CoroutineScope,
     clock: Clock,
     private val service: ComputeService,
     private val monitor: ComputeMonitor,
-    private val exportInterval: Duration = Duration.ofMinutes(5)
+    private val exportInterval: Duration = Duration.ofMinutes(5),
+    private val changeThreshold: Double? = null
 ) : AutoCloseable {
     private val logger = KotlinLogging.logger {}
 
@@ -83,6 +91,7 @@ public class ComputeMetricReader(
         val hostTableReaders = hostTableReaders
         val serverTableReaders = serverTableReaders
         val serviceTableReader = serviceTableReader
+        val changeThreshold = changeThreshold
 
         try {
             while (isActive) {
@@ -94,15 +103,19 @@ public class ComputeMetricReader(
                     for (host in service.hosts) {
                         val reader = hostTableReaders.computeIfAbsent(host) { HostTableReaderImpl(it) }
                         reader.record(now)
-                        monitor.record(reader)
-                        reader.reset()
+                        if (changeThreshold == null || reader.hasChanged(changeThreshold)) {
+                            monitor.record(reader)
+                            reader.reset()
+                        }
                     }
 
                     for (server in service.servers) {
                         val reader = serverTableReaders.computeIfAbsent(server) { ServerTableReaderImpl(service, it) }
                         reader.record(now)
-                        monitor.record(reader)
-                        reader.reset()
+                        if (changeThreshold == null || reader.hasChanged(changeThreshold)) {
+                            monitor.record(reader)
+                            reader.reset()
+                        }
                     }
 
                     serviceTableReader.record(now)
@@ -119,9 +132,37 @@ public class ComputeMetricReader(
     }
 
     override fun close() {
+        flush()
         job.cancel()
     }
 
+    /**
+     * Export the hosts and servers whose last recorded intervals were held back by change-driven sampling.
+     */
+    private fun flush() {
+        if (changeThreshold == null) {
+            return
+        }
+
+        try {
+            for (reader in hostTableReaders.values) {
+                if (reader.isPending) {
+                    monitor.record(reader)
+                    reader.reset()
+                }
+            }
+
+            for (reader in serverTableReaders.values) {
+                if (reader.isPending) {
+                    monitor.record(reader)
+                    reader.reset()
+                }
+            }
+        } catch (cause: Throwable) {
+            logger.warn(cause) { "Exporter threw an Exception" }
+        }
+    }
+
     /**
      * An aggregator for service metrics before they are reported.
      */
@@ -267,13 +308,38 @@ public class ComputeMetricReader(
             get() = _bootTime
         private var _bootTime: Instant? = null
 
+        /**
+         * A flag to indicate that the host was down during the last recorded cycle.
+         */
+        private var _isDown = false
+
+        /**
+         * A flag to indicate that the recorded cycles have not been exported yet.
+         */
+        var isPending = false
+            private set
+
+        /**
+         * The state of the host at its last export, against which change-driven sampling compares.
+         */
+        private var exported = false
+        private var exportedGuests = 0L
+        private var exportedCpuLimit = 0.0
+        private var exportedCpuUtilization = 0.0
+        private var exportedPowerUsage = 0.0
+        private var exportedIsDown = false
+        private var exportedBootTime: Instant? = null
+
         /**
          * Record the next cycle.
          */
         fun record(now: Instant) {
             val hostCpuStats = _host.getCpuStats()
             val hostSysStats = _host.getSystemStats()
+            val downtime = hostSysStats.downtime.toMillis()
 
+            isPending = true
+            _isDown = downtime > _downtime
             _timestamp = now
             _guestsTerminated = hostSysStats.guestsTerminated
             _guestsRunning = hostSysStats.guestsRunning
@@ -290,14 +356,45 @@ public class ComputeMetricReader(
             _powerUsage = hostSysStats.powerUsage
             _powerTotal = hostSysStats.energyUsage
             _uptime = hostSysStats.uptime.toMillis()
-            _downtime = hostSysStats.downtime.toMillis()
+            _downtime = downtime
             _bootTime = hostSysStats.bootTime
         }
 
+        /**
+         * Determine whether the state of the host in the last recorded cycle differs from its last export by more than
+         * [threshold].
+         */
+        fun hasChanged(threshold: Double): Boolean {
+            return !exported ||
+                guests() != exportedGuests ||
+                _cpuLimit != exportedCpuLimit ||
+                _isDown != exportedIsDown ||
+                _bootTime != exportedBootTime ||
+                abs(_cpuUtilization - exportedCpuUtilization) > threshold ||
+                abs(_powerUsage - exportedPowerUsage) > threshold * abs(exportedPowerUsage)
+        }
+
+        /**
+         * Pack the guest counts of the host into a single value, such that they are compared at once.
+         */
+        private fun guests(): Long {
+            return (_guestsRunning.toLong() shl 48) xor (_guestsTerminated.toLong() shl 32) xor
+                (_guestsError.toLong() shl 16) xor _guestsInvalid.toLong()
+        }
+
         /**
          * Finish the aggregation for this cycle.
          */
         fun reset() {
+            exported = true
+            exportedGuests = guests()
+            exportedCpuLimit = _cpuLimit
+            exportedCpuUtilization = _cpuUtilization
+            exportedPowerUsage = _powerUsage
+            exportedIsDown = _isDown
+            exportedBootTime = _bootTime
+            isPending = false
+
             // Reset intermediate state for next aggregation
             previousCpuActiveTime = _cpuActiveTime
             previousCpuIdleTime = _cpuIdleTime
@@ -393,6 +490,28 @@ public class ComputeMetricReader(
         private var _cpuLostTime = 0L
         private var previousCpuLostTime = 0L
 
+        /**
+         * The share of active CPU time of the server during the last recorded cycle.
+         */
+        private var _cpuActiveShare = 0.0
+        private var cycleCpuActiveTime = 0L
+        private var cycleCpuIdleTime = 0L
+
+        /**
+         * A flag to indicate that the recorded cycles have not been exported yet.
+         */
+        var isPending = false
+            private set
+
+        /**
+         * The state of the server at its last export, against which change-driven sampling compares.
+         */
+        private var exported = false
+        private var exportedHost: Host? = null
+        private var exportedCpuLimit = 0.0
+        private var exportedCpuActiveShare = 0.0
+        private var exportedBootTime: Instant? = null
+
         /**
          * Record the next cycle.
          */
@@ -416,12 +535,38 @@ public class ComputeMetricReader(
             _downtime = sysStats?.downtime?.toMillis() ?: 0
             _provisionTime = _server.launchedAt
             _bootTime = sysStats?.bootTime
+
+            val active = _cpuActiveTime - cycleCpuActiveTime
+            val total = active + _cpuIdleTime - cycleCpuIdleTime
+            _cpuActiveShare = if (total > 0) active.toDouble() / total else 0.0
+            cycleCpuActiveTime = _cpuActiveTime
+            cycleCpuIdleTime = _cpuIdleTime
+            isPending = true
+        }
+
+        /**
+         * Determine whether the state of the server in the last recorded cycle differs from its last export by more
+         * than [threshold].
+         */
+        fun hasChanged(threshold: Double): Boolean {
+            return !exported ||
+                _host != exportedHost ||
+                _cpuLimit != exportedCpuLimit ||
+                _bootTime != exportedBootTime ||
+                abs(_cpuActiveShare - exportedCpuActiveShare) > threshold
         }
 
         /**
          * Finish the aggregation for this cycle.
          */
         fun reset() {
+            exported = true
+            exportedHost = _host
+            exportedCpuLimit = _cpuLimit
+            exportedCpuActiveShare = _cpuActiveShare
+            exportedBootTime = _bootTime
+            isPending = false
+
             previousUptime = _uptime
             previousDowntime = _downtime
             previousCpuActiveTime = _cpuActiveTime
@@ -37,12 +37,13 @@ import java.time.Duration
 public class ComputeMonitorProvisioningStep internal constructor(
     private val serviceDomain: String,
     private val monitor: ComputeMonitor,
-    private val exportInterval: Duration
+    private val exportInterval: Duration,
+    private val changeThreshold: Double? = null
 ) : ProvisioningStep {
     override fun apply(ctx: ProvisioningContext): AutoCloseable {
         val scope = CoroutineScope(ctx.coroutineContext + Job())
         val service = requireNotNull(ctx.registry.resolve(serviceDomain, ComputeService::class.java)) { "Compute service $serviceDomain does not exist" }
-        val metricReader = ComputeMetricReader(scope, ctx.clock, service, monitor, exportInterval)
+        val metricReader = ComputeMetricReader(scope, ctx.clock, service, monitor, exportInterval, changeThreshold)
 
         return AutoCloseable {
             metricReader.close()
@@ -0,0 +1,188 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.experiments.compute.telemetry
+
+import io.mockk.every
+import io.mockk.mockk
+import kotlinx.coroutines.delay
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Test
+import org.opendc.compute.service.ComputeService
+import org.opendc.compute.service.driver.Host
+import org.opendc.compute.service.driver.HostModel
+import org.opendc.compute.service.driver.telemetry.HostCpuStats
+import org.opendc.compute.service.driver.telemetry.HostSystemStats
+import org.opendc.compute.service.telemetry.SchedulerStats
+import org.opendc.experiments.compute.telemetry.table.HostTableReader
+import org.opendc.simulator.kotlin.runSimulation
+import java.time.Clock
+import java.time.Duration
+import java.time.Instant
+import java.util.UUID
+
+/**
+ * Test suite for the change-driven sampling of the [ComputeMetricReader].
+ */
+internal class ComputeMetricReaderTest {
+    /**
+     * The export interval of the readers under test.
+     */
+    private val interval = Duration.ofMinutes(5)
+
+    @Test
+    fun testHeldBackHostCumulativeMetrics() = runSimulation {
+        val cycles = listOf(Cycle(0.5), Cycle(0.52), Cycle(0.55), Cycle(0.58), Cycle(0.9))
+        val monitor = HostMonitor()
+        val start = clock.millis()
+
+        val reader = ComputeMetricReader(this, clock, mockService(clock, start, cycles), monitor, interval, changeThreshold = 0.1)
+        delay(cycles.size * interval.toMillis() + 1)
+        reader.close()
+
+        // The last export spans the three held-back cycles and the cycle that changed, and is not flushed again
+        assertEquals(listOf(1L, 5L), monitor.samples.map { (it.timestamp.toEpochMilli() - start) / interval.toMillis() })
+
+        val sample = monitor.samples.last()
+        assertEquals(0.9, sample.cpuUtilization)
+        assertEquals(4 * ENERGY_PER_CYCLE, sample.powerTotal)
+        assertEquals(4 * ACTIVE_TIME_PER_CYCLE, sample.cpuActiveTime)
+        assertEquals(4 * interval.toMillis(), sample.uptime)
+    }
+
+    @Test
+    fun testFlushOnClose() = runSimulation {
+        val cycles = List(3) { Cycle(0.5) }
+        val monitor = HostMonitor()
+        val start = clock.millis()
+
+        val reader = ComputeMetricReader(this, clock, mockService(clock, start, cycles), monitor, interval, changeThreshold = 0.1)
+        delay(cycles.size * interval.toMillis() + 1)
+        assertEquals(1, monitor.samples.size)
+
+        reader.close()
+
+        assertEquals(2, monitor.samples.size)
+
+        val sample = monitor.samples.last()
+        assertEquals(Instant.ofEpochMilli(start + 3 * interval.toMillis()), sample.timestamp)
+        assertEquals(2 * ENERGY_PER_CYCLE, sample.powerTotal)
+        assertEquals(2 * ACTIVE_TIME_PER_CYCLE, sample.cpuActiveTime)
+        assertEquals(2 * interval.toMillis(), sample.uptime)
+    }
+
+    @Test
+    fun testThresholdBoundary() = runSimulation {
+        val pastUtilization = Math.nextUp(0.75)
+        val cycles = listOf(
+            Cycle(0.5, 100.0),
+            Cycle(0.75, 100.0), // Utilization exactly at the threshold
+            Cycle(pastUtilization, 100.0), // Utilization just past the threshold
+            Cycle(pastUtilization, 125.0), // Power draw exactly at the threshold
+            Cycle(pastUtilization, Math.nextUp(125.0)) // Power draw just past the threshold
+        )
+        val monitor = HostMonitor()
+        val start = clock.millis()
+
+        val reader = ComputeMetricReader(this, clock, mockService(clock, start, cycles), monitor, interval, changeThreshold = 0.25)
+        delay(cycles.size * interval.toMillis() + 1)
+        reader.close()
+
+        assertEquals(listOf(1L, 3L, 5L), monitor.samples.map { (it.timestamp.toEpochMilli() - start) / interval.toMillis() })
+        assertEquals(listOf(2 * ENERGY_PER_CYCLE, 2 * ENERGY_PER_CYCLE), monitor.samples.drop(1).map { it.powerTotal })
+    }
+
+    /**
+     * The state of the host during an export interval.
+     */
+    private data class Cycle(val utilization: Double, val powerUsage: Double = 100.0)
+
+    /**
+     * A copy of the [HostTableReader] state at the moment of export.
+     */
+    private data class HostSample(
+        val timestamp: Instant,
+        val cpuUtilization: Double,
+        val cpuActiveTime: Long,
+        val powerTotal: Double,
+        val uptime: Long
+    )
+
+    /**
+     * A [ComputeMonitor] that collects the exported host samples.
+     */
+    private class HostMonitor : ComputeMonitor {
+        val samples = mutableListOf<HostSample>()
+
+        override fun record(reader: HostTableReader) {
+            samples += HostSample(reader.timestamp, reader.cpuUtilization, reader.cpuActiveTime, reader.powerTotal, reader.uptime)
+        }
+    }
+
+    /**
+     * Mock a [ComputeService] with a single host that is in the state of `cycles[k - 1]` at the k-th export.
+     */
+    private fun mockService(clock: Clock, start: Long, cycles: List<Cycle>): ComputeService {
+        val host = mockk<Host>()
+        val cycle = { ((clock.millis() - start) / interval.toMillis()).toInt() }
+
+        every { host.uid } returns UUID(0, 1)
+        every { host.name } returns "host"
+        every { host.model } returns HostModel(4 * 2600.0, 4, 2048)
+        every { host.getCpuStats() } answers {
+            val k = cycle()
+            HostCpuStats(k * ACTIVE_TIME_PER_CYCLE, 0, 0, 0, 4 * 2600.0, 0.0, 0.0, cycles[k - 1].utilization)
+        }
+        every { host.getSystemStats() } answers {
+            val k = cycle()
+            HostSystemStats(
+                Duration.ofMillis(k * interval.toMillis()),
+                Duration.ZERO,
+                Instant.ofEpochMilli(start),
+                cycles[k - 1].powerUsage,
+                k * ENERGY_PER_CYCLE,
+                0,
+                1,
+                0,
+                0
+            )
+        }
+
+        val service = mockk<ComputeService>()
+        every { service.hosts } returns setOf(host)
+        every { service.servers } returns emptyList()
+        every { service.getSchedulerStats() } returns SchedulerStats(1, 0, 0, 0, 0, 0, 0, 0)
+        return service
+    }
+
+    private companion object {
+        /**
+         * The energy usage (in J) of the host during a single export interval.
+         */
+        const val ENERGY_PER_CYCLE = 30_000.0
+
+        /**
+         * The active CPU time (in ms) of the host during a single export interval.
+         */
+        const val ACTIVE_TIME_PER_CYCLE = 1_200_000L
+    }
+}
@@ -36,6 +36,12 @@ public interface Table {
      */
     public val columns: List<TableColumn>
 
+    /**
+     * The columns by which the rows of this table are partitioned.
+     */
+    public val partitionColumns: List<String>
+        get() = emptyList()
+
     /**
      * Open a [TableReader] for a projection of this table.
      *
@@ -43,6 +49,20 @@ public interface Table {
      */
     public fun newReader(projection: List<String>? = null): TableReader
 
+    /**
+     * Open a [TableReader] for a projection of the rows of this table in the specified [partitions].
+     *
+     * @param projection The names of the columns to fetch from the table or `null` if no projection is performed.
+     * @param partitions The value that each of the given [partitionColumns] must have in the rows that are read.
+     * @throws UnsupportedOperationException if filtering on these partitions is not supported by the table.
+     */
+    public fun newReader(projection: List<String>?, partitions: Map<String, Any>): TableReader {
+        if (partitions.isNotEmpty()) {
+            throw UnsupportedOperationException("Partition filters not supported by table $name")
+        }
+        return newReader(projection)
+    }
+
     /**
      * Open a [TableWriter] for this table.
      *
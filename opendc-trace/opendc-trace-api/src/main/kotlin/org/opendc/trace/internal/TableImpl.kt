@@ -40,10 +40,17 @@ internal class TableImpl(val trace: TraceImpl, override val name: String) : Tabl
     override val columns: List<TableColumn>
         get() = details.columns
 
+    override val partitionColumns: List<String>
+        get() = details.partitionColumns
+
     override fun newReader(projection: List<String>?): TableReader {
         return trace.format.newReader(trace.path, name, projection)
     }
 
+    override fun newReader(projection: List<String>?, partitions: Map<String, Any>): TableReader {
+        return trace.format.newReader(trace.path, name, projection, partitions)
+    }
+
     override fun newWriter(): TableWriter = trace.format.newWriter(trace.path, name)
 
     override fun toString(): String = "Table[name=$name]"
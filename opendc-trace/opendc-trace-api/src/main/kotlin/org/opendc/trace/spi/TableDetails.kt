@@ -29,5 +29,7 @@ import org.opendc.trace.TableColumn
  * A class used by the [TraceFormat] interface for describing the metadata of a [Table].
  *
  * @param columns The available columns in the table.
+ * @param partitionColumns The columns by which the rows of the table are partitioned, on which a reader can filter
+ * without scanning the other partitions (see [TraceFormat.newReader]).
  */
-public data class TableDetails(val columns: List<TableColumn>)
+public data class TableDetails(val columns: List<TableColumn>, val partitionColumns: List<String> = emptyList())
@@ -74,6 +74,30 @@ public interface TraceFormat {
      */
     public fun newReader(path: Path, table: String, projection: List<String>?): TableReader
 
+    /**
+     * Open a [TableReader] for the specified [table] that only reads the rows of the specified [partitions].
+     *
+     * @param path The path to the trace to open.
+     * @param table The name of the table to open a [TableReader] for.
+     * @param projection The name of the columns to project or `null` if no projection is performed.
+     * @param partitions The value that each of the given partition columns (see [TableDetails.partitionColumns]) must
+     * have in the rows that are read.
+     * @throws IllegalArgumentException If [table] does not exist.
+     * @throws UnsupportedOperationException If the format does not support filtering [table] on these partitions.
+     * @return A [TableReader] instance for the table.
+     */
+    public fun newReader(
+        path: Path,
+        table: String,
+        projection: List<String>?,
+        partitions: Map<String, Any>
+    ): TableReader {
+        if (partitions.isNotEmpty()) {
+            throw UnsupportedOperationException("Partition filters not supported for table $table")
+        }
+        return newReader(path, table, projection)
+    }
+
     /**
      * Open a [TableWriter] for the specified [table].
      *
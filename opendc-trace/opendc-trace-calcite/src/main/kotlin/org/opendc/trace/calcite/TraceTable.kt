@@ -38,11 +38,16 @@ import org.apache.calcite.rel.core.TableModify
 import org.apache.calcite.rel.logical.LogicalTableModify
 import org.apache.calcite.rel.type.RelDataType
 import org.apache.calcite.rel.type.RelDataTypeFactory
+import org.apache.calcite.rex.RexCall
+import org.apache.calcite.rex.RexInputRef
+import org.apache.calcite.rex.RexLiteral
 import org.apache.calcite.rex.RexNode
+import org.apache.calcite.rex.RexUtil
 import org.apache.calcite.schema.ModifiableTable
 import org.apache.calcite.schema.ProjectableFilterableTable
 import org.apache.calcite.schema.SchemaPlus
 import org.apache.calcite.schema.impl.AbstractTableQueryable
+import org.apache.calcite.sql.SqlKind
 import org.apache.calcite.sql.type.SqlTypeName
 import org.opendc.trace.TableColumnType
 import java.nio.ByteBuffer
@@ -72,14 +77,19 @@ internal class TraceTable(private val table: org.opendc.trace.Table) :
     }
 
     override fun scan(root: DataContext, filters: MutableList<RexNode>, projects: IntArray?): Enumerable<Array<Any?>> {
-        // Filters are currently not supported by the OpenDC trace API. By keeping the filters in the list, Calcite
-        // assumes that they are declined and will perform the filters itself.
+        // Only equality filters on the partition columns of the table are supported by the OpenDC trace API. These
+        // are removed from the list, such that Calcite considers them handled. By keeping the other filters in the
+        // list, Calcite assumes that they are declined and will perform the filters itself.
+        val partitions = if (filters.isNotEmpty()) acceptPartitionFilters(filters) else emptyMap()
 
         val projection = projects?.map { table.columns[it] }
         val cancelFlag = DataContext.Variable.CANCEL_FLAG.get<AtomicBoolean>(root)
         return object : AbstractEnumerable<Array<Any?>>() {
-            override fun enumerator(): Enumerator<Array<Any?>> =
-                TraceReaderEnumerator(table.newReader(projection?.map { it.name }), projection ?: table.columns, cancelFlag)
+            override fun enumerator(): Enumerator<Array<Any?>> {
+                val names = projection?.map { it.name }
+                val reader = if (partitions.isEmpty()) table.newReader(names) else table.newReader(names, partitions)
+                return TraceReaderEnumerator(reader, projection ?: table.columns, cancelFlag)
+            }
         }
     }
 
@@ -172,6 +182,50 @@ internal class TraceTable(private val table: org.opendc.trace.Table) :
 
     override fun toString(): String = "TraceTable"
 
+    /**
+     * Remove the filters of the form `column = literal` on the partition columns of the table from [filters] and
+     * return them as the partitions to read.
+     */
+    private fun acceptPartitionFilters(filters: MutableList<RexNode>): Map<String, Any> {
+        val partitionColumns = table.partitionColumns
+        if (partitionColumns.isEmpty()) {
+            return emptyMap()
+        }
+
+        val partitions = mutableMapOf<String, Any>()
+        val iterator = filters.iterator()
+        while (iterator.hasNext()) {
+            val filter = iterator.next()
+            if (filter !is RexCall || filter.kind != SqlKind.EQUALS) {
+                continue
+            }
+
+            // Casts are only removed from the literal, since a cast of the column may change the value it compares
+            val (lhs, rhs) = filter.operands
+            val ref = lhs as? RexInputRef ?: rhs as? RexInputRef ?: continue
+            val literal = RexUtil.removeCast(if (ref === lhs) rhs else lhs) as? RexLiteral ?: continue
+
+            val column = table.columns[ref.index]
+            if (column.name !in partitionColumns || column.name in partitions) {
+                continue
+            }
+
+            val value = when (column.type) {
+                is TableColumnType.Boolean -> literal.getValueAs(Boolean::class.javaObjectType)
+                is TableColumnType.Int -> literal.getValueAs(Int::class.javaObjectType)
+                is TableColumnType.Long -> literal.getValueAs(Long::class.javaObjectType)
+                is TableColumnType.Double -> literal.getValueAs(Double::class.javaObjectType)
+                is TableColumnType.String -> literal.getValueAs(String::class.java)
+                else -> null
+            } ?: continue
+
+            partitions[column.name] = value
+            iterator.remove()
+        }
+
+        return partitions
+    }
+
     private fun deduceRowType(typeFactory: JavaTypeFactory): RelDataType {
         val types = mutableListOf<RelDataType>()
         val names = mutableListOf<String>()
@@ -24,6 +24,7 @@ package org.opendc.trace.calcite
 
 import io.mockk.every
 import io.mockk.mockk
+import io.mockk.verify
 import org.apache.calcite.jdbc.CalciteConnection
 import org.junit.jupiter.api.Assertions.assertAll
 import org.junit.jupiter.api.Assertions.assertArrayEquals
@@ -31,6 +32,7 @@ import org.junit.jupiter.api.Assertions.assertEquals
 import org.junit.jupiter.api.Assertions.assertFalse
 import org.junit.jupiter.api.Assertions.assertTrue
 import org.junit.jupiter.api.Test
+import org.opendc.trace.Table
 import org.opendc.trace.TableColumn
 import org.opendc.trace.TableColumnType
 import org.opendc.trace.TableReader
@@ -219,6 +221,95 @@ class CalciteTest {
         }
     }
 
+    @Test
+    fun testPartitionFilter() {
+        val trace = mockk<Trace>()
+        val table = mockk<Table>()
+        val partitions = mapOf<String, Any>("id" to "1019")
+        every { trace.tables } returns listOf(TABLE_RESOURCES)
+        every { trace.getTable(TABLE_RESOURCES) } returns table
+        every { table.columns } returns listOf(
+            TableColumn("id", TableColumnType.String),
+            TableColumn("cpu_count", TableColumnType.Int)
+        )
+        every { table.partitionColumns } returns listOf("id")
+        every { table.newReader(any(), partitions) } answers {
+            object : TableReader {
+                private val cpuCounts = intArrayOf(1, 2)
+                private var row = -1
+
+                override fun nextRow(): Boolean = ++row < cpuCounts.size
+
+                override fun resolve(name: String): Int {
+                    return when (name) {
+                        "cpu_count" -> 1
+                        else -> -1
+                    }
+                }
+
+                override fun isNull(index: Int): Boolean = false
+
+                override fun getBoolean(index: Int): Boolean {
+                    TODO("not implemented")
+                }
+
+                override fun getInt(index: Int): Int = cpuCounts[row]
+
+                override fun getLong(index: Int): Long {
+                    TODO("not implemented")
+                }
+
+                override fun getFloat(index: Int): Float {
+                    TODO("not implemented")
+                }
+
+                override fun getDouble(index: Int): Double {
+                    TODO("not implemented")
+                }
+
+                override fun getString(index: Int): String? {
+                    TODO("not implemented")
+                }
+
+                override fun getUUID(index: Int): UUID? {
+                    TODO("not implemented")
+                }
+
+                override fun getInstant(index: Int): Instant? {
+                    TODO("not implemented")
+                }
+
+                override fun getDuration(index: Int): Duration? {
+                    TODO("not implemented")
+                }
+
+                override fun <T> getList(index: Int, elementType: Class<T>): List<T>? {
+                    TODO("not implemented")
+                }
+
+                override fun <T> getSet(index: Int, elementType: Class<T>): Set<T>? {
+                    TODO("not implemented")
+                }
+
+                override fun <K, V> getMap(index: Int, keyType: Class<K>, valueType: Class<V>): Map<K, V>? {
+                    TODO("not implemented")
+                }
+
+                override fun close() {}
+            }
+        }
+
+        // The filter on the partition column is handled by the reader, so the column does not need to be read
+        runQuery(trace, "SELECT SUM(cpu_count) AS total FROM trace.resources WHERE id = '1019'") { rs ->
+            assertAll(
+                { assertTrue(rs.next()) },
+                { assertEquals(3, rs.getInt("total")) },
+                { assertFalse(rs.next()) }
+            )
+        }
+        verify { table.newReader(listOf("cpu_count"), partitions) }
+    }
+
     /**
      * Helper function to run statement for the specified trace.
      */
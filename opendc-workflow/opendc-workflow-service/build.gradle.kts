@@ -49,6 +49,8 @@ dependencies {
     implementation(libs.jackson.dataformat.csv)
     implementation(projects.opendcTrace.opendcTraceGwf)
     implementation(projects.opendcTrace.opendcTraceWtf)
+    implementation(projects.opendcTrace.opendcTraceParquet)
+    api(projects.opendcTrace.opendcTraceCalcite)
 
 
     testImplementation(projects.opendcSimulator.opendcSimulatorCore)
@@ -59,4 +61,12 @@ dependencies {
     runtimeOnly(projects.opendcTrace.opendcTraceOpendc)
     testRuntimeOnly(libs.log4j.core)
     testRuntimeOnly(libs.log4j.slf4j)
+
+    jmhRuntimeOnly(libs.log4j.core)
+    jmhRuntimeOnly(libs.log4j.slf4j)
+}
+
+jmh {
+    // Report the peak heap usage of every @Param size next to the allocation rate of the gc profiler
+    profilers.add("org.opendc.workflow.service.lab.PeakHeapProfiler")
 }
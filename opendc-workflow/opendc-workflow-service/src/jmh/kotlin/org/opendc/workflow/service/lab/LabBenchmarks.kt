@@ -0,0 +1,145 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.experiments.compute.createComputeScheduler
+import org.opendc.experiments.compute.setupComputeService
+import org.opendc.experiments.compute.setupHosts
+import org.opendc.experiments.compute.topology.HostSpec
+import org.opendc.experiments.provisioner.Provisioner
+import org.opendc.simulator.kotlin.runSimulation
+import org.opendc.trace.Trace
+import org.opendc.workflow.service.WorkflowService
+import org.opendc.workflow.service.lab.model.OperationalPhenomena
+import org.opendc.workflow.service.lab.model.Scenario
+import org.opendc.workflow.service.lab.model.Topology
+import org.opendc.workflow.service.lab.model.Workload
+import org.opendc.workflow.service.lab.topology.clusterTopology
+import org.opendc.workflow.service.scheduler.job.NullJobAdmissionPolicy
+import org.opendc.workflow.service.scheduler.job.SubmissionTimeJobOrderPolicy
+import org.opendc.workflow.service.scheduler.task.NullTaskEligibilityPolicy
+import org.opendc.workflow.service.scheduler.task.SubmissionTimeTaskOrderPolicy
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Fork
+import org.openjdk.jmh.annotations.Level
+import org.openjdk.jmh.annotations.Measurement
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.TearDown
+import org.openjdk.jmh.annotations.Warmup
+import java.io.File
+import java.nio.file.Files
+import java.time.Duration
+import java.util.Random
+import java.util.concurrent.TimeUnit
+
+/**
+ * Benchmark suite for the simulation of a lab scenario on a synthetic trace and topology.
+ *
+ * [benchmarkReplay] only replays the trace on the workflow and compute services, so its cost is dominated by the
+ * scheduling cycles of the workflow service and the placements of the compute scheduler. [benchmarkRunScenario]
+ * runs the scenario with [LabRunner], which adds the collection of the host samples and the result file.
+ */
+@State(Scope.Thread)
+@Fork(1)
+@Warmup(iterations = 1, time = 5, timeUnit = TimeUnit.SECONDS)
+@Measurement(iterations = 3, time = 10, timeUnit = TimeUnit.SECONDS)
+class LabBenchmarks {
+    private lateinit var directory: File
+    private lateinit var topology: List<HostSpec>
+    private lateinit var scenario: Scenario
+    private lateinit var runner: LabRunner
+
+    @Param("naive", "taskflow")
+    private var policy: String = "taskflow"
+
+    @Param("10", "100")
+    private var workflows: Int = 10
+
+    @Param("4", "32")
+    private var width: Int = 4
+
+    @Param("12", "96")
+    private var hosts: Int = 12
+
+    @Setup
+    fun setUp() {
+        directory = Files.createTempDirectory("lab-benchmarks").toFile()
+
+        val trace = File(directory, "trace.gwf")
+        writeSyntheticTrace(trace, workflows, tasks = 100, width = width)
+        writeSyntheticTopology(File(directory, "synthetic.txt"), hosts)
+        topology = clusterTopology(File(directory, "synthetic.txt"))
+
+        val source = Trace.open(trace, format = "gwf")
+        scenario = Scenario(
+            Topology("synthetic"),
+            Workload("synthetic", source, source.toJobTable()),
+            Duration.ofMillis(100),
+            NullJobAdmissionPolicy,
+            SubmissionTimeJobOrderPolicy(),
+            NullTaskEligibilityPolicy,
+            SubmissionTimeTaskOrderPolicy(),
+            policy,
+            OperationalPhenomena(failureFrequency = 0.0, hasInterference = false)
+        )
+        runner = LabRunner(directory, File(directory, "results.csv").path)
+    }
+
+    @TearDown(Level.Trial)
+    fun tearDown() {
+        directory.deleteRecursively()
+    }
+
+    @Benchmark
+    fun benchmarkReplay() = runSimulation {
+        val computeDomain = "compute.opendc.org"
+        val workflowDomain = "workflow.opendc.org"
+
+        Provisioner(coroutineContext, clock, seed = 0).use { provisioner ->
+            provisioner.runSteps(
+                setupComputeService(computeDomain, { createComputeScheduler(policy, Random(it.seeder.nextLong()), clock) }),
+                setupHosts(computeDomain, topology),
+                setupWorkflowService(
+                    workflowDomain,
+                    computeDomain,
+                    WorkflowSchedulerSpec(
+                        schedulingQuantum = scenario.schedQuantum,
+                        jobAdmissionPolicy = scenario.jobAdmissionPolicy,
+                        jobOrderPolicy = scenario.jobOrderPolicy,
+                        taskEligibilityPolicy = scenario.taskEligibilityPolicy,
+                        taskOrderPolicy = scenario.taskOrderPolicy
+                    )
+                )
+            )
+
+            val service = provisioner.registry.resolve(workflowDomain, WorkflowService::class.java)!!
+            service.replay(clock, scenario.workload.jobs!!)
+        }
+    }
+
+    @Benchmark
+    fun benchmarkRunScenario() = runner.runScenario(scenario, seed = 0, iteration = 0)
+}
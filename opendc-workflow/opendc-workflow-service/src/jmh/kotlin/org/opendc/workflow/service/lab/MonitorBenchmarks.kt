@@ -0,0 +1,124 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.experiments.compute.telemetry.table.HostInfo
+import org.opendc.experiments.compute.telemetry.table.HostTableReader
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Fork
+import org.openjdk.jmh.annotations.Level
+import org.openjdk.jmh.annotations.Measurement
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.TearDown
+import org.openjdk.jmh.annotations.Warmup
+import java.io.File
+import java.nio.file.Files
+import java.time.Instant
+import java.util.Random
+import java.util.concurrent.TimeUnit
+
+/**
+ * Benchmark suite for the collection of the host samples of a lab run by [TestComputeMonitor].
+ *
+ * Every invocation records [cycles] cycles of samples of [hosts] hosts into a fresh monitor and, for
+ * [benchmarkRecordAndWrite], writes the monitor to its result file. The allocation rate reported by the `gc`
+ * profiler and the peak heap usage reported by the [PeakHeapProfiler] are the cost in memory of the samples.
+ */
+@State(Scope.Thread)
+@Fork(1)
+@Warmup(iterations = 2, time = 1, timeUnit = TimeUnit.SECONDS)
+@Measurement(iterations = 5, time = 3, timeUnit = TimeUnit.SECONDS)
+class MonitorBenchmarks {
+    private lateinit var readers: List<SampleReader>
+    private lateinit var directory: File
+
+    @Param("16", "256")
+    private var hosts: Int = 16
+
+    @Param("1000", "10000")
+    private var cycles: Int = 1000
+
+    @Setup
+    fun setUp() {
+        val random = Random(0)
+        readers = List(hosts) { SampleReader(HostInfo("host-$it", "host-$it", "x86", 16, 65536), random) }
+        directory = Files.createTempDirectory("monitor-benchmarks").toFile()
+    }
+
+    @TearDown(Level.Trial)
+    fun tearDown() {
+        directory.deleteRecursively()
+    }
+
+    @Benchmark
+    fun benchmarkRecord(): TestComputeMonitor = record()
+
+    @Benchmark
+    fun benchmarkRecordAndWrite() {
+        val monitor = record()
+        monitor.toFile(File(directory, "monitor.csv").path)
+        monitor.clear()
+    }
+
+    /**
+     * Record the samples of all cycles into a new [TestComputeMonitor].
+     */
+    private fun record(): TestComputeMonitor {
+        val monitor = TestComputeMonitor()
+        for (cycle in 0 until cycles) {
+            val timestamp = Instant.ofEpochMilli(cycle * 60_000L)
+            for (reader in readers) {
+                reader.timestamp = timestamp
+                monitor.record(reader)
+            }
+        }
+        return monitor
+    }
+
+    /**
+     * A [HostTableReader] with fixed, random samples of a single host.
+     */
+    private class SampleReader(override val host: HostInfo, random: Random) : HostTableReader {
+        override var timestamp: Instant = Instant.EPOCH
+        override val guestsTerminated: Int = 0
+        override val guestsRunning: Int = random.nextInt(16)
+        override val guestsError: Int = 0
+        override val guestsInvalid: Int = 0
+        override val cpuLimit: Double = 16 * 3200.0
+        override val cpuUsage: Double = random.nextDouble() * cpuLimit
+        override val cpuDemand: Double = cpuUsage
+        override val cpuUtilization: Double = cpuUsage / cpuLimit
+        override val cpuActiveTime: Long = random.nextInt(60).toLong()
+        override val cpuIdleTime: Long = 60 - cpuActiveTime
+        override val cpuStealTime: Long = 0
+        override val cpuLostTime: Long = 0
+        override val powerUsage: Double = 200 + 150 * cpuUtilization
+        override val powerTotal: Double = powerUsage * 60
+        override val uptime: Long = 60_000
+        override val downtime: Long = 0
+        override val bootTime: Instant? = Instant.EPOCH
+    }
+}
@@ -0,0 +1,67 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.openjdk.jmh.infra.BenchmarkParams
+import org.openjdk.jmh.infra.IterationParams
+import org.openjdk.jmh.profile.InternalProfiler
+import org.openjdk.jmh.results.AggregationPolicy
+import org.openjdk.jmh.results.IterationResult
+import org.openjdk.jmh.results.Result
+import org.openjdk.jmh.results.ScalarResult
+import java.lang.management.ManagementFactory
+import java.lang.management.MemoryPoolMXBean
+import java.lang.management.MemoryType
+
+/**
+ * A JMH profiler that reports the peak heap usage of every iteration, such that the memory of a benchmark can be
+ * compared across its [org.openjdk.jmh.annotations.Param] sizes.
+ *
+ * The heap is collected and the peak usage of every heap memory pool is reset before an iteration. The reported peak
+ * is the sum of the peaks of the pools, which is an upper bound of the peak of the heap as a whole, since the pools
+ * may peak at different moments.
+ */
+public class PeakHeapProfiler : InternalProfiler {
+    /**
+     * The memory pools of the heap.
+     */
+    private val pools: List<MemoryPoolMXBean> = ManagementFactory.getMemoryPoolMXBeans().filter { it.type == MemoryType.HEAP }
+
+    override fun getDescription(): String = "Peak heap usage per iteration"
+
+    override fun beforeIteration(benchmarkParams: BenchmarkParams, iterationParams: IterationParams) {
+        System.gc()
+        for (pool in pools) {
+            pool.resetPeakUsage()
+        }
+    }
+
+    override fun afterIteration(
+        benchmarkParams: BenchmarkParams,
+        iterationParams: IterationParams,
+        result: IterationResult
+    ): Collection<Result<*>> {
+        val peak = pools.sumOf { it.peakUsage.used }
+        return listOf(ScalarResult("heap.peak", peak / (1024.0 * 1024.0), "MB", AggregationPolicy.MAX))
+    }
+}
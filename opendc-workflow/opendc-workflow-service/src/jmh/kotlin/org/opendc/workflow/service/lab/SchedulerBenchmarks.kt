@@ -0,0 +1,187 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.compute.api.Flavor
+import org.opendc.compute.api.Image
+import org.opendc.compute.api.Server
+import org.opendc.compute.api.ServerState
+import org.opendc.compute.api.ServerWatcher
+import org.opendc.compute.service.driver.Host
+import org.opendc.compute.service.driver.HostListener
+import org.opendc.compute.service.driver.HostModel
+import org.opendc.compute.service.driver.HostState
+import org.opendc.compute.service.driver.telemetry.GuestCpuStats
+import org.opendc.compute.service.driver.telemetry.GuestSystemStats
+import org.opendc.compute.service.driver.telemetry.HostCpuStats
+import org.opendc.compute.service.driver.telemetry.HostSystemStats
+import org.opendc.compute.service.internal.HostView
+import org.opendc.compute.service.scheduler.ComputeScheduler
+import org.opendc.experiments.compute.createComputeScheduler
+import org.opendc.experiments.compute.topology.HOSTSPEC_FASTESTFREQ
+import org.opendc.experiments.compute.topology.HOSTSPEC_NORMALIZEDSPEED
+import org.opendc.experiments.compute.topology.HOSTSPEC_POWEREFFICIENCY
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Fork
+import org.openjdk.jmh.annotations.Measurement
+import org.openjdk.jmh.annotations.OperationsPerInvocation
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.Warmup
+import org.openjdk.jmh.infra.Blackhole
+import java.time.Clock
+import java.time.Instant
+import java.time.ZoneOffset
+import java.util.Random
+import java.util.UUID
+import java.util.concurrent.TimeUnit
+
+/**
+ * Benchmark suite for the placement decisions of the compute schedulers of the lab.
+ *
+ * Every invocation places a batch of [SERVERS] workflow tasks of random size on a cluster of [hosts] hosts, of which a
+ * random part of the capacity is already provisioned.
+ */
+@State(Scope.Thread)
+@Fork(1)
+@Warmup(iterations = 2, time = 1, timeUnit = TimeUnit.SECONDS)
+@Measurement(iterations = 5, time = 3, timeUnit = TimeUnit.SECONDS)
+class SchedulerBenchmarks {
+    private lateinit var scheduler: ComputeScheduler
+    private lateinit var servers: List<Server>
+
+    @Param("naive", "random", "taskflow")
+    private var policy: String = "taskflow"
+
+    @Param("16", "256", "4096")
+    private var hosts: Int = 16
+
+    @Setup
+    fun setUp() {
+        val random = Random(0)
+        val clock = Clock.fixed(Instant.EPOCH, ZoneOffset.UTC)
+        scheduler = createComputeScheduler(policy, random, clock)
+
+        repeat(hosts) {
+            val cpuCount = 8 shl random.nextInt(3)
+            val normalizedSpeed = 0.5 + random.nextDouble() / 2
+            val host = BenchmarkHost(
+                HostModel(cpuCount * 3200.0, cpuCount, cpuCount * 8192L),
+                mapOf(
+                    HOSTSPEC_POWEREFFICIENCY to random.nextDouble() * normalizedSpeed,
+                    HOSTSPEC_NORMALIZEDSPEED to normalizedSpeed,
+                    HOSTSPEC_FASTESTFREQ to 3200.0
+                )
+            )
+            val view = HostView(host)
+            view.provisionedCores = random.nextInt(cpuCount)
+            view.availableMemory = (cpuCount - view.provisionedCores) * 8192L
+            scheduler.addHost(view)
+        }
+
+        servers = List(SERVERS) {
+            val cpuCount = 1 + random.nextInt(4)
+            BenchmarkServer(
+                BenchmarkFlavor(cpuCount, 1000),
+                mapOf(
+                    "workflow:task:slack" to random.nextInt(120_000).toLong(),
+                    "workflow:task:minimalStartTime" to 0L,
+                    "workload_flops" to 4000L * (1 + random.nextInt(120)) * cpuCount
+                )
+            )
+        }
+    }
+
+    @Benchmark
+    @OperationsPerInvocation(SERVERS)
+    fun benchmarkSelect(bh: Blackhole) {
+        for (server in servers) {
+            bh.consume(scheduler.select(server))
+        }
+    }
+
+    /**
+     * A [Host] that only describes its model and metadata, as read by the schedulers.
+     */
+    private class BenchmarkHost(override val model: HostModel, override val meta: Map<String, Any>) : Host {
+        override val uid: UUID = UUID.randomUUID()
+        override val name: String = uid.toString()
+        override val state: HostState = HostState.UP
+        override val instances: Set<Server> = emptySet()
+
+        override fun canFit(server: Server): Boolean = throw UnsupportedOperationException()
+        override fun spawn(server: Server) = throw UnsupportedOperationException()
+        override fun contains(server: Server): Boolean = false
+        override fun start(server: Server) = throw UnsupportedOperationException()
+        override fun stop(server: Server) = throw UnsupportedOperationException()
+        override fun delete(server: Server) = throw UnsupportedOperationException()
+        override fun addListener(listener: HostListener) {}
+        override fun removeListener(listener: HostListener) {}
+        override fun getSystemStats(): HostSystemStats = throw UnsupportedOperationException()
+        override fun getSystemStats(server: Server): GuestSystemStats = throw UnsupportedOperationException()
+        override fun getCpuStats(): HostCpuStats = throw UnsupportedOperationException()
+        override fun getCpuStats(server: Server): GuestCpuStats = throw UnsupportedOperationException()
+    }
+
+    /**
+     * A [Server] that only describes its flavor and metadata, as read by the schedulers.
+     */
+    private class BenchmarkServer(override val flavor: Flavor, override val meta: Map<String, Any>) : Server {
+        override val uid: UUID = UUID.randomUUID()
+        override val name: String = uid.toString()
+        override val labels: Map<String, String> = emptyMap()
+        override val image: Image
+            get() = throw UnsupportedOperationException()
+        override val state: ServerState = ServerState.TERMINATED
+        override val launchedAt: Instant? = null
+
+        override suspend fun start() = throw UnsupportedOperationException()
+        override suspend fun stop() = throw UnsupportedOperationException()
+        override suspend fun delete() = throw UnsupportedOperationException()
+        override suspend fun refresh() {}
+        override fun watch(watcher: ServerWatcher) {}
+        override fun unwatch(watcher: ServerWatcher) {}
+    }
+
+    /**
+     * A [Flavor] of [cpuCount] cores and [memorySize] MB of memory.
+     */
+    private class BenchmarkFlavor(override val cpuCount: Int, override val memorySize: Long) : Flavor {
+        override val uid: UUID = UUID.randomUUID()
+        override val name: String = uid.toString()
+        override val labels: Map<String, String> = emptyMap()
+        override val meta: Map<String, Any> = emptyMap()
+
+        override suspend fun delete() = throw UnsupportedOperationException()
+        override suspend fun refresh() {}
+    }
+
+    private companion object {
+        /**
+         * The number of servers placed per invocation.
+         */
+        const val SERVERS = 1024
+    }
+}
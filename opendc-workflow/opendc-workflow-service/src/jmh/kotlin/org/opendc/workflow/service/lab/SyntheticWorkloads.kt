@@ -0,0 +1,88 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import java.io.File
+import java.util.Random
+
+/**
+ * Write a synthetic workflow trace in GWF format to [file].
+ *
+ * The trace consists of [workflows] workflows of [tasks] tasks each, submitted [interval] seconds apart. The tasks of
+ * a workflow form a layered DAG of [width] tasks per layer, in which every task after the first layer depends on one
+ * or two tasks of the previous layer.
+ */
+internal fun writeSyntheticTrace(file: File, workflows: Int, tasks: Int, width: Int, interval: Long = 60, seed: Long = 0) {
+    val random = Random(seed)
+    var id = 1L
+
+    file.bufferedWriter().use { out ->
+        out.write("WorkflowID, JobID, SubmitTime, RunTime, NProcs, ReqNProcs, Dependencies\n")
+
+        for (workflow in 0 until workflows) {
+            val first = id
+            val submitTime = workflow * interval
+
+            for (task in 0 until tasks) {
+                val layer = task / width
+                val parents = if (layer == 0) {
+                    emptyList()
+                } else {
+                    val previous = first + (layer - 1) * width
+                    val count = minOf(width, tasks - (layer - 1) * width)
+                    List(1 + random.nextInt(2)) { previous + random.nextInt(count) }.distinct()
+                }
+                val runtime = 1 + random.nextInt(120)
+                val cpus = 1 + random.nextInt(4)
+
+                out.write("$workflow, ${id++}, $submitTime, $runtime, $cpus, $cpus, ${parents.joinToString(" ")}\n")
+            }
+        }
+    }
+}
+
+/**
+ * A host type of a synthetic topology.
+ */
+private data class HostType(val id: String, val cores: Int, val speed: Double, val memory: Int)
+
+/**
+ * The host types of a synthetic topology, after the heterogeneous test environment.
+ */
+private val hostTypes = listOf(HostType("A01", 32, 3.2, 256), HostType("B01", 8, 2.93, 64), HostType("C01", 16, 3.2, 128))
+
+/**
+ * Write a synthetic topology of [hosts] hosts to [file], spread evenly over a cluster of each host type.
+ */
+internal fun writeSyntheticTopology(file: File, hosts: Int) {
+    file.bufferedWriter().use { out ->
+        out.write("ClusterID;ClusterName;Cores;Speed;Memory;numberOfHosts;memoryCapacityPerHost;coreCountPerHost\n")
+
+        for ((index, type) in hostTypes.withIndex()) {
+            val count = hosts / hostTypes.size + if (index < hosts % hostTypes.size) 1 else 0
+            if (count > 0) {
+                out.write("${type.id};${type.id};${type.cores * count};${type.speed};${type.memory * count};$count;${type.memory};${type.cores}\n")
+            }
+        }
+    }
+}
@@ -0,0 +1,86 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.trace.Trace
+import org.opendc.workflow.service.lab.cache.TraceCache
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Fork
+import org.openjdk.jmh.annotations.Level
+import org.openjdk.jmh.annotations.Measurement
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.TearDown
+import org.openjdk.jmh.annotations.Warmup
+import java.io.File
+import java.nio.file.Files
+import java.util.concurrent.TimeUnit
+
+/**
+ * Benchmark suite for loading workflow traces: parsing a synthetic GWF trace into a [JobTable], loading it from a
+ * compiled [TraceCache] and creating its jobs.
+ */
+@State(Scope.Thread)
+@Fork(1)
+@Warmup(iterations = 2, time = 1, timeUnit = TimeUnit.SECONDS)
+@Measurement(iterations = 5, time = 3, timeUnit = TimeUnit.SECONDS)
+class TraceBenchmarks {
+    private lateinit var directory: File
+    private lateinit var trace: File
+    private lateinit var table: JobTable
+
+    @Param("100", "1000")
+    private var workflows: Int = 100
+
+    @Param("100")
+    private var tasks: Int = 100
+
+    @Param("4", "32")
+    private var width: Int = 4
+
+    @Setup
+    fun setUp() {
+        directory = Files.createTempDirectory("trace-benchmarks").toFile()
+        trace = File(directory, "trace.gwf")
+        writeSyntheticTrace(trace, workflows, tasks, width)
+
+        // Compile the trace once, so the cache benchmark only reads it
+        table = TraceCache(directory.toPath().resolve("cache")).load(trace.toPath(), "gwf")
+    }
+
+    @TearDown(Level.Trial)
+    fun tearDown() {
+        directory.deleteRecursively()
+    }
+
+    @Benchmark
+    fun benchmarkParse(): JobTable = Trace.open(trace, format = "gwf").toJobTable()
+
+    @Benchmark
+    fun benchmarkLoadCached(): JobTable = TraceCache(directory.toPath().resolve("cache")).load(trace.toPath(), "gwf")
+
+    @Benchmark
+    fun benchmarkCreateJobs() = table.toList()
+}
@@ -0,0 +1,43 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.internal
+
+/**
+ * The statistics of a single scheduling cycle of the workflow service.
+ *
+ * @property timestamp The simulated time at which the cycle ran, in milliseconds since the epoch.
+ * @property duration The wall-clock time spent in the cycle, in nanoseconds.
+ * @property incomingJobs The number of submitted jobs that were waiting for admission at the start of the cycle.
+ * @property jobQueue The number of jobs that were admitted in the cycle.
+ * @property incomingTasks The number of ready tasks that were waiting for eligibility after the admitted jobs were
+ * expanded.
+ * @property taskQueue The number of tasks that were eligible and dispatched to the compute service in the cycle.
+ */
+public data class SchedulingCycle(
+    val timestamp: Long,
+    val duration: Long,
+    val incomingJobs: Int,
+    val jobQueue: Int,
+    val incomingTasks: Int,
+    val taskQueue: Int
+)
@@ -62,4 +62,9 @@ public interface WorkflowSchedulerListener {
      * This method is invoked when [task] finishes.
      */
     public fun taskFinished(task: TaskState) {}
+
+    /**
+     * This method is invoked after each scheduling [cycle] of the service.
+     */
+    public fun cycleFinished(cycle: SchedulingCycle) {}
 }
@@ -28,8 +28,10 @@ import kotlinx.coroutines.launch
 import kotlinx.coroutines.suspendCancellableCoroutine
 import org.opendc.common.util.Pacer
 import org.opendc.compute.api.ComputeClient
+import org.opendc.compute.api.Flavor
 import org.opendc.compute.api.Image
 import org.opendc.compute.api.Server
+import org.opendc.compute.api.ServerRequest
 import org.opendc.compute.api.ServerState
 import org.opendc.compute.api.ServerWatcher
 import org.opendc.workflow.api.Job
@@ -137,6 +139,10 @@ public class WorkflowServiceImpl(
         override fun taskFinished(task: TaskState) {
             listeners.forEach { it.taskFinished(task) }
         }
+
+        override fun cycleFinished(cycle: SchedulingCycle) {
+            listeners.forEach { it.cycleFinished(cycle) }
+        }
     }
 
     private var _workflowsSubmitted: Int = 0
@@ -155,6 +161,11 @@ public class WorkflowServiceImpl(
     private val taskEligibilityPolicy: TaskEligibilityPolicy.Logic
     private lateinit var image: Image
 
+    /**
+     * The flavors of the task servers by their (cores, memory) shape, shared by all tasks of the same shape.
+     */
+    private val flavors = mutableMapOf<Pair<Int, Long>, Flavor>()
+
     init {
         this.jobAdmissionPolicy = jobAdmissionPolicy(this)
         this.jobQueue = PriorityQueue(100, jobOrderPolicy(this).thenBy { it.job.uid })
@@ -223,6 +234,10 @@ public class WorkflowServiceImpl(
      * Perform a scheduling cycle immediately.
      */
     private fun doSchedule() {
+        // Only measure the cycle if someone listens
+        val start = if (rootListener.listeners.isEmpty()) 0L else System.nanoTime()
+        val incomingJobCount = incomingJobs.size
+
         // J2 Create list of eligible jobs
         val iterator = incomingJobs.iterator()
         while (iterator.hasNext()) {
@@ -242,6 +257,8 @@ public class WorkflowServiceImpl(
             rootListener.jobStarted(jobInstance)
         }
 
+        val jobQueueCount = jobQueue.size
+
         // J4 Per job
         while (true) {
             val jobInstance = jobQueue.poll() ?: break
@@ -262,6 +279,8 @@ public class WorkflowServiceImpl(
             }
         }
 
+        val incomingTaskCount = incomingTasks.size
+
         // T1 Create list of eligible tasks
         val taskIterator = incomingTasks.iterator()
         while (taskIterator.hasNext()) {
@@ -277,37 +296,53 @@ public class WorkflowServiceImpl(
             taskQueue.add(taskInstance)
         }
 
+        val taskQueueCount = taskQueue.size
+
         // T3 Per task
-        while (taskQueue.isNotEmpty()) {
-            val instance = taskQueue.peek()
+        if (taskQueueCount > 0) {
+            val batch = ArrayList<TaskState>(taskQueueCount)
+            while (taskQueue.isNotEmpty()) {
+                val instance = taskQueue.poll()
+
+                batch += instance
+                activeTasks += instance
+                rootListener.taskAssigned(instance)
+            }
 
+            scope.launch { dispatch(batch) }
+        }
+
+        if (start != 0L) {
+            val duration = System.nanoTime() - start
+            rootListener.cycleFinished(
+                SchedulingCycle(clock.millis(), duration, incomingJobCount, jobQueueCount, incomingTaskCount, taskQueueCount)
+            )
+        }
+    }
+
+    /**
+     * Create the servers of the tasks in [batch] with a single call to the compute service and start them in order.
+     */
+    private suspend fun dispatch(batch: List<TaskState>) {
+        val image = image
+        val requests = batch.map { instance ->
             val cores = instance.task.metadata[WORKFLOW_TASK_CORES] as? Int ?: 1
-            val image = image
-            scope.launch {
-                val flavor = computeClient.newFlavor(
-                    instance.task.name,
-                    cores,
-                    1000
-                ) // TODO How to determine memory usage for workflow task
-                val server = computeClient.newServer(
-                    instance.task.name,
-                    image,
-                    flavor,
-                    start = false,
-                    meta = instance.task.metadata
-                )
-
-                instance.state = TaskStatus.ACTIVE
-                instance.server = server
-                taskByServer[server] = instance
-
-                server.watch(this@WorkflowServiceImpl)
-                server.start()
+            val flavor = flavors.getOrPut(cores to TASK_MEMORY) {
+                computeClient.newFlavor("workflow-task-$cores", cores, TASK_MEMORY)
             }
+            ServerRequest(instance.task.name, image, flavor, meta = instance.task.metadata)
+        }
+
+        // Register the tasks before starting their servers, so every state change of a server can be resolved
+        val servers = computeClient.newServers(requests, watcher = this, start = false)
+        for ((instance, server) in batch.zip(servers)) {
+            instance.state = TaskStatus.ACTIVE
+            instance.server = server
+            taskByServer[server] = instance
+        }
 
-            activeTasks += instance
-            taskQueue.poll()
-            rootListener.taskAssigned(instance)
+        for (server in servers) {
+            server.start()
         }
     }
 
@@ -323,10 +358,7 @@ public class WorkflowServiceImpl(
             ServerState.TERMINATED, ServerState.ERROR -> {
                 val task = taskByServer.remove(server) ?: throw IllegalStateException()
 
-                scope.launch {
-                    server.delete()
-                    server.flavor.delete()
-                }
+                scope.launch { server.delete() }
 
                 val job = task.job
                 task.state = TaskStatus.FINISHED
@@ -367,4 +399,11 @@ public class WorkflowServiceImpl(
 
         job.cont.resume(Unit)
     }
+
+    private companion object {
+        /**
+         * The memory size of a task server in MB.
+         */
+        const val TASK_MEMORY = 1000L // TODO How to determine memory usage for workflow task
+    }
 }
@@ -0,0 +1,318 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.simulator.compute.workload.SimWorkloads
+import org.opendc.trace.Trace
+import org.opendc.trace.conv.TABLE_TASKS
+import org.opendc.trace.conv.TASK_ALLOC_NCPUS
+import org.opendc.trace.conv.TASK_ID
+import org.opendc.trace.conv.TASK_PARENTS
+import org.opendc.trace.conv.TASK_REQ_NCPUS
+import org.opendc.trace.conv.TASK_RUNTIME
+import org.opendc.trace.conv.TASK_SUBMIT_TIME
+import org.opendc.trace.conv.TASK_WORKFLOW_ID
+import org.opendc.workflow.api.Job
+import org.opendc.workflow.api.Task
+import org.opendc.workflow.api.WORKFLOW_TASK_CORES
+import org.opendc.workflow.api.WORKFLOW_TASK_DEADLINE
+import org.opendc.workflow.api.WORKFLOW_TASK_MINIMAL_START_TIME
+import java.time.Instant
+import java.util.UUID
+import kotlin.math.min
+
+/**
+ * A compact table of the jobs of a workflow trace, ordered by submission time.
+ *
+ * The tasks are stored in primitive arrays, grouped by job, and their dependencies as offsets into a single array of
+ * task indices (compressed sparse rows). The [Job] and [Task] objects of a job are only created when the job is
+ * requested with [job], so a replay holds the objects of the jobs that are in progress rather than of the whole trace.
+ */
+public class JobTable internal constructor(
+    internal val jobIds: LongArray,
+    internal val submitTimes: LongArray,
+    internal val taskOffsets: IntArray,
+    internal val taskIds: LongArray,
+    internal val taskCpus: IntArray,
+    internal val taskRuntimes: LongArray,
+    internal val parentOffsets: IntArray,
+    internal val parents: IntArray
+) {
+    /**
+     * The number of jobs in the table.
+     */
+    public val size: Int
+        get() = jobIds.size
+
+    /**
+     * The number of tasks in the table.
+     */
+    public val taskCount: Int
+        get() = taskIds.size
+
+    /**
+     * Return the submission time of the job at [index] in milliseconds since the epoch, or [Long.MAX_VALUE] if the job
+     * has no tasks.
+     */
+    public fun submitTime(index: Int): Long = submitTimes[index]
+
+    /**
+     * Create the [Job] at [index], including its [Task]s.
+     */
+    public fun job(index: Int): Job {
+        val start = taskOffsets[index]
+        val end = taskOffsets[index + 1]
+        val tasks = arrayOfNulls<Task>(end - start)
+
+        for (i in start until end) {
+            val cpus = taskCpus[i]
+            val runtime = taskRuntimes[i]
+            val flops: Long = 4000 * Math.floorDiv(runtime, 1000L) * cpus
+            val workload = SimWorkloads.flops(flops, 1.0)
+            tasks[i - start] = Task(
+                UUID(0L, taskIds[i]),
+                "<unnamed>",
+                HashSet(),
+                mutableMapOf(
+                    "workload" to workload,
+                    "workload_flops" to flops,
+                    WORKFLOW_TASK_CORES to cpus,
+                    WORKFLOW_TASK_DEADLINE to runtime,
+                    // Called deadline, but filled with runtime???
+                    WORKFLOW_TASK_MINIMAL_START_TIME to 0
+                )
+            )
+        }
+
+        for (i in start until end) {
+            val dependencies = tasks[i - start]!!.dependencies as MutableSet<Task>
+            for (j in parentOffsets[i] until parentOffsets[i + 1]) {
+                dependencies.add(tasks[parents[j] - start]!!)
+            }
+        }
+
+        val metadata = HashMap<String, Any>()
+        if (submitTimes[index] != Long.MAX_VALUE) {
+            metadata["WORKFLOW_SUBMIT_TIME"] = submitTimes[index]
+        }
+
+        return Job(UUID(0L, jobIds[index]), "<unnamed>", tasks.filterNotNullTo(HashSet()), metadata)
+    }
+
+    /**
+     * Create all jobs of the table, in order of submission.
+     */
+    public fun toList(): List<Job> = List(size) { job(it) }
+
+    public companion object {
+        /**
+         * Read the tasks of [trace] that are submitted before [submitTimeLimit] into a [JobTable] in a single pass.
+         */
+        public fun read(trace: Trace, submitTimeLimit: Instant = Instant.MAX): JobTable {
+            val table = checkNotNull(trace.getTable(TABLE_TASKS))
+            val reader = table.newReader()
+
+            val jobIndices = HashMap<Long, Int>()
+            val jobIds = LongBuffer()
+            val rowJobs = IntBuffer()
+            val rowIds = LongBuffer()
+            val rowCpus = IntBuffer()
+            val rowSubmitTimes = LongBuffer()
+            val rowRuntimes = LongBuffer()
+            val rowParentEnds = IntBuffer()
+            val rowParents = LongBuffer()
+
+            try {
+                val hasWorkflowId = reader.resolve(TASK_WORKFLOW_ID) != -1
+                val hasAllocCpus = reader.resolve(TASK_ALLOC_NCPUS) != -1
+
+                while (reader.nextRow()) {
+                    // Bag of tasks without workflow ID all share the same workflow
+                    val workflowId = if (hasWorkflowId) reader.getString(TASK_WORKFLOW_ID)!!.toLong() else 0L
+                    val job = jobIndices.getOrPut(workflowId) {
+                        jobIds.add(workflowId)
+                        jobIds.size - 1
+                    }
+
+                    val submitTime = reader.getInstant(TASK_SUBMIT_TIME)!!
+                    if (submitTime > submitTimeLimit) {
+                        continue
+                    }
+
+                    rowJobs.add(job)
+                    rowIds.add(reader.getString(TASK_ID)!!.toLong())
+                    rowCpus.add(if (hasAllocCpus) reader.getInt(TASK_ALLOC_NCPUS) else reader.getInt(TASK_REQ_NCPUS))
+                    rowSubmitTimes.add(submitTime.toEpochMilli())
+                    rowRuntimes.add(reader.getDuration(TASK_RUNTIME)!!.toMillis())
+                    for (parent in reader.getSet(TASK_PARENTS, String::class.java)!!) {
+                        rowParents.add(parent.toLong())
+                    }
+                    rowParentEnds.add(rowParents.size)
+                }
+            } finally {
+                reader.close()
+            }
+
+            return build(jobIds.toArray(), rowJobs.toArray(), rowIds.toArray(), rowCpus.toArray(), rowSubmitTimes.toArray(), rowRuntimes.toArray(), rowParentEnds.toArray(), rowParents.toArray())
+        }
+
+        /**
+         * Build a [JobTable] from the tasks in the order in which they were read.
+         */
+        private fun build(
+            jobIds: LongArray,
+            rowJobs: IntArray,
+            rowIds: LongArray,
+            rowCpus: IntArray,
+            rowSubmitTimes: LongArray,
+            rowRuntimes: LongArray,
+            rowParentEnds: IntArray,
+            rowParents: LongArray
+        ): JobTable {
+            val rows = rowIds.size
+
+            // Order the jobs by submission time (the earliest submission of their tasks), ties in order of appearance
+            val jobSubmitTimes = LongArray(jobIds.size) { Long.MAX_VALUE }
+            for (row in 0 until rows) {
+                jobSubmitTimes[rowJobs[row]] = min(jobSubmitTimes[rowJobs[row]], rowSubmitTimes[row])
+            }
+            val jobOrder = jobIds.indices.sortedBy { jobSubmitTimes[it] }
+            val jobRank = IntArray(jobIds.size)
+            for ((rank, job) in jobOrder.withIndex()) {
+                jobRank[job] = rank
+            }
+
+            // Group the tasks by job in a stable counting sort
+            val taskOffsets = IntArray(jobIds.size + 1)
+            for (row in 0 until rows) {
+                taskOffsets[jobRank[rowJobs[row]] + 1]++
+            }
+            for (rank in jobIds.indices) {
+                taskOffsets[rank + 1] += taskOffsets[rank]
+            }
+            val next = taskOffsets.copyOf(jobIds.size)
+            val rowToTask = IntArray(rows)
+            val taskToRow = IntArray(rows)
+            for (row in 0 until rows) {
+                val task = next[jobRank[rowJobs[row]]]++
+                rowToTask[row] = task
+                taskToRow[task] = row
+            }
+
+            // Resolve the identifiers of the parents to task indices. If an identifier occurs more than once, the
+            // last task with that identifier is the parent.
+            val sortedIds = rowIds.copyOf()
+            sortedIds.sort()
+            val idToRow = IntArray(rows)
+            for (row in 0 until rows) {
+                idToRow[lowerBound(sortedIds, rowIds[row])] = row
+            }
+
+            val parentOffsets = IntArray(rows + 1)
+            val parents = IntArray(rowParents.size)
+            for (task in 0 until rows) {
+                val row = taskToRow[task]
+                val start = if (row == 0) 0 else rowParentEnds[row - 1]
+                val end = rowParentEnds[row]
+                var offset = parentOffsets[task]
+                for (i in start until end) {
+                    val id = rowParents[i]
+                    val index = lowerBound(sortedIds, id)
+                    require(index < rows && sortedIds[index] == id) { "Dependency task with id $id not found" }
+                    val parent = idToRow[index]
+                    require(rowJobs[parent] == rowJobs[row]) { "Task ${rowIds[row]} depends on task $id of another workflow" }
+                    parents[offset++] = rowToTask[parent]
+                }
+                parentOffsets[task + 1] = offset
+            }
+
+            return JobTable(
+                LongArray(jobIds.size) { jobIds[jobOrder[it]] },
+                LongArray(jobIds.size) { jobSubmitTimes[jobOrder[it]] },
+                taskOffsets,
+                LongArray(rows) { rowIds[taskToRow[it]] },
+                IntArray(rows) { rowCpus[taskToRow[it]] },
+                LongArray(rows) { rowRuntimes[taskToRow[it]] },
+                parentOffsets,
+                parents
+            )
+        }
+
+        /**
+         * Return the index of the first element of the sorted [array] that is not less than [value].
+         */
+        private fun lowerBound(array: LongArray, value: Long): Int {
+            var low = 0
+            var high = array.size
+            while (low < high) {
+                val mid = (low + high) ushr 1
+                if (array[mid] < value) {
+                    low = mid + 1
+                } else {
+                    high = mid
+                }
+            }
+            return low
+        }
+    }
+
+    /**
+     * A growable array of [Long]s.
+     */
+    internal class LongBuffer {
+        private var values = LongArray(1024)
+        var size = 0
+            private set
+
+        fun add(value: Long) {
+            if (size == values.size) {
+                values = values.copyOf(size * 2)
+            }
+            values[size++] = value
+        }
+
+        operator fun get(index: Int): Long = values[index]
+
+        fun toArray(): LongArray = values.copyOf(size)
+    }
+
+    /**
+     * A growable array of [Int]s.
+     */
+    internal class IntBuffer {
+        private var values = IntArray(1024)
+        var size = 0
+            private set
+
+        fun add(value: Int) {
+            if (size == values.size) {
+                values = values.copyOf(size * 2)
+            }
+            values[size++] = value
+        }
+
+        operator fun get(index: Int): Int = values[index]
+
+        fun toArray(): IntArray = values.copyOf(size)
+    }
+}
@@ -26,9 +26,18 @@ import kotlinx.coroutines.coroutineScope
 import kotlinx.coroutines.delay
 import kotlinx.coroutines.launch
 import org.opendc.workflow.service.WorkflowService
+import org.opendc.workflow.service.internal.WorkflowServiceImpl
 
 import org.opendc.compute.service.ComputeService
 import org.opendc.workflow.service.lab.model.Scenario
+import org.opendc.workflow.service.lab.telemetry.DoubleColumn
+import org.opendc.workflow.service.lab.telemetry.IntColumn
+import org.opendc.workflow.service.lab.telemetry.LongColumn
+import org.opendc.workflow.service.lab.telemetry.ProfiledComputeMonitor
+import org.opendc.workflow.service.lab.telemetry.ProfiledComputeScheduler
+import org.opendc.workflow.service.lab.telemetry.Profiler
+import org.opendc.workflow.service.lab.telemetry.SampleColumn
+import org.opendc.workflow.service.lab.telemetry.StreamComputeMonitor
 import org.opendc.workflow.service.lab.topology.clusterTopology
 import org.opendc.experiments.compute.ComputeWorkloadLoader
 import org.opendc.experiments.compute.createComputeScheduler
@@ -38,6 +47,7 @@ import org.opendc.experiments.compute.registerComputeMonitor
 import org.opendc.experiments.compute.replay
 import org.opendc.experiments.compute.setupComputeService
 import org.opendc.experiments.compute.setupHosts
+import org.opendc.experiments.compute.telemetry.ComputeMetricReader
 import org.opendc.experiments.compute.telemetry.ComputeMonitor
 import org.opendc.experiments.compute.telemetry.table.HostInfo
 import org.opendc.experiments.compute.telemetry.table.HostTableReader
@@ -82,58 +92,155 @@ import kotlin.math.roundToLong
  * Helper class for running the Capelin experiments.
  *
  * @param envPath The path to the directory containing the environments.
+ * @param outPath The path of the file to which the summary of the [TestComputeMonitor] is written. Repeats after the
+ * first are written next to it (see [repeatPath]).
+ * @param outputPath The path to the directory where the columnar output should be written (or `null` if no columnar
+ * output should be generated).
+ * @param spillPath The directory to which the host samples are spilled during a run (or `null` to keep them in memory).
+ * @param streamPath The file to which the host samples are streamed while a run is in progress (or `null` if no stream
+ * should be written).
+ * @param profile A flag to instrument the hot paths of every run and write the profile next to its summary (see
+ * [Profiler]).
+ * @param changeThreshold The threshold for change-driven sampling of the host samples in the summary, or `null` to
+ * sample every host every export interval (see [ComputeMetricReader]).
  */
 
 public class LabRunner(
     private val envPath: File,
     private val outPath: String,
+    private val outputPath: File? = null,
+    private val spillPath: File? = null,
+    private val streamPath: File? = null,
+    private val profile: Boolean = false,
+    private val changeThreshold: Double? = null,
 ) {
+    /**
+     * Return the path of the summary of the repeat with the specified [iteration]: [outPath] for the first repeat and
+     * `<name>.<iteration>.<extension>` for the following ones, such that repeats do not overwrite each other.
+     */
+    fun repeatPath(iteration: Int): String = repeatPath(outPath, iteration)
+
     /**
      * Run a single [scenario] with the specified seed.
      */
     fun runScenario(scenario: Scenario, seed: Long, iteration: Int) = runSimulation {
         val computeDomain = "compute.opendc.org"
         val workflowDomain = "workflow.opendc.org"
-        val topology = clusterTopology(File(envPath, "${scenario.topology.name}.txt"))
-        val monitor = TestComputeMonitor()
-
-        Provisioner(coroutineContext, clock, seed).use { provisioner ->
-            provisioner.runSteps(
-                setupComputeService(computeDomain, { createComputeScheduler(scenario.allocationPolicy, Random(it.seeder.nextLong()), clock) }),
-                setupHosts(computeDomain, topology),
-                registerComputeMonitor(computeDomain, monitor),
-                setupWorkflowService(
-                    workflowDomain,
-                    computeDomain,
-                    WorkflowSchedulerSpec(
-                        schedulingQuantum = scenario.schedQuantum,
-                        jobAdmissionPolicy = scenario.jobAdmissionPolicy,
-                        jobOrderPolicy = scenario.jobOrderPolicy,
-                        taskEligibilityPolicy = scenario.taskEligibilityPolicy,
-                        taskOrderPolicy = scenario.taskOrderPolicy
+        val profiler = if (profile) Profiler(File(repeatPath(iteration))) else null
+        val monitor = TestComputeMonitor(spillPath, changeThreshold)
+
+        // Release the spill files and the profile of a failed run as well, as a sweep continues with the next run
+        try {
+            val topology = clusterTopology(File(envPath, "${scenario.topology.name}.txt"))
+
+            Provisioner(coroutineContext, clock, seed).use { provisioner ->
+                profiler.phase("setup") {
+                    provisioner.runSteps(
+                        setupComputeService(
+                            computeDomain,
+                            {
+                                var scheduler = createComputeScheduler(scenario.allocationPolicy, Random(it.seeder.nextLong()), clock)
+                                val warmup = scenario.warmup
+                                if (warmup != null) {
+                                    val warmupScheduler = createComputeScheduler(warmup.allocationPolicy, Random(it.seeder.nextLong()), clock)
+                                    scheduler = WarmupComputeScheduler(warmupScheduler, scheduler, clock, warmup.duration.toMillis())
+                                }
+                                if (profiler != null) ProfiledComputeScheduler(scheduler, profiler) else scheduler
+                            }
+                        ),
+                        setupHosts(computeDomain, topology),
+                        registerComputeMonitor(
+                            computeDomain,
+                            if (profiler != null) ProfiledComputeMonitor(monitor, profiler) else monitor,
+                            changeThreshold = changeThreshold
+                        ),
+                        setupWorkflowService(
+                            workflowDomain,
+                            computeDomain,
+                            WorkflowSchedulerSpec(
+                                schedulingQuantum = scenario.schedQuantum,
+                                jobAdmissionPolicy = scenario.jobAdmissionPolicy,
+                                jobOrderPolicy = scenario.jobOrderPolicy,
+                                taskEligibilityPolicy = scenario.taskEligibilityPolicy,
+                                taskOrderPolicy = scenario.taskOrderPolicy
+                            )
+                        ),
+                    )
+                }
+
+                if (streamPath != null) {
+                    val stream = File(repeatPath(streamPath.path, iteration))
+                    provisioner.runStep(registerComputeMonitor(computeDomain, StreamComputeMonitor(stream)))
+                }
+
+                if (outputPath != null) {
+                    val partitions = scenario.partitions + ("seed" to seed.toString())
+                    val partition = partitions.map { (k, v) -> "$k=$v" }.joinToString("/")
+
+                    provisioner.runStep(
+                        registerComputeMonitor(
+                            computeDomain,
+                            ParquetComputeMonitor(
+                                outputPath,
+                                partition,
+                                bufferSize = 4096
+                            )
+                        )
                     )
-                ),
-            )
-
-            val operationalPhenomena = scenario.operationalPhenomena
-            val failureModel =
-                if (operationalPhenomena.failureFrequency > 0) {
-                    grid5000(Duration.ofSeconds((operationalPhenomena.failureFrequency * 60).roundToLong()))
-                } else {
-                    null
                 }
 
-            val service = provisioner.registry.resolve(workflowDomain, WorkflowService::class.java)!!
+                val operationalPhenomena = scenario.operationalPhenomena
+                val failureModel =
+                    if (operationalPhenomena.failureFrequency > 0) {
+                        grid5000(Duration.ofSeconds((operationalPhenomena.failureFrequency * 60).roundToLong()))
+                    } else {
+                        null
+                    }
 
-            service.replay(clock, scenario.workload.source.toJobs())
+                val service = provisioner.registry.resolve(workflowDomain, WorkflowService::class.java)!!
+                if (profiler != null) {
+                    (service as? WorkflowServiceImpl)?.addListener(profiler)
+                }
+
+                val jobs = profiler.phase("load") { scenario.workload.jobs ?: scenario.workload.source.toJobTable() }
+                profiler.phase("simulation") { service.replay(clock, jobs) }
+            }
+
+//            monitor.show()
+            profiler.phase("write") { monitor.toFile(repeatPath(iteration)) }
+        } finally {
+            monitor.clear()
+            profiler?.close()
         }
+    }
+
+    /**
+     * Run [block] as a phase of this profiler, or just run it if profiling is disabled.
+     */
+    private inline fun <T> Profiler?.phase(name: String, block: () -> T): T =
+        if (this != null) phase(name, block) else block()
 
-//        monitor.show()
-        monitor.toFile(outPath)
+    private fun repeatPath(path: String, iteration: Int): String {
+        if (iteration == 0) {
+            return path
+        }
+
+        val file = File(path)
+        val name = "${file.nameWithoutExtension}.$iteration" + if (file.extension.isEmpty()) "" else ".${file.extension}"
+        return File(file.parentFile, name).path
     }
 }
 
-class TestComputeMonitor : ComputeMonitor {
+/**
+ * A [ComputeMonitor] that aggregates the metrics of a lab run and keeps the per-cycle host samples in
+ * [SampleColumn]s.
+ *
+ * @param spillDirectory The directory to which full chunks of host samples are spilled, or `null` to keep all samples
+ * in memory.
+ * @param changeThreshold The threshold of the change-driven sampling that the host samples are recorded with, or
+ * `null` if every host is sampled every cycle. It is written to the summary, such that the samples can be expanded.
+ */
+class TestComputeMonitor(spillDirectory: File? = null, private val changeThreshold: Double? = null) : ComputeMonitor {
     var attemptsSuccess = 0
     var attemptsFailure = 0
     var attemptsError = 0
@@ -143,7 +250,13 @@ class TestComputeMonitor : ComputeMonitor {
     var hostsDown = 0
     var serversTotal = 0
 
+    /**
+     * The timestamp (in ms since the epoch) of every cycle.
+     */
+    val ticks = LongColumn(spillDirectory = spillDirectory)
+
     override fun record(reader: ServiceTableReader) {
+        ticks += reader.timestamp.toEpochMilli()
         attemptsSuccess = reader.attemptsSuccess
         attemptsFailure = reader.attemptsFailure
         attemptsError = reader.attemptsError
@@ -158,17 +271,30 @@ class TestComputeMonitor : ComputeMonitor {
     var activeTime = 0L
     var stealTime = 0L
     var lostTime = 0L
-    var energyUsage: List<Double> = listOf()
-    var powerUsage: List<Double> = listOf()
+    val energyUsage = DoubleColumn(spillDirectory = spillDirectory)
+    val powerUsage = DoubleColumn(spillDirectory = spillDirectory)
     var uptime = 0L
     var downtime = 0L
     var cpuLimit = 0.0
     var cpuUsage = 0.0
     var cpuDemand = 0.0
-    var cpuUtilization: List<Double> = listOf()
-    var guestsRunning: List<Int> = listOf()
+    val cpuUtilization = DoubleColumn(spillDirectory = spillDirectory)
+    val guestsRunning = IntColumn(spillDirectory = spillDirectory)
+
+    /**
+     * The timestamp (in ms since the epoch) and host index of every host sample.
+     */
+    val timestamps = LongColumn(spillDirectory = spillDirectory)
+    val hostIndices = IntColumn(spillDirectory = spillDirectory)
+
+    /**
+     * Mapping from host identifiers to their index, in the order in which the hosts were first recorded.
+     */
+    val hosts = mutableMapOf<String, Int>()
 
     override fun record(reader: HostTableReader) {
+        timestamps += reader.timestamp.toEpochMilli()
+        hostIndices += hosts.getOrPut(reader.host.id) { hosts.size }
         idleTime += reader.cpuIdleTime
         activeTime += reader.cpuActiveTime
         stealTime += reader.cpuStealTime
@@ -203,43 +329,83 @@ class TestComputeMonitor : ComputeMonitor {
         serverCpuLostTime += reader.cpuLostTime
     }
 
-    fun getContents(): String {
-        var metrics: String = "monitor; metric; value; unit\n" +
-            "host; idleTime; ${idleTime}; seconds\n" +
-            "host; activeTime; ${activeTime}; seconds\n" +
-            "host; stealTime; ${stealTime}; seconds\n" +
-            "host; lostTime; ${lostTime}; seconds\n" +
-            "host; energyUsage; ${energyUsage}; J per cycle\n" +
-            "host; powerUsage; ${powerUsage}; W per cycle\n" +
-            "host; uptime; ${uptime}; ms\n" +
-            "host; downtime; ${downtime}; ms\n" +
-            "host; cpuLimit; ${cpuLimit}; MHz\n" +
-            "host; cpuDemand; ${cpuDemand}; MHz\n" +
-            "host; cpuUtilization; ${cpuUtilization}; %\n" +
-            "host; guestsRunning; ${guestsRunning};\n" +
-            "service; attemptsSuccess; ${attemptsSuccess};\n" +
-            "service; attemptsFailure; ${attemptsFailure};\n" +
-            "service; attemptsError; ${attemptsError};\n" +
-            "service; serversPending; ${serversPending};\n" +
-            "service; serversActive; ${serversActive};\n" +
-            "service; hostsUp; ${hostsUp};\n" +
-            "service; hostsDown; ${hostsDown};\n" +
-            "service; serversTotal; ${serversTotal};\n" +
-            "server; cpuLimit; ${serverCpuLimit}; MHz\n" +
-            "server; cpuActiveTime; ${serverCpuActiveTime}; seconds\n" +
-            "server; cpuIdleTime; ${serverCpuIdleTime}; seconds\n" +
-            "server; cpuStealTime; ${serverCpuStealTime}; seconds\n" +
-            "server; cpuLostTime; ${serverCpuLostTime}; seconds\n" +
-            "server; sysUptime; ${sysUptime}; ms\n" +
-            "server; sysDowntime; ${sysDowntime}; ms\n"
-        return metrics
+    /**
+     * Write the metrics to [out], streaming the host samples from their columns.
+     */
+    fun writeTo(out: Appendable) {
+        out.append("monitor; metric; value; unit\n")
+        out.metric("host", "idleTime", idleTime, "seconds")
+        out.metric("host", "activeTime", activeTime, "seconds")
+        out.metric("host", "stealTime", stealTime, "seconds")
+        out.metric("host", "lostTime", lostTime, "seconds")
+        out.metric("host", "energyUsage", energyUsage, "J per cycle")
+        out.metric("host", "powerUsage", powerUsage, "W per cycle")
+        out.metric("host", "uptime", uptime, "ms")
+        out.metric("host", "downtime", downtime, "ms")
+        out.metric("host", "cpuLimit", cpuLimit, "MHz")
+        out.metric("host", "cpuDemand", cpuDemand, "MHz")
+        out.metric("host", "cpuUtilization", cpuUtilization, "%")
+        out.metric("host", "guestsRunning", guestsRunning)
+        out.metric("host", "timestamp", timestamps, "ms")
+        out.metric("host", "hostIndex", hostIndices)
+        out.metric("host", "hostId", hosts.keys)
+        if (changeThreshold != null) {
+            out.metric("host", "changeThreshold", changeThreshold)
+        }
+        out.metric("service", "tickTimestamp", ticks, "ms")
+        out.metric("service", "attemptsSuccess", attemptsSuccess)
+        out.metric("service", "attemptsFailure", attemptsFailure)
+        out.metric("service", "attemptsError", attemptsError)
+        out.metric("service", "serversPending", serversPending)
+        out.metric("service", "serversActive", serversActive)
+        out.metric("service", "hostsUp", hostsUp)
+        out.metric("service", "hostsDown", hostsDown)
+        out.metric("service", "serversTotal", serversTotal)
+        out.metric("server", "cpuLimit", serverCpuLimit, "MHz")
+        out.metric("server", "cpuActiveTime", serverCpuActiveTime, "seconds")
+        out.metric("server", "cpuIdleTime", serverCpuIdleTime, "seconds")
+        out.metric("server", "cpuStealTime", serverCpuStealTime, "seconds")
+        out.metric("server", "cpuLostTime", serverCpuLostTime, "seconds")
+        out.metric("server", "sysUptime", sysUptime, "ms")
+        out.metric("server", "sysDowntime", sysDowntime, "ms")
     }
 
+    fun getContents(): String = buildString { writeTo(this) }
+
     fun show() {
         println(getContents())
     }
 
     fun toFile(fPath: String="") {
-        File(fPath).printWriter().use { out -> out.println(getContents()) }
+        File(fPath).bufferedWriter().use { out ->
+            writeTo(out)
+            out.newLine()
+        }
+    }
+
+    /**
+     * Drop the recorded host samples, including the chunks spilled to disk.
+     */
+    fun clear() {
+        energyUsage.clear()
+        powerUsage.clear()
+        cpuUtilization.clear()
+        guestsRunning.clear()
+        timestamps.clear()
+        hostIndices.clear()
+        ticks.clear()
+    }
+
+    /**
+     * Append a single metric line to this [Appendable].
+     */
+    private fun Appendable.metric(monitor: String, metric: String, value: Any, unit: String = "") {
+        append(monitor).append("; ").append(metric).append("; ")
+        if (value is SampleColumn<*>) {
+            value.writeTo(this)
+        } else {
+            append(value.toString())
+        }
+        append(if (unit.isEmpty()) ";\n" else "; $unit\n")
     }
 }
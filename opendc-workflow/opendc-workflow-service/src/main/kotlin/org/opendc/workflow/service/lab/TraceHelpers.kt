@@ -27,106 +27,50 @@ package org.opendc.workflow.service.lab
 import kotlinx.coroutines.coroutineScope
 import kotlinx.coroutines.delay
 import kotlinx.coroutines.launch
-import org.opendc.simulator.compute.workload.SimWorkloads
 import org.opendc.trace.Trace
-import org.opendc.trace.conv.TABLE_TASKS
-import org.opendc.trace.conv.TASK_ALLOC_NCPUS
-import org.opendc.trace.conv.TASK_ID
-import org.opendc.trace.conv.TASK_PARENTS
-import org.opendc.trace.conv.TASK_REQ_NCPUS
-import org.opendc.trace.conv.TASK_RUNTIME
-import org.opendc.trace.conv.TASK_SUBMIT_TIME
-import org.opendc.trace.conv.TASK_WORKFLOW_ID
 import org.opendc.workflow.api.Job
-import org.opendc.workflow.api.Task
-import org.opendc.workflow.api.WORKFLOW_TASK_CORES
-import org.opendc.workflow.api.WORKFLOW_TASK_DEADLINE
-import org.opendc.workflow.api.WORKFLOW_TASK_MINIMAL_START_TIME
 import org.opendc.workflow.service.WorkflowService
 import java.time.Clock
-import java.util.UUID
-import kotlin.collections.HashMap
-import kotlin.collections.HashSet
-import kotlin.math.min
 import java.time.Instant
 
 /**
- * Convert [Trace] into a list of [Job]s that can be submitted to the workflow service.
+ * Convert [Trace] into a list of [Job]s that can be submitted to the workflow service, ordered by submission time.
  */
-public fun Trace.toJobs(submitTimeLimit: Instant = Instant.MAX): List<Job> {
-    val table = checkNotNull(getTable(TABLE_TASKS))
-    val reader = table.newReader()
+public fun Trace.toJobs(submitTimeLimit: Instant = Instant.MAX): List<Job> = toJobTable(submitTimeLimit).toList()
 
-    val jobs = mutableMapOf<Long, Job>()
-    val tasks = mutableMapOf<UUID, Task>()
-    val taskDependencies = mutableMapOf<Task, Set<UUID>>()
-
-    try {
-        while (reader.nextRow()) {
-            // Bag of tasks without workflow ID all share the same workflow
-            val workflowId = if (reader.resolve(TASK_WORKFLOW_ID) != -1) reader.getString(TASK_WORKFLOW_ID)!!.toLong() else 0L
-            val workflow = jobs.computeIfAbsent(workflowId) { id -> Job(UUID(0L, id), "<unnamed>", HashSet(), HashMap()) }
-
-            val id = reader.getString(TASK_ID)!!.toLong()
-            val uid = UUID(0L, id)
-            val grantedCpus = if (reader.resolve(TASK_ALLOC_NCPUS) != -1) {
-                reader.getInt(TASK_ALLOC_NCPUS)
-            } else {
-                reader.getInt(TASK_REQ_NCPUS)
-            }
-            val submitTime = reader.getInstant(TASK_SUBMIT_TIME)!!
-            if (submitTime > submitTimeLimit) {
-                continue
-            }
-            val runtime = reader.getDuration(TASK_RUNTIME)!!
-            val flops: Long = 4000 * runtime.seconds * grantedCpus
-            val workload = SimWorkloads.flops(flops, 1.0)
-            val task = Task(
-                uid,
-                "<unnamed>",
-                HashSet(),
-                mutableMapOf(
-                    "workload" to workload,
-                    "workload_flops" to flops,
-                    WORKFLOW_TASK_CORES to grantedCpus,
-                    WORKFLOW_TASK_DEADLINE to runtime.toMillis(),
-                    // Called deadline, but filled with runtime???
-                    WORKFLOW_TASK_MINIMAL_START_TIME to 0
-                )
-            )
-
-            tasks[uid] = task
-            taskDependencies[task] = reader.getSet(TASK_PARENTS, String::class.java)!!.map { UUID(0L, it.toLong() ) }.toSet()
-            (workflow.metadata as MutableMap<String, Any>).merge("WORKFLOW_SUBMIT_TIME", submitTime.toEpochMilli()) { a, b -> min(a as Long, b as Long) }
-            (workflow.tasks as MutableSet<Task>).add(task)
-        }
-
-        // Resolve dependencies for all tasks
-        for ((task, deps) in taskDependencies) {
-            for (dep in deps) {
-                val parent = requireNotNull(tasks[dep]) { "Dependency task with id $dep not found" }
-                (task.dependencies as MutableSet<Task>).add(parent)
-            }
-        }
-    } finally {
-        reader.close()
-    }
-
-    return jobs.values.toList()
-}
+/**
+ * Read [Trace] into a compact [JobTable], from which the jobs are created as they are replayed.
+ */
+public fun Trace.toJobTable(submitTimeLimit: Instant = Instant.MAX): JobTable = JobTable.read(this, submitTimeLimit)
 
 /**
  * Helper method to replay the specified list of [jobs] and suspend execution util all jobs have finished.
  */
 public suspend fun WorkflowService.replay(clock: Clock, jobs: List<Job>) {
     // Sort jobs by their arrival time
-    val orderedJobs = jobs.sortedBy { it.metadata.getOrDefault("WORKFLOW_SUBMIT_TIME", Long.MAX_VALUE) as Long }
-    if (orderedJobs.isEmpty()) {
+    val orderedJobs = jobs.sortedBy { it.submitTime }
+    replay(clock, orderedJobs.size, { orderedJobs[it].submitTime }, { orderedJobs[it] })
+}
+
+/**
+ * Helper method to replay the jobs of the specified [table] and suspend execution util all jobs have finished. Every
+ * job is only created once it is submitted.
+ */
+public suspend fun WorkflowService.replay(clock: Clock, table: JobTable) {
+    replay(clock, table.size, table::submitTime, table::job)
+}
+
+/**
+ * Replay [count] jobs in order of submission, where [submitTime] and [job] provide the submission time and the job at
+ * an index.
+ */
+private suspend fun WorkflowService.replay(clock: Clock, count: Int, submitTime: (Int) -> Long, job: (Int) -> Job) {
+    if (count == 0) {
         return
     }
 
     // Wait until the trace is started
-    val startTime = orderedJobs[0].metadata.getOrDefault("WORKFLOW_SUBMIT_TIME", Long.MAX_VALUE) as Long
+    val startTime = submitTime(0)
     var offset = 0L
 
     if (startTime != Long.MAX_VALUE) {
@@ -135,13 +79,20 @@ public suspend fun WorkflowService.replay(clock: Clock, jobs: List<Job>) {
     }
 
     coroutineScope {
-        for (job in orderedJobs) {
-            val submitTime = job.metadata.getOrDefault("WORKFLOW_SUBMIT_TIME", Long.MAX_VALUE) as Long
-            if (submitTime != Long.MAX_VALUE) {
-                delay(((submitTime - offset) - clock.millis()).coerceAtLeast(0))
+        for (index in 0 until count) {
+            val time = submitTime(index)
+            if (time != Long.MAX_VALUE) {
+                delay(((time - offset) - clock.millis()).coerceAtLeast(0))
             }
 
-            launch { invoke(job) }
+            val instance = job(index)
+            launch { invoke(instance) }
         }
     }
 }
+
+/**
+ * The submission time of a [Job] in milliseconds since the epoch, or [Long.MAX_VALUE] if it is unknown.
+ */
+private val Job.submitTime: Long
+    get() = metadata.getOrDefault("WORKFLOW_SUBMIT_TIME", Long.MAX_VALUE) as Long
@@ -0,0 +1,68 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.opendc.compute.api.Server
+import org.opendc.compute.service.internal.HostView
+import org.opendc.compute.service.scheduler.ComputeScheduler
+import java.time.Clock
+
+/**
+ * A [ComputeScheduler] that selects hosts with [warmup] for the first [duration] milliseconds of simulated time after
+ * its first selection (that is, after the workload started) and with [scheduler] afterwards. Both schedulers track the
+ * hosts from the start, so the switch is seamless.
+ */
+internal class WarmupComputeScheduler(
+    private val warmup: ComputeScheduler,
+    private val scheduler: ComputeScheduler,
+    private val clock: Clock,
+    private val duration: Long
+) : ComputeScheduler {
+    /**
+     * The simulated time at which the warm-up ends, or [Long.MIN_VALUE] if no host was selected yet.
+     */
+    private var until = Long.MIN_VALUE
+
+    override fun addHost(host: HostView) {
+        warmup.addHost(host)
+        scheduler.addHost(host)
+    }
+
+    override fun removeHost(host: HostView) {
+        warmup.removeHost(host)
+        scheduler.removeHost(host)
+    }
+
+    override fun updateHost(host: HostView) {
+        warmup.updateHost(host)
+        scheduler.updateHost(host)
+    }
+
+    override fun select(server: Server): HostView? {
+        val now = clock.millis()
+        if (until == Long.MIN_VALUE) {
+            until = now + duration
+        }
+        return if (now < until) warmup.select(server) else scheduler.select(server)
+    }
+}
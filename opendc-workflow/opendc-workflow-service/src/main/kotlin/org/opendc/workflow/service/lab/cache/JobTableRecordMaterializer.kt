@@ -0,0 +1,148 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.cache
+
+import org.apache.parquet.io.api.Converter
+import org.apache.parquet.io.api.GroupConverter
+import org.apache.parquet.io.api.PrimitiveConverter
+import org.apache.parquet.io.api.RecordMaterializer
+import org.apache.parquet.schema.MessageType
+import org.opendc.workflow.service.lab.JobTable
+
+/**
+ * A [RecordMaterializer] that appends the tasks written by [JobTableWriteSupport] directly to the columns of a
+ * [JobTable], without creating an object per task. The current record is the index of the task that was read last.
+ */
+internal class JobTableRecordMaterializer(schema: MessageType) : RecordMaterializer<Int>() {
+    /**
+     * The columns of the jobs.
+     */
+    private val jobIds = JobTable.LongBuffer()
+    private val submitTimes = JobTable.LongBuffer()
+    private val taskOffsets = JobTable.IntBuffer()
+
+    /**
+     * The columns of the tasks.
+     */
+    private val taskIds = JobTable.LongBuffer()
+    private val taskCpus = JobTable.IntBuffer()
+    private val taskRuntimes = JobTable.LongBuffer()
+    private val parentOffsets = JobTable.IntBuffer().apply { add(0) }
+    private val parents = JobTable.IntBuffer()
+
+    /**
+     * State of current record being read.
+     */
+    private var _id = 0L
+    private var _cpuCount = 0
+    private var _runtime = 0L
+
+    /**
+     * Root converter for the record.
+     */
+    private val root = object : GroupConverter() {
+        /**
+         * The converters for the columns of the schema.
+         */
+        private val converters = schema.fields.map { type ->
+            when (type.name) {
+                "workflow_id" -> object : PrimitiveConverter() {
+                    override fun addLong(value: Long) {
+                        // The tasks of a job are consecutive, so a task starts a new job if its workflow differs from
+                        // the workflow of the previous task
+                        val jobs = jobIds.size
+                        if (jobs == 0 || jobIds[jobs - 1] != value) {
+                            jobIds.add(value)
+                            taskOffsets.add(taskIds.size)
+                        }
+                    }
+                }
+                "submit_time" -> object : PrimitiveConverter() {
+                    override fun addLong(value: Long) {
+                        if (submitTimes.size < jobIds.size) {
+                            submitTimes.add(value)
+                        }
+                    }
+                }
+                "id" -> object : PrimitiveConverter() {
+                    override fun addLong(value: Long) {
+                        _id = value
+                    }
+                }
+                "cpu_count" -> object : PrimitiveConverter() {
+                    override fun addInt(value: Int) {
+                        _cpuCount = value
+                    }
+                }
+                "runtime" -> object : PrimitiveConverter() {
+                    override fun addLong(value: Long) {
+                        _runtime = value
+                    }
+                }
+                "parents" -> object : PrimitiveConverter() {
+                    override fun addInt(value: Int) {
+                        // Parents are stored relative to the first task of their job
+                        parents.add(taskOffsets[taskOffsets.size - 1] + value)
+                    }
+                }
+                else -> error("Unknown column $type")
+            }
+        }
+
+        override fun start() {
+            _id = 0L
+            _cpuCount = 0
+            _runtime = 0L
+        }
+
+        override fun end() {
+            taskIds.add(_id)
+            taskCpus.add(_cpuCount)
+            taskRuntimes.add(_runtime)
+            parentOffsets.add(parents.size)
+        }
+
+        override fun getConverter(fieldIndex: Int): Converter = converters[fieldIndex]
+    }
+
+    override fun getCurrentRecord(): Int = taskIds.size - 1
+
+    override fun getRootConverter(): GroupConverter = root
+
+    /**
+     * Build the [JobTable] of the tasks that have been read.
+     */
+    fun toTable(): JobTable {
+        val taskOffsets = taskOffsets.toArray() + taskIds.size
+        return JobTable(
+            jobIds.toArray(),
+            submitTimes.toArray(),
+            taskOffsets,
+            taskIds.toArray(),
+            taskCpus.toArray(),
+            taskRuntimes.toArray(),
+            parentOffsets.toArray(),
+            parents.toArray()
+        )
+    }
+}
@@ -0,0 +1,135 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.cache
+
+import org.apache.hadoop.conf.Configuration
+import org.apache.parquet.hadoop.api.WriteSupport
+import org.apache.parquet.io.api.RecordConsumer
+import org.apache.parquet.schema.LogicalTypeAnnotation
+import org.apache.parquet.schema.MessageType
+import org.apache.parquet.schema.PrimitiveType
+import org.apache.parquet.schema.Types
+import org.opendc.workflow.service.lab.JobTable
+
+/**
+ * Support for writing the tasks of a [JobTable] to Parquet format.
+ *
+ * A record is the index of a task in the table. The tasks are written in the order of the table, so the tasks of a
+ * job are consecutive and the jobs are ordered by submission time. The parents of a task are written as indices
+ * relative to the first task of its job.
+ */
+internal class JobTableWriteSupport(private val table: JobTable) : WriteSupport<Int>() {
+    /**
+     * The current active record consumer.
+     */
+    private lateinit var recordConsumer: RecordConsumer
+
+    /**
+     * The index of the job of the next task.
+     */
+    private var job = 0
+
+    override fun init(configuration: Configuration): WriteContext {
+        return WriteContext(WRITE_SCHEMA, emptyMap())
+    }
+
+    override fun prepareForWrite(recordConsumer: RecordConsumer) {
+        this.recordConsumer = recordConsumer
+    }
+
+    override fun write(record: Int) {
+        write(recordConsumer, record)
+    }
+
+    private fun write(consumer: RecordConsumer, task: Int) {
+        val table = table
+        while (table.taskOffsets[job + 1] <= task) {
+            job++
+        }
+        val start = table.taskOffsets[job]
+
+        consumer.startMessage()
+
+        consumer.startField("workflow_id", 0)
+        consumer.addLong(table.jobIds[job])
+        consumer.endField("workflow_id", 0)
+
+        consumer.startField("submit_time", 1)
+        consumer.addLong(table.submitTimes[job])
+        consumer.endField("submit_time", 1)
+
+        consumer.startField("id", 2)
+        consumer.addLong(table.taskIds[task])
+        consumer.endField("id", 2)
+
+        consumer.startField("cpu_count", 3)
+        consumer.addInteger(table.taskCpus[task])
+        consumer.endField("cpu_count", 3)
+
+        consumer.startField("runtime", 4)
+        consumer.addLong(table.taskRuntimes[task])
+        consumer.endField("runtime", 4)
+
+        val parentStart = table.parentOffsets[task]
+        val parentEnd = table.parentOffsets[task + 1]
+        if (parentStart < parentEnd) {
+            consumer.startField("parents", 5)
+            for (i in parentStart until parentEnd) {
+                consumer.addInteger(table.parents[i] - start)
+            }
+            consumer.endField("parents", 5)
+        }
+
+        consumer.endMessage()
+    }
+
+    companion object {
+        /**
+         * Parquet schema of the tasks of a [JobTable].
+         */
+        @JvmStatic
+        val WRITE_SCHEMA: MessageType = Types.buildMessage()
+            .addFields(
+                Types
+                    .required(PrimitiveType.PrimitiveTypeName.INT64)
+                    .named("workflow_id"),
+                Types
+                    .required(PrimitiveType.PrimitiveTypeName.INT64)
+                    .`as`(LogicalTypeAnnotation.timestampType(true, LogicalTypeAnnotation.TimeUnit.MILLIS))
+                    .named("submit_time"),
+                Types
+                    .required(PrimitiveType.PrimitiveTypeName.INT64)
+                    .named("id"),
+                Types
+                    .required(PrimitiveType.PrimitiveTypeName.INT32)
+                    .named("cpu_count"),
+                Types
+                    .required(PrimitiveType.PrimitiveTypeName.INT64)
+                    .named("runtime"),
+                Types
+                    .repeated(PrimitiveType.PrimitiveTypeName.INT32)
+                    .named("parents")
+            )
+            .named("task")
+    }
+}
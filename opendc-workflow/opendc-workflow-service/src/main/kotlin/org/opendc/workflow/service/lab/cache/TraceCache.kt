@@ -0,0 +1,166 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.cache
+
+import mu.KotlinLogging
+import org.apache.parquet.column.ParquetProperties
+import org.apache.parquet.hadoop.ParquetFileWriter
+import org.apache.parquet.hadoop.metadata.CompressionCodecName
+import org.opendc.trace.Trace
+import org.opendc.trace.util.parquet.LocalParquetReader
+import org.opendc.trace.util.parquet.LocalParquetWriter
+import org.opendc.workflow.service.lab.JobTable
+import java.io.OutputStream
+import java.nio.file.Files
+import java.nio.file.Path
+import java.nio.file.StandardCopyOption
+import java.security.DigestOutputStream
+import java.security.MessageDigest
+import java.util.concurrent.ConcurrentHashMap
+import java.util.stream.Collectors
+import kotlin.io.path.exists
+import kotlin.io.path.isDirectory
+import kotlin.io.path.isRegularFile
+
+/**
+ * A cache of compiled workflow traces.
+ *
+ * A trace is parsed once into a [JobTable], which is written as a Parquet file to [path] under the hash of the
+ * contents and format of the trace. Later loads of the same trace read the columns of that file back into a
+ * [JobTable] instead of parsing the trace again, and tables that were loaded before by this instance are shared, so
+ * the runs of a sweep only pay for hashing the trace files.
+ *
+ * @param path The directory in which the compiled traces are stored.
+ */
+public class TraceCache(private val path: Path) {
+    /**
+     * The logging instance of this class.
+     */
+    private val logger = KotlinLogging.logger {}
+
+    /**
+     * The tables that have been loaded by this cache, by hash.
+     */
+    private val tables = ConcurrentHashMap<String, JobTable>()
+
+    /**
+     * Load the [JobTable] of the trace at [trace] in the specified [format], compiling the trace if it is not in
+     * the cache.
+     */
+    public fun load(trace: Path, format: String): JobTable {
+        val hash = hash(trace, format)
+        return tables.computeIfAbsent(hash) { load(trace, format, it) }
+    }
+
+    /**
+     * Return the path of the compiled trace with the specified [hash].
+     */
+    public fun pathOf(hash: String): Path = path.resolve("$hash.parquet")
+
+    /**
+     * Read the compiled trace with [hash] or compile the trace at [trace] if it does not exist.
+     */
+    private fun load(trace: Path, format: String, hash: String): JobTable {
+        val file = pathOf(hash)
+        if (file.exists()) {
+            try {
+                return read(file)
+            } catch (e: Exception) {
+                logger.warn(e) { "Failed to read compiled trace $file; compiling $trace again" }
+            }
+        }
+
+        logger.info { "Compiling trace $trace ($format) to $file" }
+        val table = JobTable.read(Trace.open(trace, format = format))
+        write(table, file)
+        return table
+    }
+
+    /**
+     * Read the [JobTable] stored at [file].
+     */
+    private fun read(file: Path): JobTable {
+        val readSupport = JobTableReadSupport()
+        LocalParquetReader(file, readSupport).use { reader ->
+            while (reader.read() != null) {
+                continue
+            }
+        }
+        return readSupport.materializer.toTable()
+    }
+
+    /**
+     * Write [table] to [file]. The table is written to a temporary file that is moved in place when it is complete,
+     * so concurrent runs never read a partial file.
+     */
+    private fun write(table: JobTable, file: Path) {
+        Files.createDirectories(path)
+        val tmp = Files.createTempFile(path, file.fileName.toString(), ".tmp")
+
+        try {
+            val writer = LocalParquetWriter.builder(tmp, JobTableWriteSupport(table))
+                .withWriterVersion(ParquetProperties.WriterVersion.PARQUET_2_0)
+                .withCompressionCodec(CompressionCodecName.ZSTD)
+                .withWriteMode(ParquetFileWriter.Mode.OVERWRITE)
+                .build()
+            writer.use {
+                for (task in 0 until table.taskCount) {
+                    it.write(task)
+                }
+            }
+            Files.move(tmp, file, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE)
+        } finally {
+            Files.deleteIfExists(tmp)
+        }
+    }
+
+    public companion object {
+        /**
+         * The version of the layout of the compiled traces, which is part of their hash.
+         */
+        private const val VERSION = 1
+
+        /**
+         * Return the hash of the trace at [trace] in the specified [format]: a SHA-256 digest over the format and the
+         * relative paths and contents of the files of the trace, in 32 hexadecimal characters.
+         */
+        public fun hash(trace: Path, format: String): String {
+            val digest = MessageDigest.getInstance("SHA-256")
+            digest.update("version=$VERSION\nformat=$format\n".toByteArray())
+
+            val files = if (trace.isDirectory()) {
+                Files.walk(trace).use { stream -> stream.filter { it.isRegularFile() }.sorted().collect(Collectors.toList()) }
+            } else {
+                listOf(trace)
+            }
+
+            DigestOutputStream(OutputStream.nullOutputStream(), digest).use { output ->
+                for (file in files) {
+                    digest.update("${trace.relativize(file)}\n".toByteArray())
+                    Files.copy(file, output)
+                }
+            }
+            return digest.digest().joinToString("") { "%02x".format(it) }.substring(0, 32)
+        }
+    }
+}
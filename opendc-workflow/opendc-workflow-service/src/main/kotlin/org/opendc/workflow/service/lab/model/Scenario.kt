@@ -36,6 +36,8 @@ import java.time.Duration
  * @property operationalPhenomena The [OperationalPhenomena] to model.
  * @property allocationPolicy The allocation policy of the scheduler.
  * @property partitions The partition of the scenario.
+ * @property warmup The warm-up that precedes the allocation policy, or `null` to use the allocation policy from the
+ * start.
  */
 public data class Scenario(
     val topology: Topology,
@@ -47,4 +49,6 @@ public data class Scenario(
     val taskOrderPolicy: TaskOrderPolicy,
     val allocationPolicy: String,
     val operationalPhenomena: OperationalPhenomena,
+    val partitions: Map<String, String> = emptyMap(),
+    val warmup: Warmup? = null
 )
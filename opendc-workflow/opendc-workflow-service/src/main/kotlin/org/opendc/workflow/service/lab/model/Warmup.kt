@@ -0,0 +1,42 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.model
+
+import java.time.Duration
+
+/**
+ * A warm-up phase that precedes the allocation policy of a scenario: for the first [duration] of simulated time after
+ * the workload started, hosts are selected by [allocationPolicy], after which the allocation policy of the scenario
+ * takes over. Runs that share a warm-up, seed and workflow policies pass through the same state until the end of the
+ * warm-up, so the allocation policies they compare start from the same warmed-up cluster.
+ *
+ * @param duration The duration of the warm-up in simulated time.
+ * @param allocationPolicy The allocation policy during the warm-up.
+ */
+public data class Warmup(val duration: Duration, val allocationPolicy: String) {
+    /**
+     * The name of the warm-up, under which the results of its runs are stored.
+     */
+    val name: String
+        get() = "warmup-$allocationPolicy-${duration.toMinutes()}m"
+}
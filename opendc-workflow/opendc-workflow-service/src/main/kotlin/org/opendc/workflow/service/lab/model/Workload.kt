@@ -24,11 +24,14 @@ package org.opendc.workflow.service.lab.model
 
 import org.opendc.experiments.compute.ComputeWorkload
 import org.opendc.trace.Trace
+import org.opendc.workflow.service.lab.JobTable
 
 /**
  * A single workload originating from a trace.
  *
  * @param name the name of the workload.
  * @param source The source of the workload data.
+ * @param jobs The compiled jobs of [source] (e.g. from a [org.opendc.workflow.service.lab.cache.TraceCache]), or
+ * `null` to read the jobs from [source] when the workload is replayed.
  */
-data class Workload(val name: String, val source: Trace)
+data class Workload(val name: String, val source: Trace, val jobs: JobTable? = null)
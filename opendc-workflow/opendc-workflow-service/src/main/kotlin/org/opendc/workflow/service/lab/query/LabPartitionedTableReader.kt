@@ -0,0 +1,333 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+package org.opendc.workflow.service.lab.query
+
+import org.apache.hadoop.conf.Configuration
+import org.apache.parquet.hadoop.api.InitContext
+import org.apache.parquet.hadoop.api.ReadSupport
+import org.apache.parquet.io.api.Binary
+import org.apache.parquet.io.api.Converter
+import org.apache.parquet.io.api.GroupConverter
+import org.apache.parquet.io.api.PrimitiveConverter
+import org.apache.parquet.io.api.RecordMaterializer
+import org.apache.parquet.schema.MessageType
+import org.apache.parquet.schema.Types
+import org.opendc.trace.TableColumn
+import org.opendc.trace.TableColumnType
+import org.opendc.trace.TableReader
+import org.opendc.trace.util.parquet.LocalParquetReader
+import org.opendc.workflow.service.lab.sweep.WorkflowPolicies
+import java.nio.ByteBuffer
+import java.nio.file.Files
+import java.nio.file.Path
+import java.time.Duration
+import java.time.Instant
+import java.util.UUID
+import java.util.stream.Collectors
+import kotlin.io.path.isDirectory
+import kotlin.io.path.isRegularFile
+
+/**
+ * A [TableReader] for a table of the columnar output of lab runs, which is partitioned as
+ * `<base>/<key>=<value>/.../data.parquet` by the scenario and seed of the run (see `LabRunner`).
+ *
+ * The values of the partition columns are derived from the path of a file, so only the files of the requested
+ * [partitions] are opened. Of these files, only the column chunks of the projected [columns] are read.
+ *
+ * @param base The directory of the table.
+ * @param columns The columns of the Parquet files of the table.
+ * @param projection The names of the columns to read or `null` to read all columns.
+ * @param partitions The values of the partition columns of the files to read.
+ */
+internal class LabPartitionedTableReader(
+    base: Path,
+    private val columns: List<TableColumn>,
+    projection: List<String>?,
+    partitions: Map<String, Any>
+) : TableReader {
+    init {
+        require(PARTITION_INDICES.keys.containsAll(partitions.keys)) { "Unknown partition columns ${partitions.keys}" }
+    }
+
+    /**
+     * The files of the table in the requested partitions, with the values of their partition columns.
+     */
+    private val files: Iterator<Pair<Path, Array<Any?>>> = if (base.isDirectory()) {
+        val files = Files.walk(base).use { stream ->
+            stream.filter { it.isRegularFile() && it.fileName.toString().endsWith(".parquet") }
+                .sorted()
+                .collect(Collectors.toList())
+        }
+        files.asSequence()
+            .map { it to partitionValues(base.relativize(it.parent)) }
+            .filter { (_, values) ->
+                partitions.all { (key, value) -> values[PARTITION_INDICES.getValue(key)]?.toString() == value.toString() }
+            }
+            .iterator()
+    } else {
+        emptyList<Pair<Path, Array<Any?>>>().iterator()
+    }
+
+    /**
+     * The [ReadSupport] that reads the projected columns of a file.
+     */
+    private val readSupport = RowReadSupport(columns, projection)
+
+    /**
+     * The reader of the current file.
+     */
+    private var reader: LocalParquetReader<Array<Any?>>? = null
+
+    /**
+     * The values of the partition columns of the current file.
+     */
+    private var partition: Array<Any?> = arrayOfNulls(PARTITIONS.size)
+
+    /**
+     * The current row of the file.
+     */
+    private var row: Array<Any?>? = null
+
+    override fun nextRow(): Boolean {
+        while (true) {
+            val reader = reader ?: openNext() ?: return false
+            val row = reader.read()
+            this.row = row
+
+            if (row != null) {
+                return true
+            }
+
+            reader.close()
+            this.reader = null
+        }
+    }
+
+    override fun resolve(name: String): Int {
+        val index = PARTITION_INDICES[name]
+        if (index != null) {
+            return index
+        }
+
+        val column = columns.indexOfFirst { it.name == name }
+        return if (column >= 0) PARTITIONS.size + column else -1
+    }
+
+    override fun isNull(index: Int): Boolean = get(index) == null
+
+    override fun getBoolean(index: Int): Boolean {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getInt(index: Int): Int = get(index) as? Int ?: 0
+
+    override fun getLong(index: Int): Long = get(index) as? Long ?: 0L
+
+    override fun getFloat(index: Int): Float {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getDouble(index: Int): Double = get(index) as? Double ?: 0.0
+
+    override fun getString(index: Int): String? = get(index) as String?
+
+    override fun getUUID(index: Int): UUID? = get(index) as UUID?
+
+    override fun getInstant(index: Int): Instant? = (get(index) as Long?)?.let { Instant.ofEpochMilli(it) }
+
+    override fun getDuration(index: Int): Duration? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun <T> getList(index: Int, elementType: Class<T>): List<T>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun <T> getSet(index: Int, elementType: Class<T>): Set<T>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun <K, V> getMap(index: Int, keyType: Class<K>, valueType: Class<V>): Map<K, V>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun close() {
+        reader?.close()
+        reader = null
+    }
+
+    override fun toString(): String = "LabPartitionedTableReader"
+
+    /**
+     * Open the reader of the next file of the table, or return `null` if all files have been read.
+     */
+    private fun openNext(): LocalParquetReader<Array<Any?>>? {
+        if (!files.hasNext()) {
+            return null
+        }
+
+        val (file, partition) = files.next()
+        this.partition = partition
+        return LocalParquetReader(file, readSupport).also { reader = it }
+    }
+
+    /**
+     * Return the value of the column at [index] in the current row.
+     */
+    private fun get(index: Int): Any? {
+        val row = checkNotNull(row) { "Reader in invalid state" }
+        return when (index) {
+            in PARTITIONS.indices -> partition[index]
+            in PARTITIONS.size until PARTITIONS.size + columns.size -> row[index - PARTITIONS.size]
+            else -> throw IllegalArgumentException("Invalid column index $index")
+        }
+    }
+
+    /**
+     * A [ReadSupport] that reads the projected [columns] of a file into an array per row.
+     */
+    private class RowReadSupport(
+        private val columns: List<TableColumn>,
+        projection: List<String>?
+    ) : ReadSupport<Array<Any?>>() {
+        /**
+         * The names of the columns to read. At least one column is read, such that the rows can be counted when only
+         * the partition columns are projected.
+         */
+        private val projected = projection
+            ?.filter { name -> columns.any { it.name == name } }
+            ?.ifEmpty { listOf(columns.first().name) }
+            ?.toSet()
+
+        override fun init(context: InitContext): ReadContext {
+            val fileSchema = context.fileSchema
+            val projectedSchema = if (projected != null) {
+                Types.buildMessage()
+                    .addFields(*fileSchema.fields.filter { it.name in projected }.toTypedArray())
+                    .named(fileSchema.name)
+            } else {
+                fileSchema
+            }
+            return ReadContext(projectedSchema)
+        }
+
+        override fun prepareForRead(
+            configuration: Configuration,
+            keyValueMetaData: Map<String, String>,
+            fileSchema: MessageType,
+            readContext: ReadContext
+        ): RecordMaterializer<Array<Any?>> = RowRecordMaterializer(readContext.requestedSchema, columns)
+    }
+
+    /**
+     * A [RecordMaterializer] that reads the fields of [schema] into an array that is indexed by [columns]. The array
+     * is reused for every row.
+     */
+    private class RowRecordMaterializer(schema: MessageType, columns: List<TableColumn>) :
+        RecordMaterializer<Array<Any?>>() {
+        /**
+         * The values of the current row.
+         */
+        private val row = arrayOfNulls<Any?>(columns.size)
+
+        /**
+         * Root converter for the record.
+         */
+        private val root = object : GroupConverter() {
+            /**
+             * The converters for the fields of the schema.
+             */
+            private val converters = schema.fields.map { field ->
+                val index = columns.indexOfFirst { it.name == field.name }
+                val isUUID = columns[index].type is TableColumnType.UUID
+                object : PrimitiveConverter() {
+                    override fun addInt(value: Int) {
+                        row[index] = value
+                    }
+
+                    override fun addLong(value: Long) {
+                        row[index] = value
+                    }
+
+                    override fun addDouble(value: Double) {
+                        row[index] = value
+                    }
+
+                    override fun addBinary(value: Binary) {
+                        row[index] = if (isUUID) {
+                            val bb = ByteBuffer.wrap(value.bytes)
+                            UUID(bb.getLong(), bb.getLong())
+                        } else {
+                            value.toStringUsingUTF8()
+                        }
+                    }
+                }
+            }
+
+            override fun start() {
+                row.fill(null)
+            }
+
+            override fun end() {}
+
+            override fun getConverter(fieldIndex: Int): Converter = converters[fieldIndex]
+        }
+
+        override fun getCurrentRecord(): Array<Any?> = row
+
+        override fun getRootConverter(): GroupConverter = root
+    }
+
+    companion object {
+        /**
+         * The partition columns of the table, which precede the columns of the Parquet files.
+         */
+        val PARTITIONS = listOf(
+            TableColumn("trace", TableColumnType.String),
+            TableColumn("scheduler", TableColumnType.String),
+            TableColumn("topology", TableColumnType.String),
+            TableColumn("policies", TableColumnType.String),
+            TableColumn("seed", TableColumnType.Long)
+        )
+
+        /**
+         * Mapping from the names of the partition columns to their index.
+         */
+        private val PARTITION_INDICES = PARTITIONS.withIndex().associate { (index, column) -> column.name to index }
+
+        /**
+         * Return the values of the partition columns of the file in [directory], relative to the table. Runs with the
+         * default policies are not partitioned by their policies.
+         */
+        private fun partitionValues(directory: Path): Array<Any?> {
+            val values = arrayOfNulls<Any?>(PARTITIONS.size)
+            values[PARTITION_INDICES.getValue("policies")] = WorkflowPolicies.DEFAULT
+
+            for (element in directory) {
+                val (key, value) = element.toString().split('=', limit = 2).takeIf { it.size == 2 } ?: continue
+                val index = PARTITION_INDICES[key] ?: continue
+                values[index] = if (PARTITIONS[index].type is TableColumnType.Long) value.toLongOrNull() else value
+            }
+            return values
+        }
+    }
+}
@@ -0,0 +1,51 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+package org.opendc.workflow.service.lab.query
+
+import org.apache.calcite.jdbc.CalciteConnection
+import org.opendc.trace.Trace
+import org.opendc.trace.calcite.TraceSchema
+import java.io.File
+import java.sql.DriverManager
+import java.util.Properties
+
+/**
+ * Open a SQL connection to the results directory of a sweep at [resultsPath], in which the tables of
+ * [LabResultsTraceFormat] form the default schema `lab`. For instance, the total energy usage of every scenario is
+ * computed in a single query:
+ *
+ * ```sql
+ * SELECT trace, scheduler, topology, SUM(power_total) AS energy_usage
+ * FROM host_samples
+ * GROUP BY trace, scheduler, topology
+ * ```
+ *
+ * The caller is responsible for closing the connection.
+ */
+public fun openLabResults(resultsPath: File): CalciteConnection {
+    val trace = Trace.open(resultsPath, format = "opendc-lab")
+    val info = Properties().apply { this["lex"] = "JAVA" }
+    val connection = DriverManager.getConnection("jdbc:calcite:", info).unwrap(CalciteConnection::class.java)
+    connection.rootSchema.add("lab", TraceSchema(trace))
+    connection.schema = "lab"
+    return connection
+}
@@ -0,0 +1,174 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+package org.opendc.workflow.service.lab.query
+
+import org.opendc.trace.TableColumn
+import org.opendc.trace.TableColumnType
+import org.opendc.trace.TableReader
+import org.opendc.trace.TableWriter
+import org.opendc.trace.spi.TableDetails
+import org.opendc.trace.spi.TraceFormat
+import org.opendc.workflow.service.lab.query.LabPartitionedTableReader.Companion.PARTITIONS
+import org.opendc.workflow.service.lab.sweep.SweepManifest
+import java.nio.file.Path
+
+/**
+ * A [TraceFormat] that exposes the results directory of a [org.opendc.workflow.service.lab.sweep.LabSweep] as
+ * tables, such that the results of many runs can be queried with SQL through the Calcite adapter of the trace library
+ * (see [openLabResults]) instead of loading every result file.
+ *
+ * The format provides the following tables:
+ * - [TABLE_SCENARIOS]: the finished runs that are recorded in the manifest of the sweep.
+ * - [TABLE_HOST_SAMPLES]: the per-host samples of the columnar output of the runs.
+ * - [TABLE_SERVICE_COUNTERS]: the counters of the compute service in the columnar output of the runs.
+ *
+ * All tables are partitioned by [PARTITION_COLUMNS]. Equality filters on these columns only read the Parquet files of
+ * the matching partitions and of those files, only the column chunks of the projected columns are read.
+ */
+public class LabResultsTraceFormat : TraceFormat {
+    /**
+     * The name of this trace format.
+     */
+    override val name: String = "opendc-lab"
+
+    override fun create(path: Path) {
+        throw UnsupportedOperationException("Writing not supported for this format")
+    }
+
+    override fun getTables(path: Path): List<String> =
+        listOf(TABLE_SCENARIOS, TABLE_HOST_SAMPLES, TABLE_SERVICE_COUNTERS)
+
+    override fun getDetails(path: Path, table: String): TableDetails {
+        return when (table) {
+            TABLE_SCENARIOS -> TableDetails(SCENARIO_COLUMNS, PARTITION_COLUMNS)
+            TABLE_HOST_SAMPLES -> TableDetails(PARTITIONS + HOST_COLUMNS, PARTITION_COLUMNS)
+            TABLE_SERVICE_COUNTERS -> TableDetails(PARTITIONS + SERVICE_COLUMNS, PARTITION_COLUMNS)
+            else -> throw IllegalArgumentException("Table $table not supported")
+        }
+    }
+
+    override fun newReader(path: Path, table: String, projection: List<String>?): TableReader {
+        return newReader(path, table, projection, emptyMap())
+    }
+
+    override fun newReader(
+        path: Path,
+        table: String,
+        projection: List<String>?,
+        partitions: Map<String, Any>
+    ): TableReader {
+        return when (table) {
+            TABLE_SCENARIOS -> {
+                val manifest = SweepManifest(path.resolve(MANIFEST).toFile())
+                LabScenarioTableReader(manifest.runs, partitions)
+            }
+            TABLE_HOST_SAMPLES ->
+                LabPartitionedTableReader(path.resolve("host"), HOST_COLUMNS, projection, partitions)
+            TABLE_SERVICE_COUNTERS ->
+                LabPartitionedTableReader(path.resolve("service"), SERVICE_COLUMNS, projection, partitions)
+            else -> throw IllegalArgumentException("Table $table not supported")
+        }
+    }
+
+    override fun newWriter(path: Path, table: String): TableWriter {
+        throw UnsupportedOperationException("Writing not supported for this format")
+    }
+
+    public companion object {
+        /**
+         * The table of the finished runs.
+         */
+        public const val TABLE_SCENARIOS: String = "scenarios"
+
+        /**
+         * The table of the per-host samples.
+         */
+        public const val TABLE_HOST_SAMPLES: String = "host_samples"
+
+        /**
+         * The table of the counters of the compute service.
+         */
+        public const val TABLE_SERVICE_COUNTERS: String = "service_counters"
+
+        /**
+         * The columns that identify the scenario and seed of a run, by which all tables are partitioned.
+         */
+        public val PARTITION_COLUMNS: List<String> = listOf("trace", "scheduler", "topology", "policies", "seed")
+
+        /**
+         * The name of the manifest in the results directory.
+         */
+        private const val MANIFEST = "manifest.csv"
+
+        /**
+         * The columns of [TABLE_SCENARIOS], which follow [SweepManifest.Entry].
+         */
+        private val SCENARIO_COLUMNS = listOf(
+            TableColumn("hash", TableColumnType.String),
+            TableColumn("trace", TableColumnType.String),
+            TableColumn("scheduler", TableColumnType.String),
+            TableColumn("topology", TableColumnType.String),
+            TableColumn("policies", TableColumnType.String),
+            TableColumn("seed", TableColumnType.Long),
+            TableColumn("repeat", TableColumnType.Int),
+            TableColumn("path", TableColumnType.String),
+            TableColumn("duration", TableColumnType.Duration)
+        )
+
+        /**
+         * The columns of the host table that is written by `ParquetComputeMonitor`.
+         */
+        private val HOST_COLUMNS = listOf(
+            TableColumn("timestamp", TableColumnType.Instant),
+            TableColumn("host_id", TableColumnType.UUID),
+            TableColumn("uptime", TableColumnType.Long),
+            TableColumn("downtime", TableColumnType.Long),
+            TableColumn("boot_time", TableColumnType.Instant, isNullable = true),
+            TableColumn("cpu_count", TableColumnType.Int),
+            TableColumn("cpu_limit", TableColumnType.Double),
+            TableColumn("cpu_time_active", TableColumnType.Long),
+            TableColumn("cpu_time_idle", TableColumnType.Long),
+            TableColumn("cpu_time_steal", TableColumnType.Long),
+            TableColumn("cpu_time_lost", TableColumnType.Long),
+            TableColumn("mem_limit", TableColumnType.Long),
+            TableColumn("power_total", TableColumnType.Double),
+            TableColumn("guests_terminated", TableColumnType.Int),
+            TableColumn("guests_running", TableColumnType.Int),
+            TableColumn("guests_error", TableColumnType.Int),
+            TableColumn("guests_invalid", TableColumnType.Int)
+        )
+
+        /**
+         * The columns of the service table that is written by `ParquetComputeMonitor`.
+         */
+        private val SERVICE_COLUMNS = listOf(
+            TableColumn("timestamp", TableColumnType.Instant),
+            TableColumn("hosts_up", TableColumnType.Int),
+            TableColumn("hosts_down", TableColumnType.Int),
+            TableColumn("servers_pending", TableColumnType.Int),
+            TableColumn("servers_active", TableColumnType.Int),
+            TableColumn("attempts_success", TableColumnType.Int),
+            TableColumn("attempts_failure", TableColumnType.Int),
+            TableColumn("attempts_error", TableColumnType.Int)
+        )
+    }
+}
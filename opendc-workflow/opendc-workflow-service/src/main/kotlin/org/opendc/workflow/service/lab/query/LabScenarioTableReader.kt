@@ -0,0 +1,174 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+package org.opendc.workflow.service.lab.query
+
+import org.opendc.trace.TableReader
+import org.opendc.workflow.service.lab.sweep.SweepManifest
+import java.time.Duration
+import java.time.Instant
+import java.util.UUID
+
+/**
+ * A [TableReader] for the finished runs in the manifest of a sweep.
+ *
+ * @param runs The runs recorded in the manifest.
+ * @param partitions The values of the partition columns of the runs to read.
+ */
+internal class LabScenarioTableReader(
+    runs: List<SweepManifest.Entry>,
+    partitions: Map<String, Any>
+) : TableReader {
+    /**
+     * The runs in the requested partitions.
+     */
+    private val runs = runs
+        .filter { run -> partitions.all { (key, value) -> partitionValue(run, key) == value.toString() } }
+        .iterator()
+
+    /**
+     * The current run.
+     */
+    private var run: SweepManifest.Entry? = null
+
+    override fun nextRow(): Boolean {
+        val runs = runs
+        run = if (runs.hasNext()) runs.next() else null
+        return run != null
+    }
+
+    override fun resolve(name: String): Int {
+        return when (name) {
+            "hash" -> COL_HASH
+            "trace" -> COL_TRACE
+            "scheduler" -> COL_SCHEDULER
+            "topology" -> COL_TOPOLOGY
+            "policies" -> COL_POLICIES
+            "seed" -> COL_SEED
+            "repeat" -> COL_REPEAT
+            "path" -> COL_PATH
+            "duration" -> COL_DURATION
+            else -> -1
+        }
+    }
+
+    override fun isNull(index: Int): Boolean {
+        require(index in 0..COL_DURATION) { "Invalid column index" }
+        return false
+    }
+
+    override fun getBoolean(index: Int): Boolean {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getInt(index: Int): Int {
+        val run = checkNotNull(run) { "Reader in invalid state" }
+        return when (index) {
+            COL_REPEAT -> run.repeat
+            else -> throw IllegalArgumentException("Invalid column or type [index $index]")
+        }
+    }
+
+    override fun getLong(index: Int): Long {
+        val run = checkNotNull(run) { "Reader in invalid state" }
+        return when (index) {
+            COL_SEED -> run.seed
+            else -> throw IllegalArgumentException("Invalid column or type [index $index]")
+        }
+    }
+
+    override fun getFloat(index: Int): Float {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getDouble(index: Int): Double {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getString(index: Int): String {
+        val run = checkNotNull(run) { "Reader in invalid state" }
+        return when (index) {
+            COL_HASH -> run.hash
+            COL_TRACE -> run.trace
+            COL_SCHEDULER -> run.scheduler
+            COL_TOPOLOGY -> run.topology
+            COL_POLICIES -> run.policies
+            COL_PATH -> run.path
+            else -> throw IllegalArgumentException("Invalid column or type [index $index]")
+        }
+    }
+
+    override fun getUUID(index: Int): UUID? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getInstant(index: Int): Instant? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun getDuration(index: Int): Duration {
+        val run = checkNotNull(run) { "Reader in invalid state" }
+        return when (index) {
+            COL_DURATION -> Duration.ofMillis(run.duration)
+            else -> throw IllegalArgumentException("Invalid column or type [index $index]")
+        }
+    }
+
+    override fun <T> getList(index: Int, elementType: Class<T>): List<T>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun <T> getSet(index: Int, elementType: Class<T>): Set<T>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun <K, V> getMap(index: Int, keyType: Class<K>, valueType: Class<V>): Map<K, V>? {
+        throw IllegalArgumentException("Invalid column or type [index $index]")
+    }
+
+    override fun close() {}
+
+    override fun toString(): String = "LabScenarioTableReader"
+
+    /**
+     * Return the value of the partition column [key] of [run].
+     */
+    private fun partitionValue(run: SweepManifest.Entry, key: String): String {
+        return when (key) {
+            "trace" -> run.trace
+            "scheduler" -> run.scheduler
+            "topology" -> run.topology
+            "policies" -> run.policies
+            "seed" -> run.seed.toString()
+            else -> throw IllegalArgumentException("Unknown partition column $key")
+        }
+    }
+
+    private val COL_HASH = 0
+    private val COL_TRACE = 1
+    private val COL_SCHEDULER = 2
+    private val COL_TOPOLOGY = 3
+    private val COL_POLICIES = 4
+    private val COL_SEED = 5
+    private val COL_REPEAT = 6
+    private val COL_PATH = 7
+    private val COL_DURATION = 8
+}
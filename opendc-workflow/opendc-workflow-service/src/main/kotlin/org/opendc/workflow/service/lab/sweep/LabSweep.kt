@@ -0,0 +1,160 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.sweep
+
+import kotlinx.coroutines.asCoroutineDispatcher
+import kotlinx.coroutines.launch
+import kotlinx.coroutines.runBlocking
+import me.tongfei.progressbar.ProgressBarBuilder
+import me.tongfei.progressbar.ProgressBarStyle
+import mu.KotlinLogging
+import org.opendc.workflow.service.lab.LabRunner
+import org.opendc.workflow.service.lab.cache.TraceCache
+import java.io.File
+import java.util.Collections
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.Executors
+
+/**
+ * Runs the [SweepRun]s of sweeps with [LabRunner] on a bounded pool of workers.
+ *
+ * The result files of a run are written to `<resultsPath>/<trace>/<scheduler>/<topology>.csv` (see
+ * [SweepRun.resultDirectory] and [LabRunner.repeatPath]) and every finished run is recorded in the [manifest]. Runs
+ * that the manifest records as finished are skipped, so an interrupted sweep resumes where it stopped and an extended
+ * sweep only simulates the new runs. A failed run is reported in the [Result] and does not stop the other runs.
+ *
+ * @param envPath The path to the directory containing the environments.
+ * @param resultsPath The directory to which the result files are written.
+ * @param outputPath The directory where the columnar output should be written (or `null` if no columnar output should
+ * be generated).
+ * @param parallelism The number of runs that are simulated concurrently.
+ * @param stream A flag to stream the host samples of every run next to its result file (see [LabRunner]).
+ * @param profile A flag to write the profile of the hot paths of every run next to its result file (see [LabRunner]).
+ * @param changeThreshold The threshold for change-driven sampling of the host samples, or `null` to sample every host
+ * every export interval (see [LabRunner]).
+ * @param manifest The manifest of the finished runs.
+ * @param traceCache The cache of the compiled traces, from which the jobs of every run are loaded (or `null` to parse
+ * the trace in every run).
+ */
+public class LabSweep(
+    private val envPath: File,
+    private val resultsPath: File,
+    private val outputPath: File? = null,
+    private val parallelism: Int = Runtime.getRuntime().availableProcessors(),
+    private val stream: Boolean = true,
+    private val profile: Boolean = false,
+    private val changeThreshold: Double? = null,
+    public val manifest: SweepManifest = SweepManifest(File(resultsPath, "manifest.csv")),
+    private val traceCache: TraceCache? = TraceCache(File(resultsPath, ".cache/traces").toPath()),
+) {
+    /**
+     * The logging instance of this class.
+     */
+    private val logger = KotlinLogging.logger {}
+
+    /**
+     * The outcome of a sweep.
+     */
+    public data class Result(val completed: List<SweepRun>, val skipped: List<SweepRun>, val failed: Map<SweepRun, Throwable>)
+
+    /**
+     * Run the specified [sweeps].
+     */
+    public fun run(vararg sweeps: Sweep): Result = run(sweeps.flatMap { it.runs() })
+
+    /**
+     * Run the specified [runs], skipping those that have finished before.
+     */
+    public fun run(runs: List<SweepRun>): Result {
+        val hashes = runs.distinct().associateWith { it.configHash(envPath) }
+        val (skipped, pending) = hashes.keys.partition { manifest.done(hashes.getValue(it)) }
+        val completed = Collections.synchronizedList(mutableListOf<SweepRun>())
+        val failed = ConcurrentHashMap<SweepRun, Throwable>()
+
+        logger.info { "Sweeping ${pending.size} runs (${skipped.size} finished before) on $parallelism workers" }
+
+        val pb = ProgressBarBuilder()
+            .setInitialMax(pending.size.toLong())
+            .setStyle(ProgressBarStyle.ASCII)
+            .setTaskName("Sweeping...")
+            .build()
+
+        Executors.newFixedThreadPool(parallelism).asCoroutineDispatcher().use { dispatcher ->
+            runBlocking {
+                for (run in pending) {
+                    launch(dispatcher) {
+                        try {
+                            runOne(run, hashes.getValue(run))
+                            completed += run
+                        } catch (e: Exception) {
+                            logger.error(e) { "Run $run failed" }
+                            failed[run] = e
+                        } finally {
+                            pb.step()
+                        }
+                    }
+                }
+            }
+        }
+
+        pb.close()
+        return Result(completed.toList(), skipped, failed.toMap())
+    }
+
+    /**
+     * Simulate a single [run] and record it in the manifest under [hash].
+     */
+    private fun runOne(run: SweepRun, hash: String) {
+        val directory = File(resultsPath, run.resultDirectory)
+        directory.mkdirs()
+
+        val runner = LabRunner(
+            envPath,
+            File(directory, "${run.topology}.csv").path,
+            outputPath,
+            streamPath = if (stream) File(directory, "${run.topology}.stream") else null,
+            profile = profile,
+            changeThreshold = changeThreshold
+        )
+
+        val start = System.currentTimeMillis()
+        runner.runScenario(run.scenario(traceCache), run.seed, run.repeat)
+        val duration = System.currentTimeMillis() - start
+
+        val base = manifest.file.absoluteFile.parentFile
+        val path = File(runner.repeatPath(run.repeat)).absoluteFile.relativeTo(base).path
+        manifest.record(
+            SweepManifest.Entry(
+                hash,
+                run.trace.name,
+                run.scheduler,
+                run.topology,
+                run.policySet,
+                run.seed,
+                run.repeat,
+                path,
+                duration
+            )
+        )
+    }
+}
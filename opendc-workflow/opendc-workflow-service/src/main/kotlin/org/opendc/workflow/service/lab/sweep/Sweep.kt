@@ -0,0 +1,208 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.sweep
+
+import org.opendc.trace.Trace
+import org.opendc.workflow.service.lab.cache.TraceCache
+import org.opendc.workflow.service.lab.model.OperationalPhenomena
+import org.opendc.workflow.service.lab.model.Scenario
+import org.opendc.workflow.service.lab.model.Topology
+import org.opendc.workflow.service.lab.model.Warmup
+import org.opendc.workflow.service.lab.model.Workload
+import org.opendc.workflow.service.scheduler.job.JobAdmissionPolicy
+import org.opendc.workflow.service.scheduler.job.JobOrderPolicy
+import org.opendc.workflow.service.scheduler.job.NullJobAdmissionPolicy
+import org.opendc.workflow.service.scheduler.job.SubmissionTimeJobOrderPolicy
+import org.opendc.workflow.service.scheduler.task.NullTaskEligibilityPolicy
+import org.opendc.workflow.service.scheduler.task.SubmissionTimeTaskOrderPolicy
+import org.opendc.workflow.service.scheduler.task.TaskEligibilityPolicy
+import org.opendc.workflow.service.scheduler.task.TaskOrderPolicy
+import java.io.File
+import java.nio.file.Path
+import java.security.MessageDigest
+import java.time.Duration
+
+/**
+ * A workflow trace that is replayed in a sweep.
+ *
+ * @param name The name of the trace, under which its results are stored.
+ * @param path The path to the trace.
+ * @param format The format of the trace (e.g. `gwf` or `wtf`).
+ */
+public data class SweepTrace(val name: String, val path: Path, val format: String)
+
+/**
+ * The policies of the workflow scheduler that are varied in a sweep.
+ *
+ * @param name The name of the policy set. The results of the [DEFAULT] set are stored at the paths used before
+ * sweeps existed; the results of any other set are stored in a directory of that name.
+ */
+public data class WorkflowPolicies(
+    val name: String = DEFAULT,
+    val jobAdmissionPolicy: JobAdmissionPolicy = NullJobAdmissionPolicy,
+    val jobOrderPolicy: JobOrderPolicy = SubmissionTimeJobOrderPolicy(),
+    val taskEligibilityPolicy: TaskEligibilityPolicy = NullTaskEligibilityPolicy,
+    val taskOrderPolicy: TaskOrderPolicy = SubmissionTimeTaskOrderPolicy(),
+) {
+    public companion object {
+        /**
+         * The name of the default policy set.
+         */
+        public const val DEFAULT: String = "default"
+    }
+}
+
+/**
+ * A single run of a sweep: one repeat of a scenario.
+ */
+public data class SweepRun(
+    val trace: SweepTrace,
+    val topology: String,
+    val scheduler: String,
+    val policies: WorkflowPolicies,
+    val seed: Long,
+    val repeat: Int,
+    val schedQuantum: Duration,
+    val operationalPhenomena: OperationalPhenomena,
+    val warmup: Warmup? = null,
+) {
+    /**
+     * The name of the policy set of the run: the name of its workflow policies, followed by the name of its warm-up
+     * (if any).
+     */
+    val policySet: String
+        get() = if (warmup == null) policies.name else "${policies.name}.${warmup.name}"
+
+    /**
+     * The partitions of the columnar output of the run.
+     */
+    val partitions: Map<String, String>
+        get() {
+            val partitions = mapOf("trace" to trace.name, "scheduler" to scheduler, "topology" to topology)
+            return if (policySet == WorkflowPolicies.DEFAULT) partitions else partitions + ("policies" to policySet)
+        }
+
+    /**
+     * The directory of the result files of the scenario, relative to the results directory.
+     */
+    val resultDirectory: String
+        get() = if (policySet == WorkflowPolicies.DEFAULT) {
+            "${trace.name}/$scheduler"
+        } else {
+            "${trace.name}/$scheduler/$policySet"
+        }
+
+    /**
+     * Construct the [Scenario] of this run. If a [cache] is given, the jobs of the trace are loaded from the cache.
+     */
+    public fun scenario(cache: TraceCache? = null): Scenario = Scenario(
+        Topology(topology),
+        Workload(trace.name, Trace.open(trace.path, format = trace.format), cache?.load(trace.path, trace.format)),
+        schedQuantum,
+        policies.jobAdmissionPolicy,
+        policies.jobOrderPolicy,
+        policies.taskEligibilityPolicy,
+        policies.taskOrderPolicy,
+        scheduler,
+        operationalPhenomena,
+        partitions,
+        warmup
+    )
+
+    /**
+     * Return the hash of the configuration of this run, which identifies the run in a [SweepManifest]. Besides the
+     * parameters of the run, it covers the contents of the topology file in [envPath], so a changed environment is
+     * simulated again.
+     */
+    public fun configHash(envPath: File): String {
+        val digest = MessageDigest.getInstance("SHA-256")
+        val config = listOf(
+            "trace" to trace.name,
+            "tracePath" to trace.path.toString(),
+            "traceFormat" to trace.format,
+            "topology" to topology,
+            "scheduler" to scheduler,
+            "schedQuantum" to schedQuantum.toString(),
+            "jobAdmissionPolicy" to policies.jobAdmissionPolicy.toString(),
+            "jobOrderPolicy" to policies.jobOrderPolicy.toString(),
+            "taskEligibilityPolicy" to policies.taskEligibilityPolicy.toString(),
+            "taskOrderPolicy" to policies.taskOrderPolicy.toString(),
+            "failureFrequency" to operationalPhenomena.failureFrequency.toString(),
+            "hasInterference" to operationalPhenomena.hasInterference.toString(),
+            "seed" to seed.toString(),
+            "repeat" to repeat.toString(),
+        )
+        // Only runs with a warm-up hash it, so the hashes of the other runs are unchanged
+        val warmupConfig = if (warmup == null) emptyList() else listOf("warmup" to warmup.name)
+        for ((key, value) in config + warmupConfig) {
+            digest.update("$key=$value\n".toByteArray())
+        }
+        digest.update(File(envPath, "$topology.txt").readBytes())
+        return digest.digest().joinToString("") { "%02x".format(it) }.substring(0, 32)
+    }
+}
+
+/**
+ * A sweep over the cartesian product of [traces], [topologies], compute [schedulers], workflow [policies], [warmups]
+ * and [seeds]. The i-th seed is run as the i-th repeat of every scenario. A `null` warm-up runs the scheduler from the
+ * start.
+ */
+public data class Sweep(
+    val traces: List<SweepTrace>,
+    val topologies: List<String>,
+    val schedulers: List<String> = listOf("naive", "random", "taskflow"),
+    val policies: List<WorkflowPolicies> = listOf(WorkflowPolicies()),
+    val seeds: List<Long> = listOf(0L),
+    val schedQuantum: Duration = Duration.ofMillis(100),
+    val operationalPhenomena: OperationalPhenomena = OperationalPhenomena(failureFrequency = 24.0 * 7, hasInterference = true),
+    val warmups: List<Warmup?> = listOf(null),
+) {
+    /**
+     * Expand the sweep into its runs.
+     */
+    public fun runs(): List<SweepRun> {
+        val runs = mutableListOf<SweepRun>()
+        for (trace in traces) {
+            for (topology in topologies) {
+                for (scheduler in schedulers) {
+                    for (policy in policies) {
+                        for (warmup in warmups) {
+                            seeds.forEachIndexed { repeat, seed ->
+                                runs += SweepRun(trace, topology, scheduler, policy, seed, repeat, schedQuantum, operationalPhenomena, warmup)
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        return runs
+    }
+
+    public companion object {
+        /**
+         * Return the names of the topologies (`<name>.txt`) in the environment directory [envPath].
+         */
+        public fun topologies(envPath: File): List<String> =
+            envPath.listFiles { file -> file.extension == "txt" }.orEmpty().map { it.nameWithoutExtension }.sorted()
+    }
+}
@@ -0,0 +1,132 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.sweep
+
+import java.io.File
+
+/**
+ * An append-only index of the finished runs of sweeps, stored as a `;`-separated file with one line per run.
+ *
+ * Runs are keyed by their [SweepRun.configHash]. A line is only appended once the result file of a run has been
+ * written, so an interrupted sweep can be resumed by skipping the runs that are [done]. When a run is recorded more
+ * than once, the last line wins.
+ *
+ * @param file The file of the manifest.
+ */
+public class SweepManifest(public val file: File) {
+    /**
+     * A finished run.
+     *
+     * @param path The path of the result file, relative to the directory of the manifest.
+     * @param duration The wall-clock duration of the run in milliseconds.
+     */
+    public data class Entry(
+        val hash: String,
+        val trace: String,
+        val scheduler: String,
+        val topology: String,
+        val policies: String,
+        val seed: Long,
+        val repeat: Int,
+        val path: String,
+        val duration: Long,
+    )
+
+    /**
+     * The entries of the manifest, by hash.
+     */
+    private val entries = mutableMapOf<String, Entry>()
+
+    init {
+        if (file.exists()) {
+            file.useLines { lines ->
+                for (line in lines.drop(1)) {
+                    val fields = line.split(';')
+                    // Skip a line that was cut off by a crash
+                    if (fields.size != COLUMNS) {
+                        continue
+                    }
+                    val entry = Entry(
+                        fields[0],
+                        fields[1],
+                        fields[2],
+                        fields[3],
+                        fields[4],
+                        fields[5].toLong(),
+                        fields[6].toInt(),
+                        fields[7],
+                        fields[8].toLong()
+                    )
+                    entries[entry.hash] = entry
+                }
+            }
+        }
+    }
+
+    /**
+     * The finished runs in this manifest, in the order in which they were first recorded.
+     */
+    public val runs: List<Entry>
+        @Synchronized get() = entries.values.toList()
+
+    /**
+     * Determine whether the run with the specified [hash] has finished and its result file still exists.
+     */
+    @Synchronized
+    public fun done(hash: String): Boolean {
+        val entry = entries[hash] ?: return false
+        return File(file.absoluteFile.parentFile, entry.path).exists()
+    }
+
+    /**
+     * Append a finished run to the manifest.
+     */
+    @Synchronized
+    public fun record(entry: Entry) {
+        val isNew = !file.exists() || file.length() == 0L
+        file.absoluteFile.parentFile.mkdirs()
+        file.appendText(
+            buildString {
+                if (isNew) {
+                    append(HEADER)
+                }
+                with(entry) {
+                    append("$hash;$trace;$scheduler;$topology;$policies;$seed;$repeat;$path;$duration\n")
+                }
+            }
+        )
+        entries[entry.hash] = entry
+    }
+
+    public companion object {
+        /**
+         * The header line of the manifest.
+         */
+        public const val HEADER: String = "hash;trace;scheduler;topology;policies;seed;repeat;path;duration\n"
+
+        /**
+         * The number of columns of the manifest.
+         */
+        private const val COLUMNS = 9
+    }
+}
@@ -0,0 +1,69 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import java.io.DataInput
+import java.io.DataOutput
+import java.io.File
+
+/**
+ * A [SampleColumn] of [Double] samples.
+ */
+public class DoubleColumn(
+    chunkSize: Int = SampleColumn.DEFAULT_CHUNK_SIZE,
+    spillDirectory: File? = null
+) : SampleColumn<DoubleArray>(chunkSize, spillDirectory, ::DoubleArray) {
+    /**
+     * Append [value] to the column.
+     */
+    public fun add(value: Double) {
+        chunk[position] = value
+        advance()
+    }
+
+    /**
+     * Append [value] to the column.
+     */
+    public operator fun plusAssign(value: Double) {
+        add(value)
+    }
+
+    override fun writeChunk(output: DataOutput, chunk: DoubleArray) {
+        for (value in chunk) {
+            output.writeDouble(value)
+        }
+    }
+
+    override fun readChunk(input: DataInput, chunk: DoubleArray) {
+        for (i in chunk.indices) {
+            chunk[i] = input.readDouble()
+        }
+    }
+
+    override fun appendChunk(out: Appendable, chunk: DoubleArray, count: Int) {
+        for (i in 0 until count) {
+            separate(out)
+            out.append(chunk[i].toString())
+        }
+    }
+}
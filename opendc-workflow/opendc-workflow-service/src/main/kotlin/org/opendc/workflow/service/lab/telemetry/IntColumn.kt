@@ -0,0 +1,69 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import java.io.DataInput
+import java.io.DataOutput
+import java.io.File
+
+/**
+ * A [SampleColumn] of [Int] samples.
+ */
+public class IntColumn(
+    chunkSize: Int = SampleColumn.DEFAULT_CHUNK_SIZE,
+    spillDirectory: File? = null
+) : SampleColumn<IntArray>(chunkSize, spillDirectory, ::IntArray) {
+    /**
+     * Append [value] to the column.
+     */
+    public fun add(value: Int) {
+        chunk[position] = value
+        advance()
+    }
+
+    /**
+     * Append [value] to the column.
+     */
+    public operator fun plusAssign(value: Int) {
+        add(value)
+    }
+
+    override fun writeChunk(output: DataOutput, chunk: IntArray) {
+        for (value in chunk) {
+            output.writeInt(value)
+        }
+    }
+
+    override fun readChunk(input: DataInput, chunk: IntArray) {
+        for (i in chunk.indices) {
+            chunk[i] = input.readInt()
+        }
+    }
+
+    override fun appendChunk(out: Appendable, chunk: IntArray, count: Int) {
+        for (i in 0 until count) {
+            separate(out)
+            out.append(chunk[i].toString())
+        }
+    }
+}
@@ -0,0 +1,99 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+/**
+ * A histogram of latencies in nanoseconds with a bucket per power of two, such that recording a latency is a single
+ * array increment and the percentiles are exact up to a factor of two.
+ */
+public class LatencyHistogram {
+    /**
+     * The number of latencies in bucket `i`, which holds the latencies in `[2^i, 2^(i + 1))` (and zero in bucket 0).
+     */
+    private val buckets = LongArray(64)
+
+    /**
+     * The number of recorded latencies.
+     */
+    public var count: Long = 0L
+        private set
+
+    /**
+     * The sum of the recorded latencies in nanoseconds.
+     */
+    public var total: Long = 0L
+        private set
+
+    /**
+     * The largest recorded latency in nanoseconds.
+     */
+    public var max: Long = 0L
+        private set
+
+    /**
+     * Record the specified latency in [nanos].
+     */
+    public fun record(nanos: Long) {
+        val value = nanos.coerceAtLeast(0L)
+        buckets[63 - java.lang.Long.numberOfLeadingZeros(value or 1L)]++
+        count++
+        total += value
+        if (value > max) {
+            max = value
+        }
+    }
+
+    /**
+     * Return the upper bound in nanoseconds of the bucket that holds the [p]-th quantile (with `0 <= p <= 1`) of the
+     * recorded latencies, capped by [max].
+     */
+    public fun quantile(p: Double): Long {
+        if (count == 0L) {
+            return 0L
+        }
+
+        val rank = (p * count).toLong().coerceIn(1L, count)
+        var seen = 0L
+        for (i in buckets.indices) {
+            seen += buckets[i]
+            if (seen >= rank) {
+                return if (i >= 62) max else minOf((1L shl (i + 1)) - 1, max)
+            }
+        }
+        return max
+    }
+
+    /**
+     * Return the summary of this histogram as a map, for a machine-readable export.
+     */
+    public fun summary(): Map<String, Any> = mapOf(
+        "count" to count,
+        "totalNanos" to total,
+        "meanNanos" to if (count > 0) total / count else 0L,
+        "p50Nanos" to quantile(0.5),
+        "p90Nanos" to quantile(0.9),
+        "p99Nanos" to quantile(0.99),
+        "maxNanos" to max,
+        "buckets" to buckets.withIndex().filter { it.value > 0 }.associate { (i, n) -> (1L shl i).toString() to n }
+    )
+}
@@ -0,0 +1,60 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import org.opendc.experiments.compute.telemetry.ComputeMonitor
+import org.opendc.experiments.compute.telemetry.table.HostTableReader
+import org.opendc.experiments.compute.telemetry.table.ServerTableReader
+import org.opendc.experiments.compute.telemetry.table.ServiceTableReader
+
+/**
+ * A [ComputeMonitor] that times the records of [delegate] in [profiler].
+ */
+public class ProfiledComputeMonitor(
+    private val delegate: ComputeMonitor,
+    private val profiler: Profiler
+) : ComputeMonitor, AutoCloseable {
+    override fun record(reader: ServerTableReader) {
+        val start = System.nanoTime()
+        delegate.record(reader)
+        profiler.recordRecord(System.nanoTime() - start)
+    }
+
+    override fun record(reader: HostTableReader) {
+        val start = System.nanoTime()
+        delegate.record(reader)
+        profiler.recordRecord(System.nanoTime() - start)
+    }
+
+    override fun record(reader: ServiceTableReader) {
+        val start = System.nanoTime()
+        delegate.record(reader)
+        profiler.recordRecord(System.nanoTime() - start)
+    }
+
+    override fun close() {
+        if (delegate is AutoCloseable) {
+            delegate.close()
+        }
+    }
+}
@@ -0,0 +1,54 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import org.opendc.compute.api.Server
+import org.opendc.compute.service.internal.HostView
+import org.opendc.compute.service.scheduler.ComputeScheduler
+
+/**
+ * A [ComputeScheduler] that times and counts the host selections of [delegate] in [profiler].
+ */
+public class ProfiledComputeScheduler(
+    private val delegate: ComputeScheduler,
+    private val profiler: Profiler
+) : ComputeScheduler {
+    override fun addHost(host: HostView) {
+        delegate.addHost(host)
+    }
+
+    override fun removeHost(host: HostView) {
+        delegate.removeHost(host)
+    }
+
+    override fun updateHost(host: HostView) {
+        delegate.updateHost(host)
+    }
+
+    override fun select(server: Server): HostView? {
+        val start = System.nanoTime()
+        val host = delegate.select(server)
+        profiler.recordSelect(System.nanoTime() - start, host != null)
+        return host
+    }
+}
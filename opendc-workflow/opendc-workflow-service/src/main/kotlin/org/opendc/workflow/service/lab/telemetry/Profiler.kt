@@ -0,0 +1,223 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import com.fasterxml.jackson.databind.ObjectMapper
+import org.opendc.workflow.service.internal.SchedulingCycle
+import org.opendc.workflow.service.internal.WorkflowSchedulerListener
+import java.io.File
+import java.io.Writer
+
+/**
+ * The hot-path instrumentation of a lab run: the wall time of its phases, a line per scheduling cycle of the workflow
+ * service and latency histograms of the cycles, the host selections of the compute scheduler (see
+ * [ProfiledComputeScheduler]) and the monitor records (see [ProfiledComputeMonitor]).
+ *
+ * The cycles are streamed to `<name>.profile` next to the result file of the run, with a line of the form
+ * `timestamp;wallTime;cycleTime;incomingJobs;jobQueue;incomingTasks;taskQueue;placements;selectTime;recordTime` per
+ * cycle. The timestamp is the simulated time in milliseconds since the epoch, the wall time is the time in nanoseconds
+ * since the profiler was created and the placements, select and record times (in nanoseconds) are cumulative. The
+ * summary is written to `<name>.profile.json` on [close].
+ *
+ * @param result The result file of the run, next to which the profile is written.
+ */
+public class Profiler(result: File) : WorkflowSchedulerListener, AutoCloseable {
+    /**
+     * The file to which the cycles are streamed.
+     */
+    public val cycleFile: File = File(result.absoluteFile.parentFile, "${result.nameWithoutExtension}.profile")
+
+    /**
+     * The file to which the summary is written.
+     */
+    public val summaryFile: File = File(result.absoluteFile.parentFile, "${result.nameWithoutExtension}.profile.json")
+
+    /**
+     * The writer of the cycles.
+     */
+    private val writer: Writer = cycleFile.bufferedWriter()
+
+    /**
+     * The wall time at which the profiler was created.
+     */
+    private val origin = System.nanoTime()
+
+    /**
+     * The wall time in nanoseconds of every phase, in the order in which the phases first ran.
+     */
+    private val phases = LinkedHashMap<String, Long>()
+
+    /**
+     * The latencies of the scheduling cycles, host selections and monitor records.
+     */
+    public val cycles: LatencyHistogram = LatencyHistogram()
+    public val selects: LatencyHistogram = LatencyHistogram()
+    public val records: LatencyHistogram = LatencyHistogram()
+
+    /**
+     * The number of servers that were placed on a host and the number of selections that found no host.
+     */
+    public var placements: Long = 0L
+        private set
+    public var misses: Long = 0L
+        private set
+
+    /**
+     * The number of jobs and tasks that the workflow service admitted and dispatched.
+     */
+    private var jobsAdmitted = 0L
+    private var tasksDispatched = 0L
+
+    /**
+     * The deepest queues of the workflow service.
+     */
+    private var maxIncomingJobs = 0
+    private var maxIncomingTasks = 0
+    private var maxTaskQueue = 0
+
+    /**
+     * The simulated time of the first and last cycle.
+     */
+    private var firstCycle = Long.MIN_VALUE
+    private var lastCycle = Long.MIN_VALUE
+
+    init {
+        writer.write(HEADER)
+    }
+
+    /**
+     * Run [block] as the phase with the specified [name], adding its wall time to the phase.
+     */
+    public inline fun <T> phase(name: String, block: () -> T): T {
+        val start = System.nanoTime()
+        try {
+            return block()
+        } finally {
+            recordPhase(name, System.nanoTime() - start)
+        }
+    }
+
+    /**
+     * Add [nanos] to the wall time of the phase with the specified [name].
+     */
+    public fun recordPhase(name: String, nanos: Long) {
+        phases.merge(name, nanos, Long::plus)
+    }
+
+    /**
+     * Record a host selection of the compute scheduler that took [nanos] and found a host if [placed].
+     */
+    public fun recordSelect(nanos: Long, placed: Boolean) {
+        selects.record(nanos)
+        if (placed) placements++ else misses++
+    }
+
+    /**
+     * Record a monitor record that took [nanos].
+     */
+    public fun recordRecord(nanos: Long) {
+        records.record(nanos)
+    }
+
+    override fun cycleFinished(cycle: SchedulingCycle) {
+        cycles.record(cycle.duration)
+        jobsAdmitted += cycle.jobQueue
+        tasksDispatched += cycle.taskQueue
+        maxIncomingJobs = maxOf(maxIncomingJobs, cycle.incomingJobs)
+        maxIncomingTasks = maxOf(maxIncomingTasks, cycle.incomingTasks)
+        maxTaskQueue = maxOf(maxTaskQueue, cycle.taskQueue)
+        if (firstCycle == Long.MIN_VALUE) {
+            firstCycle = cycle.timestamp
+        }
+        lastCycle = cycle.timestamp
+
+        val writer = writer
+        writer.write(cycle.timestamp.toString())
+        writer.write(';'.code)
+        writer.write((System.nanoTime() - origin).toString())
+        writer.write(';'.code)
+        writer.write(cycle.duration.toString())
+        writer.write(';'.code)
+        writer.write(cycle.incomingJobs.toString())
+        writer.write(';'.code)
+        writer.write(cycle.jobQueue.toString())
+        writer.write(';'.code)
+        writer.write(cycle.incomingTasks.toString())
+        writer.write(';'.code)
+        writer.write(cycle.taskQueue.toString())
+        writer.write(';'.code)
+        writer.write(placements.toString())
+        writer.write(';'.code)
+        writer.write(selects.total.toString())
+        writer.write(';'.code)
+        writer.write(records.total.toString())
+        writer.write('\n'.code)
+    }
+
+    /**
+     * Return the summary of the profile as a map, for a machine-readable export.
+     */
+    public fun summary(): Map<String, Any> {
+        val wallTime = System.nanoTime() - origin
+        val simulation = phases["simulation"] ?: wallTime
+        return mapOf(
+            "wallTimeNanos" to wallTime,
+            "phases" to phases.toMap(),
+            "simulatedMillis" to if (firstCycle == Long.MIN_VALUE) 0L else lastCycle - firstCycle,
+            "counters" to mapOf(
+                "cycles" to cycles.count,
+                "jobsAdmitted" to jobsAdmitted,
+                "tasksDispatched" to tasksDispatched,
+                "placements" to placements,
+                "misses" to misses,
+                "records" to records.count
+            ),
+            "queues" to mapOf(
+                "maxIncomingJobs" to maxIncomingJobs,
+                "maxIncomingTasks" to maxIncomingTasks,
+                "maxTaskQueue" to maxTaskQueue
+            ),
+            "placementsPerSecond" to if (simulation > 0) placements * 1e9 / simulation else 0.0,
+            // The wall time of the simulation that is not spent in the instrumented hot paths, such as the flow engine
+            "unattributedNanos" to (simulation - cycles.total - selects.total - records.total).coerceAtLeast(0L),
+            "histograms" to mapOf(
+                "cycle" to cycles.summary(),
+                "select" to selects.summary(),
+                "record" to records.summary()
+            )
+        )
+    }
+
+    override fun close() {
+        writer.close()
+        ObjectMapper().writerWithDefaultPrettyPrinter().writeValue(summaryFile, summary())
+    }
+
+    public companion object {
+        /**
+         * The header line of the cycle file.
+         */
+        public const val HEADER: String =
+            "timestamp;wallTime;cycleTime;incomingJobs;jobQueue;incomingTasks;taskQueue;placements;selectTime;recordTime\n"
+    }
+}
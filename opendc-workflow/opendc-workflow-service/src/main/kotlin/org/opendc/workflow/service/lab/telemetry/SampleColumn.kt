@@ -0,0 +1,199 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import java.io.BufferedInputStream
+import java.io.BufferedOutputStream
+import java.io.DataInput
+import java.io.DataInputStream
+import java.io.DataOutput
+import java.io.DataOutputStream
+import java.io.File
+import java.io.FileInputStream
+import java.io.FileOutputStream
+
+/**
+ * A growable column of primitive samples that is stored in fixed-size chunks of type [A].
+ *
+ * Appending a sample costs O(1) amortized and never copies the samples recorded before. If [spillDirectory] is
+ * specified, every full chunk is written to a temporary file in that directory, such that only a single chunk per
+ * column remains on the heap. The file is deleted by [clear], which the owner of the column must call when the
+ * samples are no longer needed.
+ *
+ * @param chunkSize The number of samples per chunk.
+ * @param spillDirectory The directory to spill full chunks to, or `null` to keep all chunks in memory.
+ * @param newChunk The function to allocate a chunk of the specified size.
+ */
+public abstract class SampleColumn<A : Any>(
+    protected val chunkSize: Int,
+    private val spillDirectory: File?,
+    private val newChunk: (Int) -> A
+) {
+    /**
+     * The number of samples in the column.
+     */
+    public val size: Long
+        get() = fullChunks.toLong() * chunkSize + position
+
+    /**
+     * The chunk to which samples are appended.
+     */
+    protected var chunk: A
+
+    /**
+     * The number of samples in the current chunk.
+     */
+    protected var position: Int = 0
+
+    /**
+     * The full chunks that are retained in memory.
+     */
+    private val chunks = mutableListOf<A>()
+
+    /**
+     * The number of full chunks, either retained in memory or spilled to disk.
+     */
+    private var fullChunks = 0
+
+    /**
+     * The file to which full chunks are spilled.
+     */
+    private var spillFile: File? = null
+    private var spillOutput: DataOutputStream? = null
+
+    /**
+     * A flag to indicate that the next sample written by [writeTo] is the first one.
+     */
+    private var isFirst = true
+
+    init {
+        require(chunkSize > 0) { "Chunk size must be positive" }
+        chunk = newChunk(chunkSize)
+    }
+
+    /**
+     * Write the samples of the column to [out] in the format of [List.toString].
+     */
+    public fun writeTo(out: Appendable) {
+        isFirst = true
+        out.append('[')
+
+        val spillOutput = spillOutput
+        if (spillOutput != null) {
+            spillOutput.flush()
+            val buffer = newChunk(chunkSize)
+            DataInputStream(BufferedInputStream(FileInputStream(spillFile!!))).use { input ->
+                repeat(fullChunks) {
+                    readChunk(input, buffer)
+                    appendChunk(out, buffer, chunkSize)
+                }
+            }
+        }
+
+        for (retained in chunks) {
+            appendChunk(out, retained, chunkSize)
+        }
+
+        appendChunk(out, chunk, position)
+        out.append(']')
+    }
+
+    /**
+     * Remove all samples from the column and delete the spilled chunks.
+     */
+    public fun clear() {
+        spillOutput?.close()
+        spillOutput = null
+        spillFile?.delete()
+        spillFile = null
+        fullChunks = 0
+        position = 0
+        chunks.clear()
+    }
+
+    override fun toString(): String = buildString { writeTo(this) }
+
+    /**
+     * Advance the column after a sample has been stored at [position] in the current chunk.
+     */
+    protected fun advance() {
+        if (++position < chunkSize) {
+            return
+        }
+
+        if (spillDirectory != null) {
+            writeChunk(spillOutput ?: openSpill(), chunk)
+        } else {
+            chunks.add(chunk)
+            chunk = newChunk(chunkSize)
+        }
+
+        fullChunks++
+        position = 0
+    }
+
+    /**
+     * Append the separator before the next sample to [out].
+     */
+    protected fun separate(out: Appendable) {
+        if (isFirst) {
+            isFirst = false
+        } else {
+            out.append(", ")
+        }
+    }
+
+    /**
+     * Write the samples of the full [chunk] to [output].
+     */
+    protected abstract fun writeChunk(output: DataOutput, chunk: A)
+
+    /**
+     * Read the samples of a single spilled chunk from [input] into [chunk].
+     */
+    protected abstract fun readChunk(input: DataInput, chunk: A)
+
+    /**
+     * Append the first [count] samples of [chunk] to [out], each preceded by [separate].
+     */
+    protected abstract fun appendChunk(out: Appendable, chunk: A, count: Int)
+
+    /**
+     * Open the file to which the full chunks are spilled.
+     */
+    private fun openSpill(): DataOutputStream {
+        val file = File.createTempFile("samples", ".bin", spillDirectory)
+        spillFile = file
+
+        val output = DataOutputStream(BufferedOutputStream(FileOutputStream(file)))
+        spillOutput = output
+        return output
+    }
+
+    public companion object {
+        /**
+         * The default number of samples per chunk.
+         */
+        public const val DEFAULT_CHUNK_SIZE: Int = 8192
+    }
+}
@@ -0,0 +1,88 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import org.opendc.experiments.compute.telemetry.ComputeMonitor
+import org.opendc.experiments.compute.telemetry.table.HostTableReader
+import org.opendc.experiments.compute.telemetry.table.ServiceTableReader
+import java.io.File
+import java.io.Writer
+
+/**
+ * A [ComputeMonitor] that appends every host sample as a line to an append-only stream, such that the results of a
+ * lab run can be analyzed while it is still running.
+ *
+ * Each line has the form `timestamp;hostIndex;energyUsage;powerUsage;cpuUtilization;guestsRunning`, where the
+ * timestamp is in milliseconds since the epoch. The stream is flushed once per export cycle, after the samples of all
+ * hosts have been written, so a reader only ever observes complete cycles plus possibly a partial last line.
+ *
+ * @param file The file to write the stream to. An existing file is truncated.
+ */
+public class StreamComputeMonitor(file: File) : ComputeMonitor, AutoCloseable {
+    /**
+     * The writer of the stream.
+     */
+    private val writer: Writer = file.bufferedWriter()
+
+    /**
+     * Mapping from host identifiers to their index, in the order in which the hosts were first recorded.
+     */
+    private val hosts = mutableMapOf<String, Int>()
+
+    init {
+        writer.write(HEADER)
+        writer.flush()
+    }
+
+    override fun record(reader: HostTableReader) {
+        val writer = writer
+        writer.write(reader.timestamp.toEpochMilli().toString())
+        writer.write(';'.code)
+        writer.write(hosts.getOrPut(reader.host.id) { hosts.size }.toString())
+        writer.write(';'.code)
+        writer.write(reader.powerTotal.toString())
+        writer.write(';'.code)
+        writer.write(reader.powerUsage.toString())
+        writer.write(';'.code)
+        writer.write(reader.cpuUtilization.toString())
+        writer.write(';'.code)
+        writer.write(reader.guestsRunning.toString())
+        writer.write('\n'.code)
+    }
+
+    override fun record(reader: ServiceTableReader) {
+        // The service is recorded last in every export cycle
+        writer.flush()
+    }
+
+    override fun close() {
+        writer.close()
+    }
+
+    public companion object {
+        /**
+         * The header line of the stream.
+         */
+        public const val HEADER: String = "timestamp;hostIndex;energyUsage;powerUsage;cpuUtilization;guestsRunning\n"
+    }
+}
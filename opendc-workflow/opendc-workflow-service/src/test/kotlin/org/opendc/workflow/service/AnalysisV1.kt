@@ -27,6 +27,9 @@ import org.opendc.workflow.service.lab.model.Scenario
 import org.opendc.workflow.service.lab.model.OperationalPhenomena
 import org.opendc.workflow.service.lab.model.Topology
 import org.opendc.workflow.service.lab.model.Workload
+import org.opendc.workflow.service.lab.sweep.LabSweep
+import org.opendc.workflow.service.lab.sweep.Sweep
+import org.opendc.workflow.service.lab.sweep.SweepTrace
 //import org.opendc.experiments.compute.trace
 
 import org.junit.jupiter.api.Assertions.assertAll
@@ -78,7 +81,6 @@ import org.opendc.workflow.service.scheduler.task.RandomTaskOrderPolicy
 import org.opendc.workflow.service.scheduler.task.SubmissionTimeTaskOrderPolicy
 import org.opendc.workflow.service.scheduler.task.TaskFlowTaskEligibilityPolicy
 import java.io.File
-import java.nio.file.Files
 import java.nio.file.Paths
 import java.time.Duration
 import java.util.UUID
@@ -126,50 +128,30 @@ internal class AnalysisV1 {
     @Test
     fun testExperiments() {
         val envPath = File("src/test/resources/env")
-        // Define experiment as list [name, file, format, topology, computeScheduler]
-        val experiments = listOf(
-            listOf("askalon_ee", "/askalon_ee.gwf", "gwf", "heterogeneous", "naive"),
-            listOf("askalon_ee", "/askalon_ee.gwf", "gwf", "heterogeneous", "random"),
-            listOf("askalon_ee", "/askalon_ee.gwf", "gwf", "heterogeneous", "taskflow"),
-            listOf("askalon_ee", "/askalon_ee.gwf", "gwf", "homogeneous", "taskflow"),
-            listOf("Pegasus_P1_parquet", "/Pegasus_P1_parquet", "wtf", "heterogeneous", "taskflow"),
-            listOf("Pegasus_P7_parquet", "/Pegasus_P7_parquet", "wtf", "heterogeneous", "taskflow"),
+        val askalon = resourceTrace("askalon_ee", "/askalon_ee.gwf", "gwf")
+        val pegasus = listOf(
+            resourceTrace("Pegasus_P1_parquet", "/Pegasus_P1_parquet", "wtf"),
+            resourceTrace("Pegasus_P7_parquet", "/Pegasus_P7_parquet", "wtf"),
         )
-        val repeats = 1
-        for (experiment in experiments) {
-            val experimentName = experiment[0]
-            val tracePath = experiment[1]
-            val traceFormat = experiment[2]
-            val experimentTopology = experiment[3]
-            val experimentScheduler = experiment[4]
-            val trace = Trace.open(
-                Paths.get(checkNotNull(WorkflowServiceTest::class.java.getResource(tracePath)).toURI()),
-                format = traceFormat
-            )
-            val resultPath = "results/${experimentName}/${experimentScheduler}"
-            Files.createDirectories(Paths.get(resultPath))
-            val runner = LabRunner(envPath, "${resultPath}/${experimentTopology}.csv")
-
-            val scenario = Scenario(
-                Topology(experimentTopology),
-                Workload(experimentName, trace),
-                Duration.ofMillis(100),
-                NullJobAdmissionPolicy,
-                SubmissionTimeJobOrderPolicy(),
-                NullTaskEligibilityPolicy, // TaskFlowTaskEligibilityPolicy(clock),
-                SubmissionTimeTaskOrderPolicy(), // RandomTaskOrderPolicy
-                experimentScheduler, // From a predefined list of computescheduler policies. Custom can be defined there
-                OperationalPhenomena(failureFrequency = 24.0 * 7, hasInterference = true),
-            )
-
-            val seed = 0L
-
-            for (i in 0 until repeats) {
-                assertDoesNotThrow {runner.runScenario(scenario, seed + i.toLong(), i)}
-            }
-        }
+        val seeds = listOf(0L)
 
+        val sweep = LabSweep(envPath, File("results"), outputPath = File("results"))
+        val result = sweep.run(
+            // Experiment 1: compute schedulers
+            Sweep(listOf(askalon), listOf("heterogeneous"), listOf("naive", "random", "taskflow"), seeds = seeds),
+            // Experiment 2: topologies
+            Sweep(listOf(askalon), listOf("homogeneous"), listOf("taskflow"), seeds = seeds),
+            // Experiment 3: traces
+            Sweep(pegasus, listOf("heterogeneous"), listOf("taskflow"), seeds = seeds),
+        )
 
+        assertEquals(0, result.failed.size) { "Failed runs: ${result.failed.keys}" }
     }
 
+    /**
+     * Return the [SweepTrace] of the trace in the test resources at [resource].
+     */
+    private fun resourceTrace(name: String, resource: String, format: String): SweepTrace =
+        SweepTrace(name, Paths.get(checkNotNull(WorkflowServiceTest::class.java.getResource(resource)).toURI()), format)
+
 }
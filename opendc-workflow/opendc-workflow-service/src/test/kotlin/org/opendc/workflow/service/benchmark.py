@@ -0,0 +1,174 @@
+"""
+Benchmarks of the figure pipeline on synthetic result files.
+
+A result file in the format of `TestComputeMonitor.toFile` is generated for
+every size of a scaling curve (hosts x cycles) and every stage of the pipeline
+is timed on it: `parse` (`getData`), `cluster` (`clusterSeries`), `reduce`
+(`reduceScenario`) and `render` (a 'combined' figure). Every stage reports its
+best time, its throughput in host samples per second and its peak memory as
+traced by `tracemalloc`. The results can be written to a file and compared with
+a baseline, to gate changes on regressions:
+
+    python benchmark.py --hosts 16 64 --cycles 1000 10000 --output bench.csv
+    python benchmark.py --baseline bench.csv --tolerance 0.25
+
+This is a script rather than pytest-benchmark or asv cases because the
+stages share their state along the pipeline, every size needs its own
+generated result file and the peak memory is measured next to the time;
+neither tool is a dependency of the pipeline. `test_benchmark.py` runs it on a
+small size, so it keeps working with the pipeline.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+from create_figures import HOST_KEYS, loadScenario, reduceScenario, renderFigure
+from results import clusterSeries, getData
+
+STAGES = ('parse', 'cluster', 'reduce', 'render')
+COLUMNS = ['stage', 'hosts', 'cycles', 'samples', 'seconds', 'throughput', 'peakMB']
+
+
+def writeSyntheticResult(path, hosts, cycles, seed=0):
+    """
+    Write a synthetic result file of `hosts` hosts that are sampled for `cycles`
+    cycles of 60 s, with random utilization and the matching power draw.
+    """
+    rng = np.random.default_rng(seed)
+    samples = hosts * cycles
+    utilization = rng.random(samples)
+    power = 200 + 150 * utilization
+    ids = [f'host-{i}' for i in range(hosts)]
+
+    def listOf(values):
+        # Formatted as Kotlin's List.toString()
+        return '[' + ', '.join(map(str, np.asarray(values).tolist())) + ']'
+
+    with open(path, 'w') as f:
+        f.write('monitor; metric; value; unit\n')
+        f.write(f'host; energyUsage; {listOf(power * 60)}; J per cycle\n')
+        f.write(f'host; powerUsage; {listOf(power)}; W per cycle\n')
+        f.write(f'host; uptime; {cycles * 60_000 * hosts}; ms\n')
+        f.write(f'host; cpuUtilization; {listOf(utilization)}; %\n')
+        f.write(f'host; guestsRunning; {listOf(rng.integers(0, 16, samples))};\n')
+        f.write(f'host; timestamp; {listOf(np.repeat(np.arange(cycles) * 60_000, hosts))}; ms\n')
+        f.write(f'host; hostIndex; {listOf(np.tile(np.arange(hosts), cycles))};\n')
+        f.write(f'host; hostId; {listOf(ids)};\n')
+        f.write(f'service; hostsUp; {hosts};\n')
+        f.write('service; hostsDown; 0;\n')
+
+
+def stages(path, directory):
+    """Return the stages of the pipeline on the result file at `path` as (name, function) pairs."""
+    state = dict()
+
+    def parse():
+        state['data'] = getData(path, ['energyUsage', 'cpuUtilization', 'guestsRunning', 'uptime', *HOST_KEYS])
+
+    def cluster():
+        clusterSeries(state['data'], ['energyUsage', 'cpuUtilization', 'guestsRunning'])
+
+    def reduce():
+        state['reduced'] = reduceScenario(loadScenario(path))
+
+    def render():
+        renderFigure(state['reduced'], layout='combined', rc={'text.usetex': False}, name=os.path.join(directory, 'benchmark'))
+
+    return [('parse', parse), ('cluster', cluster), ('reduce', reduce), ('render', render)]
+
+
+def measure(fn, repeats):
+    """Return the best time of `repeats` calls of `fn` and the peak memory of one traced call, in MB."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / (1 << 20)
+
+
+def runBenchmarks(hosts, cycles, repeats=3, only=STAGES):
+    """Run the stages in `only` over the scaling curve of `hosts` x `cycles` and return a row per stage and size."""
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for h in hosts:
+            for c in cycles:
+                path = os.path.join(directory, f'result-{h}-{c}.csv')
+                writeSyntheticResult(path, h, c)
+                for stage, fn in stages(path, directory):
+                    if stage not in only:
+                        # Later stages depend on the state of the earlier ones
+                        fn()
+                        continue
+                    seconds, peak = measure(fn, repeats)
+                    rows.append({
+                        'stage': stage, 'hosts': h, 'cycles': c, 'samples': h * c, 'seconds': seconds,
+                        'throughput': h * c / seconds, 'peakMB': peak,
+                    })
+                    print(f"{stage:8} hosts {h:6} cycles {c:8}: {seconds * 1000:10.1f} ms"
+                          f" {h * c / seconds:14.0f} samples/s {peak:8.1f} MB", flush=True)
+    return rows
+
+
+def writeRows(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, COLUMNS, delimiter=';')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def readRows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f, delimiter=';'))
+
+
+def regressions(rows, baseline, tolerance):
+    """
+    Return the rows that are more than `tolerance` (a fraction) slower than the
+    row of the same stage and size in `baseline`.
+    """
+    reference = {(r['stage'], int(r['hosts']), int(r['cycles'])): float(r['seconds']) for r in baseline}
+    slower = []
+    for row in rows:
+        seconds = reference.get((row['stage'], row['hosts'], row['cycles']))
+        if seconds is not None and row['seconds'] > seconds * (1 + tolerance):
+            slower.append((row, seconds))
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the figure pipeline on synthetic result files.")
+    parser.add_argument('--hosts', type=int, nargs='+', default=[16, 64], help="the host counts of the scaling curve")
+    parser.add_argument('--cycles', type=int, nargs='+', default=[1000, 10000], help="the cycle counts of the scaling curve")
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=STAGES, help="the stages to measure")
+    parser.add_argument('--repeats', type=int, default=3, help="the number of timed calls of every stage (the best counts)")
+    parser.add_argument('--output', default=None, help="the file to which the results are written")
+    parser.add_argument('--baseline', default=None, help="a results file to compare with; exits with 1 on a regression")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="the slowdown relative to the baseline that is tolerated")
+    args = parser.parse_args()
+
+    rows = runBenchmarks(args.hosts, args.cycles, args.repeats, args.stages)
+    if args.output:
+        writeRows(args.output, rows)
+
+    if args.baseline:
+        slower = regressions(rows, readRows(args.baseline), args.tolerance)
+        for row, seconds in slower:
+            print(f"Regression: {row['stage']} at hosts {row['hosts']} cycles {row['cycles']}:"
+                  f" {row['seconds'] * 1000:.1f} ms (baseline {seconds * 1000:.1f} ms)", file=sys.stderr)
+        sys.exit(1 if slower else 0)
@@ -0,0 +1,136 @@
+"""
+A content-addressed, on-disk cache for the arrays derived from result files.
+
+An entry is identified by the digest of the contents of a result file and the
+key of the computation (e.g. the reduction and its parameters). Its arrays are
+stored as separate `.npy` files, so that they can be memory-mapped when read
+back, and its scalars in `scalars.json`. When `LabRunner` rewrites a result
+file, its digest changes and the entries of the old contents are dropped. The
+least recently used entries are evicted once the cache exceeds its size cap.
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+def keyDigest(key):
+    """Return the digest of a computation key, such as `('reduce', 15, 25)`."""
+    return hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+
+
+def fileDigest(path, blockSize=1 << 20):
+    """Return the digest of the contents of the file at `path`."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(blockSize), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory, maxBytes=1 << 30):
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+    def get(self, path, key, compute):
+        """
+        Return the dictionary of arrays and scalars that `compute()` derives
+        from the result file at `path` under `key`. Cached arrays are returned
+        memory-mapped (read-only).
+        """
+        entry = os.path.join(self.directory, f'{self.digest(path)}-{keyDigest(key)}')
+        try:
+            os.utime(entry)
+            return self.read(entry)
+        except (OSError, ValueError):
+            # A missing entry, or one that another worker is evicting, is a miss
+            pass
+
+        value = compute()
+        self.write(entry, value)
+        self.evict()
+        return value
+
+    def digest(self, path):
+        """
+        Return the digest of the result file at `path`. The digest is only
+        recomputed when the size or modification time of the file changes, in
+        which case the entries of the previous contents are removed.
+        """
+        stat = os.stat(path)
+        records = os.path.join(self.directory, 'files')
+        record = os.path.join(records, hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest() + '.json')
+        previous = None
+        try:
+            with open(record) as f:
+                size, mtime, previous = json.load(f)
+            if size == stat.st_size and mtime == stat.st_mtime_ns:
+                return previous
+        except (OSError, ValueError):
+            pass
+
+        digest = fileDigest(path)
+        if previous is not None and previous != digest:
+            for stale in glob.glob(os.path.join(self.directory, f'{previous}-*')):
+                shutil.rmtree(stale, ignore_errors=True)
+
+        os.makedirs(records, exist_ok=True)
+        self.replace(record, lambda f: json.dump([stat.st_size, stat.st_mtime_ns, digest], f))
+        return digest
+
+    def read(self, entry):
+        value = dict()
+        with open(os.path.join(entry, 'scalars.json')) as f:
+            value.update(json.load(f))
+        for file in os.listdir(entry):
+            if file.endswith('.npy'):
+                value[file[:-4]] = np.load(os.path.join(entry, file), mmap_mode='r')
+        return value
+
+    def write(self, entry, value):
+        os.makedirs(self.directory, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.staging-')
+        scalars = dict()
+        for name, item in value.items():
+            if isinstance(item, np.ndarray):
+                np.save(os.path.join(staging, f'{name}.npy'), item)
+            else:
+                scalars[name] = item.item() if isinstance(item, np.generic) else item
+        with open(os.path.join(staging, 'scalars.json'), 'w') as f:
+            json.dump(scalars, f)
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Another worker stored the same entry first
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in its size cap."""
+        entries = []
+        total = 0
+        for entry in glob.glob(os.path.join(self.directory, '*-*')):
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, file)) for file in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, entry))
+            except OSError:
+                # Removed by another worker in the meantime
+                continue
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def replace(self, path, write):
+        """Atomically replace the file at `path` with the contents written by `write(f)`."""
+        fd, staging = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.staging-')
+        with os.fdopen(fd, 'w') as f:
+            write(f)
+        os.replace(staging, path)
@@ -1,608 +1,657 @@
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import NamedTuple
+
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from matplotlib.ticker import FuncFormatter
 import numpy as np
-import ast
 import matplotlib
 matplotlib.rcParams['pdf.fonttype'] = 42
 matplotlib.rcParams['ps.fonttype'] = 42
 plt.rcParams['text.usetex'] = True
 
-def getData(path):
-    data = dict()
-    with open(path, 'r') as f:
-        for i, line in enumerate(f.readlines()):
-            content = line.split(';')
-            if i != 0 and len(content) == 4:
-                reader = content[0].strip()
-                metric = content[1].strip()
-                value = content[2].strip()
-                unit = content[3].replace('\n', '').strip()
-                if value[0] == '[' and value[-1] == ']':
-                    value = ast.literal_eval(value)
-                data[metric] = [value, unit]
-    return data
-
-
-if __name__ == "__main__":
-    default_path = "../../../../../../../results/"
-    trace = "askalon_ee"
-    scheduler = "taskflow"
-    topology = "heterogeneous"
-    data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-    data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-    data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
-
-    ###########################################################################
-    # Staircase plot of active jobs over time.                                #
-    ###########################################################################
-
-    data_active_jobs = [np.array(data['guestsRunning'][0]).astype(float)]
-    def staircase_average(a, n=3):
-        steps = int(len(a)/n)
-        steps_remainder = int(len(a)%n)
-        staircase = np.zeros(len(a))
-        for i in range(steps):
-            staircase[i*n:(1+i)*n] = np.average(a[i*n:(1+i)*n])
-        staircase[steps:steps_remainder] = np.average(a[steps:steps_remainder])
-        return staircase
-
+from cache import ResultCache
+from jobs import TaskGraph
+from reductions import minMaxDecimate, movingAverage, staircaseAverage
+from repeats import stackRepeats, summarizeRepeats
+from results import HOST_KEYS, clusterSeries, findScenarios, getData, getProfile, profilePath, repeatPaths, scenarioPath
+from sketches import DistributionSketch
+
+
+###########################################################################
+# Load and reduce tasks.                                                  #
+###########################################################################
+
+def loadScenario(path, cache=None):
+    """Parse a result file once into the per-tick cluster series used by the figures."""
+    if cache is not None:
+        return cache.get(path, ('loadScenario',), lambda: loadScenario(path))
+    data = getData(path, ['energyUsage', 'cpuUtilization', 'guestsRunning', 'uptime', *HOST_KEYS])
+    _, cluster = clusterSeries(data, ['energyUsage', 'cpuUtilization', 'guestsRunning'])
+    return {
+        'energy': cluster['energyUsage']/3600,
+        'cpuUtil': cluster['cpuUtilization']*100,
+        'activeJobs': cluster['guestsRunning'],
+        'uptime': float(data['uptime'][0]),
+    }
+
+
+# The bin width of the KDE sketch of every metric whose distribution is drawn.
+SKETCH_WIDTHS = {'energy': 0.5, 'cpuUtil': 0.1}
+
+
+def reduceScenario(series, path=None, window=15, steps=25, mode='trailing', cache=None):
+    """
+    Derive the smoothed series, totals and distribution sketches (under
+    'sketches') of a scenario that are drawn by the figures.
+    """
+    def derive():
+        sketches = {metric: DistributionSketch.of(series[metric], width) for metric, width in SKETCH_WIDTHS.items()}
+        return {
+            'energyAvg': movingAverage(series['energy'], window, mode),
+            'cpuUtilAvg': movingAverage(series['cpuUtil'], window, mode),
+            'activeJobsStair': staircaseAverage(series['activeJobs'], steps),
+            'energyTotal': float(np.sum(series['energy'])),
+            # The sketches are flattened into arrays, so they can be cached
+            **{f'{metric}Sketch.{key}': value for metric, sketch in sketches.items() for key, value in sketch.toArrays().items()},
+        }
+
+    if cache is not None:
+        reduced = cache.get(path, ('reduceScenario', window, steps, mode, tuple(SKETCH_WIDTHS.items())), derive)
+    else:
+        reduced = derive()
+    reduced['sketches'] = {
+        metric: DistributionSketch.fromArrays({key[len(metric) + 7:]: value for key, value in reduced.items() if key.startswith(f'{metric}Sketch.')})
+        for metric in SKETCH_WIDTHS
+    }
+    return {**series, **reduced}
+
+
+def plotDecimated(ax, y, fill=False, **kwargs):
+    """
+    Plot the series `y` against its sample indices on `ax`, decimated to the
+    minimum and maximum per pixel column of the axes, so the size of the figure
+    does not grow with the length of the simulation while its peaks are kept.
+    """
+    x, y = minMaxDecimate(y, max(1, int(ax.bbox.width)))
+    if fill:
+        return ax.fill_between(x, y, 0, **kwargs)
+    return ax.plot(x, y, **kwargs)
+
+
+###########################################################################
+# Figure templates.                                                       #
+###########################################################################
+
+# The figure templates built in this process, by layout.
+TEMPLATES = dict()
+
+
+def template(layout, build):
+    """
+    Return the figure template of `layout`, building it with `build()` on first
+    use in this process. The per-scenario figures update the data of the
+    artists of their template instead of building a new figure every time.
+    """
+    if layout not in TEMPLATES:
+        TEMPLATES[layout] = build()
+    return TEMPLATES[layout]
+
+
+def setDecimated(line, y):
+    """Replace the data of `line` by the series `y`, decimated like plotDecimated."""
+    line.set_data(*minMaxDecimate(y, max(1, int(line.axes.bbox.width))))
+
+
+def setDecimatedAt(line, x, y):
+    """Replace the data of `line` by the series `y` against `x`, decimated like plotDecimated."""
+    indices, values = minMaxDecimate(y, max(1, int(line.axes.bbox.width)))
+    line.set_data(np.asarray(x)[indices], values)
+
+
+def setHline(lines, y, length):
+    """Move the dashed marker `lines` drawn by hlines to `y`, spanning a series of `length`."""
+    lines.set_segments([[(-10, y), (length + 10, y)]])
+
+
+def rescale(ax, **limits):
+    """Autoscale `ax` to its current data and then apply the fixed y `limits`."""
+    ax.set_autoscale_on(True)
+    ax.relim()
+    ax.autoscale_view()
+    if limits:
+        ax.set_ylim(**limits)
+
+
+###########################################################################
+# Staircase plot of active jobs over time.                                #
+###########################################################################
+
+def buildActiveJobs():
     fig = plt.figure(figsize=(12,4))
     ax = fig.subplots()
     ax.set_title("Guests running over time")
-    ax.plot(data_active_jobs[0], color='green', alpha=0.1, zorder=10)
-    staircase_avg = staircase_average(data_active_jobs[0], 10)
-    ax.plot(staircase_avg, color='green', alpha=0.85, zorder=10)
+    raw, = ax.plot([], [], color='green', alpha=0.1, zorder=10)
+    stair, = ax.plot([], [], color='green', alpha=0.85, zorder=10)
     ax.set_xlabel("Scheduler Cycles")
     ax.set_ylabel("Active tasks")
-    ax.set_ylim(bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
-    plt.grid(axis='x')
-    plt.tight_layout()
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[{ax.get_title()}].pdf', transparent=True)
-    plt.show()
+    ax.grid(axis='x')
+    return SimpleNamespace(fig=fig, ax=ax, raw=raw, stair=stair)
+
 
+def plotActiveJobs(s, name):
+    t = template('active jobs', buildActiveJobs)
+    setDecimated(t.raw, s['activeJobs'])
+    staircase_avg = s['activeJobsStair']
+    setDecimated(t.stair, staircase_avg)
+    rescale(t.ax, bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
+    t.fig.tight_layout()
+    t.fig.savefig(f'{name}-[{t.ax.get_title()}].pdf', transparent=True)
 
-    ###########################################################################
-    # Line plot of energy usage compared to cpu utilization over time.        #
-    ###########################################################################
 
-    def moving_average(a, n=3):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1:] / n
+###########################################################################
+# Line plot of energy usage compared to cpu utilization over time.        #
+###########################################################################
+
+def buildEnergyCpu():
     fig = plt.figure(figsize=(12,4))
     ax = fig.subplots()
     ax.set_title("Workflow energy usage compared to CPU utilization over time")
-    ax.plot(data_energy[0]/3600, color='red', alpha=0.1, zorder=10)
-    ax.plot(moving_average(data_energy[0]/3600, 15), color='red', alpha=0.85, zorder=10)
+    energy, = ax.plot([], [], color='red', alpha=0.1, zorder=10)
+    energyAvg, = ax.plot([], [], color='red', alpha=0.85, zorder=10)
     ax.set_xlabel("Scheduler Cycles")
     ax.set_ylabel("Energy usage (Wh)", color='red')
-    ax.set_ylim(bottom=0)
-    ax.hlines(np.max(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax.hlines(np.min(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
+    energyMax = ax.hlines(0, -10, 10, linestyles='--', color='grey', alpha=0.7, zorder=0)
+    energyMin = ax.hlines(0, -10, 10, linestyles='--', color='grey', alpha=0.7, zorder=0)
     ax2=ax.twinx()
-    ax2.plot(data_cpuUtil[0]*100, color='blue', alpha=0.1, zorder=5)
-    ax2.plot(moving_average(data_cpuUtil[0]*100, 15), color='blue', alpha=0.85, zorder=5)
+    cpuUtil, = ax2.plot([], [], color='blue', alpha=0.1, zorder=5)
+    cpuUtilAvg, = ax2.plot([], [], color='blue', alpha=0.85, zorder=5)
     ax2.set_ylabel("CPU Utilization (\%)", color='blue')
     ax2.set_ylim(0,101)
-    plt.xlim(-10, len(data_cpuUtil[0])+10)
     ax.grid(False)
     ax2.grid(False)
-    plt.tight_layout()
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[{ax.get_title()}].pdf', transparent=True)
-    plt.show()
-
-
-    ###########################################################################
-    # Previous line plot and violin plots combined in a subplot.              #
-    ###########################################################################
-
-    # Line plot of energy usage compared to cpu utilization over time.
-    fig = plt.figure(figsize=(15,5))
-    ax = fig.subplots(2,3, gridspec_kw={'width_ratios': [10, 1, 1], 'height_ratios': [2, 1], 'hspace':0.0})
-
-    def moving_average(a, n=3):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1:] / n
-    ax[0][0].set_title("Workflow energy usage compared to CPU utilization over time\nRolling average of 15")
-    ax[0][0].plot(data_energy[0]/3600, color='red', alpha=0.1, zorder=10)
-    ax[0][0].plot(moving_average(data_energy[0]/3600, 15), color='red', alpha=0.85, zorder=10)
-    ax[0][0].set_ylabel("Energy usage (Wh)", color='red')
-    ax[0][0].set_ylim(bottom=0)
-    ax[0][0].hlines(np.max(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax[0][0].hlines(np.min(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax002=ax[0][0].twinx()
-    ax002.plot(data_cpuUtil[0]*100, color='blue', alpha=0.1, zorder=5)
-    ax002.plot(moving_average(data_cpuUtil[0]*100, 15), color='blue', alpha=0.85, zorder=5)
-    ax002.set_ylabel("CPU Utilization (\%)", color='blue')
-    ax002.set_ylim(0,100)
-    ax[0][0].set_xlim(-10, len(data_cpuUtil[0])+10)
-    ax[0][0].set_xticklabels([])
-    ax[0][0].set_xticks([])
-    ax[0][0].set_xticks([], minor=True)
-
-    # Box plot combined with a violin plot of energy usage.
-    ax[0][1].set_title("Energy usage\ndistribution")
-    ax[0][1].set_ylabel("Energy usage (Wh)", color='red')
-    ax[0][1].set_xlabel("Policy")
-    ax[0][1].boxplot(data_energy[0]/3600, vert=True, showmeans=True, meanline=True, sym='', whis=1.5)
-    violin_parts  = ax[0][1].violinplot(data_energy[0]/3600, vert=True, showmeans=True)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('red')
-        pc.set_edgecolor('black')
-    #         pc.set_alpha(1)
-    ax[0][1].set_ylim(bottom=0)
-    ax[0][1].set_xticklabels([])
-
-    # Box plot combined with a violin plot of cpu utilization.
-    ax[0][2].set_title("CPU utilization\ndistribution")
-    ax[0][2].set_ylabel("CPU Utilization (\%)", color='blue')
-    ax[0][2].set_xlabel("Policy")
-    ax[0][2].boxplot(data_cpuUtil[0]*100, vert=True, showmeans=True, meanline=True, sym='', whis=1.5)
-    violin_parts  = ax[0][2].violinplot(data_cpuUtil[0]*100, vert=True, showmeans=True)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('blue')
-        pc.set_edgecolor('black')
-    #         pc.set_alpha(1)
-    ax[0][2].set_xticklabels([])
-    ax[0][2].set_ylim(0,100)
-
-    # Staircase plot showing the average active jobs over time
-    data_active_jobs = [np.array(data['guestsRunning'][0]).astype(float)]
-    def staircase_average(a, n=15):
-        steps = int(len(a)/n)
-        steps_remainder = int(len(a)%n)
-        staircase = np.zeros(len(a))
-        for i in range(steps):
-            staircase[i*n:(1+i)*n] = np.average(a[i*n:(1+i)*n])
-        staircase[steps:steps_remainder] = np.average(a[steps:steps_remainder])
-        return staircase
-
-    ax[1][0].plot(data_active_jobs[0], color='green', alpha=0.1, zorder=10)
-    staircase_avg = staircase_average(data_active_jobs[0], 25)
-    ax[1][0].plot(staircase_avg, color='green', alpha=1, zorder=10)
-    ax[1][0].fill_between([i for i in range(len(staircase_avg))], staircase_avg, [0 for i in range(len(staircase_avg))], color='lightgreen', alpha=0.75, zorder=10, edgecolor='green')
-    ax[1][0].set_xlabel("Scheduler Cycles")
-    ax[1][0].set_ylabel("Active tasks", color='green')
-    ax[1][0].set_ylim(bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
-    ax[1][0].set_xlabel("Scheduler Cycles")
-    ax[1][0].set_xlim(-10, len(data_cpuUtil[0])+10)
-    labels = [str(int(i)) for i in ax[1][0].get_yticks()]
-    # labels[-1] = labels[-2] = ''
-    ax[1][0].set_yticklabels(labels)
-
-    ax[1][1].set_visible(False)
-    ax[1][2].set_visible(False)
-
-    plt.tight_layout()
-    ax[0][0].grid(False)
-    ax002.grid(False)
-    ax[0][1].grid(True)
-    ax[0][2].grid(True)
-    ax[1][0].grid(False)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[combined].pdf', transparent=True)
-    plt.show()
-
-
-    ###########################################################################
-    # Previous subplot without the density violin plots.                      #
-    ###########################################################################
-
+    return SimpleNamespace(fig=fig, ax=ax, energy=energy, energyAvg=energyAvg, energyMax=energyMax,
+                           energyMin=energyMin, cpuUtil=cpuUtil, cpuUtilAvg=cpuUtilAvg)
+
+
+def plotEnergyCpu(s, name):
+    t = template('energy cpu', buildEnergyCpu)
+    setDecimated(t.energy, s['energy'])
+    setDecimated(t.energyAvg, s['energyAvg'])
+    setHline(t.energyMax, np.max(s['energy']), len(s['cpuUtil']))
+    setHline(t.energyMin, np.min(s['energy']), len(s['cpuUtil']))
+    setDecimated(t.cpuUtil, s['cpuUtil'])
+    setDecimated(t.cpuUtilAvg, s['cpuUtilAvg'])
+    rescale(t.ax, bottom=0)
+    t.ax.set_xlim(-10, len(s['cpuUtil'])+10)
+    t.fig.tight_layout()
+    t.fig.savefig(f'{name}-[{t.ax.get_title()}].pdf', transparent=True)
+
+
+###########################################################################
+# Previous line plot and violin plots combined in a subplot.              #
+###########################################################################
+
+def buildTimeSeries(ax):
+    """Build the artists of energy usage against CPU utilization on `ax[0]` and the active jobs on `ax[1]`."""
     # Line plot of energy usage compared to cpu utilization over time.
-    fig = plt.figure(figsize=(12.5,3.5))
-    plt.rcParams.update({'font.size': 13})
-    ax = fig.subplots(2,1, gridspec_kw={'height_ratios': [2, 1], 'hspace':0.0})
-
-    def moving_average(a, n=3):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1:] / n
-    ax[0].plot(data_energy[0]/3600, color='red', alpha=0.1, zorder=10)
-    ax[0].plot(moving_average(data_energy[0]/3600, 15), color='red', alpha=0.85, zorder=10)
+    energy, = ax[0].plot([], [], color='red', alpha=0.1, zorder=10)
+    energyAvg, = ax[0].plot([], [], color='red', alpha=0.85, zorder=10)
     ax[0].set_ylabel("Energy usage (Wh)", color='red')
-    ax[0].set_ylim(bottom=0)
-    ax[0].hlines(np.max(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax[0].hlines(np.min(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
+    energyMax = ax[0].hlines(0, -10, 10, linestyles='--', color='grey', alpha=0.7, zorder=0)
+    energyMin = ax[0].hlines(0, -10, 10, linestyles='--', color='grey', alpha=0.7, zorder=0)
     ax002=ax[0].twinx()
-    ax002.plot(data_cpuUtil[0]*100, color='blue', alpha=0.1, zorder=5)
-    ax002.plot(moving_average(data_cpuUtil[0]*100, 15), color='blue', alpha=0.85, zorder=5)
+    cpuUtil, = ax002.plot([], [], color='blue', alpha=0.1, zorder=5)
+    cpuUtilAvg, = ax002.plot([], [], color='blue', alpha=0.85, zorder=5)
     ax002.set_ylabel("CPU Utilization (\%)", color='blue')
     ax002.set_ylim(0,100)
-    ax[0].set_xlim(-10, len(data_cpuUtil[0])+10)
     ax[0].set_xticklabels([])
     ax[0].set_xticks([])
     ax[0].set_xticks([], minor=True)
 
     # Staircase plot showing the average active jobs over time
-    data_active_jobs = [np.array(data['guestsRunning'][0]).astype(float)]
-    def staircase_average(a, n=15):
-        steps = int(len(a)/n)
-        steps_remainder = int(len(a)%n)
-        staircase = np.zeros(len(a))
-        for i in range(steps):
-            staircase[i*n:(1+i)*n] = np.average(a[i*n:(1+i)*n])
-        staircase[steps:steps_remainder] = np.average(a[steps:steps_remainder])
-        return staircase
-
-    ax[1].plot(data_active_jobs[0], color='green', alpha=0.1, zorder=10)
-    staircase_avg = staircase_average(data_active_jobs[0], 25)
-    ax[1].plot(staircase_avg, color='green', alpha=1, zorder=10)
-    ax[1].fill_between([i for i in range(len(staircase_avg))], staircase_avg, [0 for i in range(len(staircase_avg))], color='lightgreen', alpha=0.75, zorder=10, edgecolor='green')
+    activeJobs, = ax[1].plot([], [], color='green', alpha=0.1, zorder=10)
+    stair, = ax[1].plot([], [], color='green', alpha=1, zorder=10)
     ax[1].set_xlabel("Scheduler Cycles")
     ax[1].set_ylabel("Active tasks", color='green')
+    ax[1].yaxis.set_major_formatter(FuncFormatter(lambda y, _: str(int(y))))
+    return SimpleNamespace(ax=ax, ax002=ax002, energy=energy, energyAvg=energyAvg, energyMax=energyMax,
+                           energyMin=energyMin, cpuUtil=cpuUtil, cpuUtilAvg=cpuUtilAvg, activeJobs=activeJobs,
+                           stair=stair, fill=None)
+
+
+def plotTimeSeries(t, s):
+    """Update the time series artists `t` built by buildTimeSeries with the series of scenario `s`."""
+    ax = t.ax
+    setDecimated(t.energy, s['energy'])
+    setDecimated(t.energyAvg, s['energyAvg'])
+    setHline(t.energyMax, np.max(s['energy']), len(s['cpuUtil']))
+    setHline(t.energyMin, np.min(s['energy']), len(s['cpuUtil']))
+    setDecimated(t.cpuUtil, s['cpuUtil'])
+    setDecimated(t.cpuUtilAvg, s['cpuUtilAvg'])
+    rescale(ax[0], bottom=0)
+    ax[0].set_xlim(-10, len(s['cpuUtil'])+10)
+
+    staircase_avg = s['activeJobsStair']
+    setDecimated(t.activeJobs, s['activeJobs'])
+    setDecimated(t.stair, staircase_avg)
+    if t.fill is not None:
+        t.fill.remove()
+    t.fill = plotDecimated(ax[1], staircase_avg, fill=True, color='lightgreen', alpha=0.75, zorder=10, edgecolor='green')
     ax[1].set_ylim(bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
-    ax[1].set_xlabel("Scheduler Cycles")
-    ax[1].set_xlim(-10, len(data_cpuUtil[0])+10)
-    labels = [str(int(i)) for i in ax[1].get_yticks()]
-    # labels[-1] = labels[-2] = ''
-    ax[1].set_yticklabels(labels)
-
-    plt.tight_layout()
-    ax[0].grid(False)
-    ax002.grid(False)
-    ax[1].grid(False)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[combined no density].pdf', transparent=True)
-    plt.show()
-
-
-
-    ###########################################################################
-    # Experiment 1                                                            #
-    ###########################################################################
-
-    ###########################################################################
-    # Violin plots of multiple schedulers (combined).                         #
-    ###########################################################################
-
-    default_path = "../../../../../../../results/"
-    trace = "askalon_ee"
-    schedulers = ["naive", "random", "taskflow"]
-    topology = "heterogeneous"
+    ax[1].set_xlim(-10, len(s['cpuUtil'])+10)
+
+
+def plotDistribution(ax, sketch, color, title, ylabel):
+    """Draw a box plot combined with a violin plot of the distribution `sketch` on `ax`, replacing its previous contents."""
+    ax.cla()
+    ax.set_title(title)
+    ax.set_ylabel(ylabel, color=color)
+    ax.set_xlabel("Policy")
+    # A scenario without samples leaves the axes empty
+    if not sketch.isEmpty:
+        ax.bxp([sketch.boxStats(whis=1.5)], vert=True, showmeans=True, meanline=True, showfliers=False)
+        violin_parts  = ax.violin([sketch.violinStats()], vert=True, showmeans=True)
+        for pc in violin_parts['bodies']:
+            pc.set_facecolor(color)
+            pc.set_edgecolor('black')
+    ax.set_xticklabels([])
+    ax.grid(True)
+
+
+def buildCombined():
+    fig = plt.figure(figsize=(15,5))
+    ax = fig.subplots(2,3, gridspec_kw={'width_ratios': [10, 1, 1], 'height_ratios': [2, 1], 'hspace':0.0})
+    ax[0][0].set_title("Workflow energy usage compared to CPU utilization over time\nRolling average of 15")
+    series = buildTimeSeries([ax[0][0], ax[1][0]])
+    ax[1][1].set_visible(False)
+    ax[1][2].set_visible(False)
+    ax[0][0].grid(False)
+    series.ax002.grid(False)
+    ax[1][0].grid(False)
+    return SimpleNamespace(fig=fig, ax=ax, series=series)
 
-    data_energies = []
-    data_cpuUtils = []
-    data_uptimes = []
-    for scheduler in schedulers:
-        data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-        data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-        data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
-        data_energies.append(data_energy[0]/3600)
-        data_cpuUtils.append(data_cpuUtil[0]*100)
-        data_uptimes.append(np.array(data['uptime'][0]).astype(float))
 
-    fig = plt.figure(figsize=(15,4))
-    plt.rcParams.update({'font.size': 15})
-    ax = fig.subplots(1, 2)
+def plotCombined(s, name):
+    t = template('combined', buildCombined)
+    plotTimeSeries(t.series, s)
 
     # Box plot combined with a violin plot of energy usage.
-    ax[0].set_title("Energy usage per policy")
-    ax[0].set_xlabel("Energy usage (Wh)")
-    ax[0].boxplot(data_energies, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax[0].violinplot(data_energies, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('red')
-        pc.set_edgecolor('black')
-    ax[0].set_yticklabels(schedulers)
+    plotDistribution(t.ax[0][1], s['sketches']['energy'], 'red', "Energy usage\ndistribution", "Energy usage (Wh)")
+    t.ax[0][1].set_ylim(bottom=0)
 
     # Box plot combined with a violin plot of cpu utilization.
-    ax[1].set_title("CPU Utilization per policy")
-    ax[1].set_xlabel("CPU Utilization (\%)")
-    ax[1].boxplot(data_cpuUtils, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax[1].violinplot(data_cpuUtils, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('blue')
-        pc.set_edgecolor('black')
-    ax[1].set_yticklabels(schedulers)
-
-    plt.subplots_adjust(left=0.1,
-                        bottom=0.140,
-                        right=0.9,
-                        top=0.9,
-                        wspace=0.4,
-                        hspace=0.4)
-    ax[0].grid(True)
-    ax[1].grid(True)
-    plt.savefig(f'[{trace}]-[multiple]-[{topology}]-[energy cpu dist].pdf', transparent=True)
-    plt.show()
-
-    ###########################################################################
-    # Violin plots of multiple schedulers (separate).                         #
-    ###########################################################################
-
-    fig = plt.figure(figsize=(7.5,4))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
+    plotDistribution(t.ax[0][2], s['sketches']['cpuUtil'], 'blue', "CPU utilization\ndistribution", "CPU Utilization (\%)")
+    t.ax[0][2].set_ylim(0,100)
 
-    # Box plot combined with a violin plot of energy usage.
-    ax.set_xlabel("Energy usage (Wh)")
-    ax.boxplot(data_energies, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax.violinplot(data_energies, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('red')
-        pc.set_edgecolor('black')
-    ax.set_yticklabels(schedulers)
-    plt.tight_layout()
-    plt.grid(True)
-    plt.savefig(f'[{trace}]-[multiple]-[{topology}]-[energy dist].pdf', transparent=True)
-    plt.show()
+    t.fig.tight_layout()
+    t.fig.savefig(f'{name}-[combined].pdf', transparent=True)
 
-    # Box plot combined with a violin plot of cpu utilization.
-    fig = plt.figure(figsize=(7.5,4))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
-    ax.set_xlabel("CPU Utilization (\%)")
-    ax.boxplot(data_cpuUtils, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax.violinplot(data_cpuUtils, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('blue')
-        pc.set_edgecolor('black')
-    ax.set_yticklabels(schedulers)
-    plt.tight_layout()
-    plt.grid(True)
-    plt.savefig(f'[{trace}]-[multiple]-[{topology}]-[cpu dist].pdf', transparent=True)
-    plt.show()
-
-
-    energy_sums = [sum(i) for i in data_energies]
-    print("Energy usage", *[i for i in zip(schedulers, energy_sums)], "(Wh)")
-    print("Uptime", *[i for i in zip(schedulers, data_uptimes)], "(s)")
-
-    ###########################################################################
-    # Experiment 2                                                            #
-    ###########################################################################
-
-    ###########################################################################
-    # Violin plots of multiple schedulers (separate).                         #
-    ###########################################################################
-
-    default_path = "../../../../../../../results/"
-    trace = "askalon_ee"
-    schedulers = "taskflow"
-    topologies = ["heterogeneous", "homogeneous"]
-
-    data_energies = []
-    data_cpuUtils = []
-    data_uptimes = []
-    for topology in topologies:
-        data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-        data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-        data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
-        data_energies.append(data_energy[0]/3600)
-        data_cpuUtils.append(data_cpuUtil[0]*100)
-        data_uptimes.append(np.array(data['uptime'][0]).astype(float))
-
-    fig = plt.figure(figsize=(7.5,3))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
 
-    # Box plot combined with a violin plot of energy usage.
-    ax.set_xlabel("Energy usage (Wh)")
-    ax.boxplot(data_energies, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax.violinplot(data_energies, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('red')
-        pc.set_edgecolor('black')
-    ax.set_yticklabels(topologies)
-    plt.tight_layout()
-    plt.grid(True)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[multiple]-[energy dist].pdf', transparent=True)
-    plt.show()
+###########################################################################
+# Previous subplot without the density violin plots.                      #
+###########################################################################
 
-    # Box plot combined with a violin plot of cpu utilization.
-    fig = plt.figure(figsize=(7.5,3))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
-    ax.set_xlabel("CPU Utilization (\%)")
-    ax.boxplot(data_cpuUtils, vert=False, showmeans=True, meanline=True, sym='', whis=2, widths=0.3)
-    violin_parts = ax.violinplot(data_cpuUtils, vert=False, showmeans=True, widths=0.8)
-    for pc in violin_parts['bodies']:
-        pc.set_facecolor('blue')
-        pc.set_edgecolor('black')
-    ax.set_yticklabels(topologies)
-    plt.tight_layout()
-    plt.grid(True)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[multiple]-[cpu dist].pdf', transparent=True)
-    plt.show()
-
-    ###########################################################################
-    # Bar plots of total energy usage.                                        #
-    ###########################################################################
-
-    fig = plt.figure(figsize=(7.5,2.5))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
-
-    energy_sums = [sum(i) for i in data_energies]
-    ax.barh(topologies, energy_sums, height = 0.4, edgecolor='black')
-
-    plt.xlabel("Total energy usage (Wh)")
-    plt.tight_layout()
-    plt.grid(True)
-    plt.show()
-
-    print("Energy usage", *[i for i in zip(topologies, energy_sums)], "(Wh)")
-    print("Uptime", *[i for i in zip(topologies, data_uptimes)], "(s)")
-
-
-
-    ###########################################################################
-    # Experiment 3                                                            #
-    ###########################################################################
-
-    ###########################################################################
-    # Bar plots of total energy usage.                                        #
-    ###########################################################################
-
-    default_path = "../../../../../../../results/"
-    traces = ["askalon_ee", "Pegasus_P1_parquet", "Pegasus_P7_parquet"]
-    schedulers = "taskflow"
-    topology = "heterogeneous"
-
-    data_energies = []
-    data_cpuUtils = []
-    data_uptimes = []
-    for trace in traces:
-        data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-        data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-        data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
-        data_energies.append(data_energy[0]/3600)
-        data_cpuUtils.append(data_cpuUtil[0]*100)
-        data_uptimes.append(np.array(data['uptime'][0]).astype(float))
-
-    fig = plt.figure(figsize=(7.5,2.5))
-    plt.rcParams.update({'font.size': 17})
-    ax = fig.subplots()
-
-    energy_sums = [sum(i) for i in data_energies]
-    ax.barh(traces, energy_sums, height = 0.4, edgecolor='black')
-
-    plt.xlabel("Total energy usage (Wh)")
-    plt.tight_layout()
-    plt.grid(True)
-    plt.show()
-
-    print("Energy usage", *[i for i in zip(traces, energy_sums)], "(Wh)")
-    print("Uptime", *[i for i in zip(traces, data_uptimes)], "(s)")
-
-
-
-    ###########################################################################
-    # Appendix                                                                #
-    ###########################################################################
-
-    ###########################################################################
-    # Pegasus P1                                                              #
-    ###########################################################################
-
-    default_path = "../../../../../../../results/"
-    trace = "Pegasus_P1_parquet"
-    scheduler = "taskflow"
-    topology = "heterogeneous"
-    data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-    data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-    data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
-
-    # Line plot of energy usage compared to cpu utilization over time.
+def buildCombinedNoDensity():
     fig = plt.figure(figsize=(12.5,3.5))
-    plt.rcParams.update({'font.size': 13})
     ax = fig.subplots(2,1, gridspec_kw={'height_ratios': [2, 1], 'hspace':0.0})
-
-    def moving_average(a, n=3):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1:] / n
-    ax[0].plot(data_energy[0]/3600, color='red', alpha=0.1, zorder=10)
-    ax[0].plot(moving_average(data_energy[0]/3600, 15), color='red', alpha=0.85, zorder=10)
-    ax[0].set_ylabel("Energy usage (Wh)", color='red')
-    ax[0].set_ylim(bottom=0)
-    ax[0].hlines(np.max(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax[0].hlines(np.min(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax002=ax[0].twinx()
-    ax002.plot(data_cpuUtil[0]*100, color='blue', alpha=0.1, zorder=5)
-    ax002.plot(moving_average(data_cpuUtil[0]*100, 15), color='blue', alpha=0.85, zorder=5)
-    ax002.set_ylabel("CPU Utilization (\%)", color='blue')
-    ax002.set_ylim(0,100)
-    ax[0].set_xlim(-10, len(data_cpuUtil[0])+10)
-    ax[0].set_xticklabels([])
-    ax[0].set_xticks([])
-    ax[0].set_xticks([], minor=True)
-
-    # Staircase plot showing the average active jobs over time
-    data_active_jobs = [np.array(data['guestsRunning'][0]).astype(float)]
-    def staircase_average(a, n=15):
-        steps = int(len(a)/n)
-        steps_remainder = int(len(a)%n)
-        staircase = np.zeros(len(a))
-        for i in range(steps):
-            staircase[i*n:(1+i)*n] = np.average(a[i*n:(1+i)*n])
-        staircase[steps:steps_remainder] = np.average(a[steps:steps_remainder])
-        return staircase
-
-    ax[1].plot(data_active_jobs[0], color='green', alpha=0.1, zorder=10)
-    staircase_avg = staircase_average(data_active_jobs[0], 15)
-    ax[1].plot(staircase_avg, color='green', alpha=1, zorder=10)
-    ax[1].fill_between([i for i in range(len(staircase_avg))], staircase_avg, [0 for i in range(len(staircase_avg))], color='lightgreen', alpha=0.75, zorder=10, edgecolor='green')
-    ax[1].set_xlabel("Scheduler Cycles")
-    ax[1].set_ylabel("Active tasks", color='green')
-    ax[1].set_ylim(bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
-    ax[1].set_xlabel("Scheduler Cycles")
-    ax[1].set_xlim(-10, len(data_cpuUtil[0])+10)
-    labels = [str(int(i)) for i in ax[1].get_yticks()]
-    # labels[-1] = labels[-2] = ''
-    ax[1].set_yticklabels(labels)
-
-    plt.tight_layout()
+    series = buildTimeSeries(ax)
     ax[0].grid(False)
-    ax002.grid(False)
+    series.ax002.grid(False)
     ax[1].grid(False)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[combined no density].pdf', transparent=True)
-    plt.show()
-
-
-    ###########################################################################
-    # Pegasus P7                                                              #
-    ###########################################################################
+    return SimpleNamespace(fig=fig, series=series)
+
+
+def plotCombinedNoDensity(s, name):
+    with plt.rc_context({'font.size': 13}):
+        t = template('combined no density', buildCombinedNoDensity)
+        plotTimeSeries(t.series, s)
+        t.fig.tight_layout()
+        t.fig.savefig(f'{name}-[combined no density].pdf', transparent=True)
+
+
+###########################################################################
+# Violin plots of multiple scenarios.                                     #
+###########################################################################
+
+def plotViolins(ax, sketches, labels, color, whis=2):
+    """
+    Draw a box plot combined with a violin plot of the distribution sketches
+    for every label on `ax`. The row of a sketch without samples stays empty.
+    """
+    drawn = [(position, sketch) for position, sketch in enumerate(sketches, start=1) if not sketch.isEmpty]
+    if drawn:
+        positions = [position for position, _ in drawn]
+        ax.bxp([sketch.boxStats(whis) for _, sketch in drawn], positions=positions, vert=False, showmeans=True,
+               meanline=True, showfliers=False, widths=0.3)
+        violin_parts = ax.violin([sketch.violinStats() for _, sketch in drawn], positions=positions, vert=False,
+                                 showmeans=True, widths=0.8)
+        for pc in violin_parts['bodies']:
+            pc.set_facecolor(color)
+            pc.set_edgecolor('black')
+    ax.set_yticks(np.arange(1, len(labels) + 1))
+    ax.set_yticklabels(labels)
+
+
+def plotEnergyCpuDist(*series, labels, name):
+    with plt.rc_context({'font.size': 15}):
+        fig = plt.figure(figsize=(15,4))
+        ax = fig.subplots(1, 2)
+
+        # Box plot combined with a violin plot of energy usage.
+        ax[0].set_title("Energy usage per policy")
+        ax[0].set_xlabel("Energy usage (Wh)")
+        plotViolins(ax[0], [s['sketches']['energy'] for s in series], labels, 'red')
+
+        # Box plot combined with a violin plot of cpu utilization.
+        ax[1].set_title("CPU Utilization per policy")
+        ax[1].set_xlabel("CPU Utilization (\%)")
+        plotViolins(ax[1], [s['sketches']['cpuUtil'] for s in series], labels, 'blue')
+
+        fig.subplots_adjust(left=0.1,
+                            bottom=0.140,
+                            right=0.9,
+                            top=0.9,
+                            wspace=0.4,
+                            hspace=0.4)
+        ax[0].grid(True)
+        ax[1].grid(True)
+        fig.savefig(f'{name}-[energy cpu dist].pdf', transparent=True)
+        plt.close(fig)
+
+
+def plotDist(*series, metric, labels, name, figsize=(7.5,4)):
+    xlabel, color, title = {
+        'energy': ("Energy usage (Wh)", 'red', 'energy dist'),
+        'cpuUtil': ("CPU Utilization (\%)", 'blue', 'cpu dist'),
+    }[metric]
+    with plt.rc_context({'font.size': 17}):
+        fig = plt.figure(figsize=figsize)
+        ax = fig.subplots()
+        ax.set_xlabel(xlabel)
+        plotViolins(ax, [s['sketches'][metric] for s in series], labels, color)
+        fig.tight_layout()
+        ax.grid(True)
+        fig.savefig(f'{name}-[{title}].pdf', transparent=True)
+        plt.close(fig)
+
+
+###########################################################################
+# Bar plots of total energy usage.                                        #
+###########################################################################
+
+def plotEnergyTotals(*series, labels, name):
+    with plt.rc_context({'font.size': 17}):
+        fig = plt.figure(figsize=(7.5,2.5))
+        ax = fig.subplots()
+
+        energy_sums = [s['energyTotal'] for s in series]
+        ax.barh(labels, energy_sums, height = 0.4, edgecolor='black')
+
+        ax.set_xlabel("Total energy usage (Wh)")
+        fig.tight_layout()
+        ax.grid(True)
+        fig.savefig(f'{name}-[energy totals].pdf', transparent=True)
+        plt.close(fig)
+
+
+def printTotals(summaries, labels):
+    """Print the mean and bootstrap confidence interval over the repeats of the totals of every label."""
+    def interval(summary, metric):
+        mean, low, high = summary[metric]
+        return mean, (low, high)
+
+    print("Energy usage", *[(label, *interval(s, 'energyTotal')) for label, s in zip(labels, summaries)], "(Wh)")
+    print("Uptime", *[(label, *interval(s, 'uptime')) for label, s in zip(labels, summaries)], "(s)")
+    print("Repeats", *[(label, s['repeats']) for label, s in zip(labels, summaries)])
+
+
+###########################################################################
+# Wall-clock cost of a profiled run against simulated time.               #
+###########################################################################
+
+def buildProfile():
+    fig = plt.figure(figsize=(12,8))
+    ax = fig.subplots(3, sharex=True)
+    ax[0].set_title("Wall-clock cost against simulated time")
+    wallTime, = ax[0].plot([], [], color='black')
+    ax[0].set_ylabel("Wall time (s)")
+    cycleTime, = ax[1].plot([], [], color='red', alpha=0.5)
+    ax[1].set_ylabel("Cycle time (ms)", color='red')
+    ax12 = ax[1].twinx()
+    rate, = ax12.plot([], [], color='blue', alpha=0.85)
+    ax12.set_ylabel("Placements per second", color='blue')
+    incomingJobs, = ax[2].plot([], [], color='green', alpha=0.85, label="Incoming jobs")
+    incomingTasks, = ax[2].plot([], [], color='orange', alpha=0.85, label="Incoming tasks")
+    taskQueue, = ax[2].plot([], [], color='purple', alpha=0.85, label="Dispatched tasks")
+    ax[2].set_ylabel("Queue depth")
+    ax[2].set_xlabel("Simulated time (h)")
+    ax[2].legend(loc='upper right')
+    return SimpleNamespace(fig=fig, ax=ax, ax12=ax12, wallTime=wallTime, cycleTime=cycleTime, rate=rate,
+                           incomingJobs=incomingJobs, incomingTasks=incomingTasks, taskQueue=taskQueue)
+
+
+def plotProfile(p, name, window=15):
+    """
+    Draw the profile `p` of a run (see `getProfile`): the cumulative wall time,
+    the wall time per scheduling cycle with the placement rate over a window of
+    `window` cycles, and the queue depths of the workflow service, all against
+    simulated time. A knee in the wall time marks where the run stops scaling.
+    """
+    t = template('profile', buildProfile)
+    hours = (p['timestamp'] - p['timestamp'][:1]) / 3_600_000
+    setDecimatedAt(t.wallTime, hours, p['wallTime'] / 1e9)
+    setDecimatedAt(t.cycleTime, hours, p['cycleTime'] / 1e6)
+    lag = np.maximum(np.arange(len(hours)) - window, 0)
+    elapsed = (p['wallTime'] - p['wallTime'][lag]) / 1e9
+    placed = (p['placements'] - p['placements'][lag]).astype(float)
+    setDecimatedAt(t.rate, hours, np.divide(placed, elapsed, out=np.zeros_like(placed), where=elapsed > 0))
+    setDecimatedAt(t.incomingJobs, hours, p['incomingJobs'])
+    setDecimatedAt(t.incomingTasks, hours, p['incomingTasks'])
+    setDecimatedAt(t.taskQueue, hours, p['taskQueue'])
+    for ax in (*t.ax, t.ax12):
+        rescale(ax, bottom=0)
+    t.fig.tight_layout()
+    t.fig.savefig(f'{name}-[profile].pdf', transparent=True)
+
+
+###########################################################################
+# Figure specifications.                                                  #
+###########################################################################
+
+# The reduction applied to a scenario, as (parameter, value) pairs of reduceScenario.
+REDUCTION = (('window', 15), ('steps', 25), ('mode', 'trailing'))
+
+# The standalone active jobs figure averages over narrower staircase steps than the combined figures.
+ACTIVE_JOBS_REDUCTION = (('window', 15), ('steps', 10), ('mode', 'trailing'))
+
+
+class Figure(NamedTuple):
+    """
+    A figure declared as data: the `layout` that draws it, the scenarios it
+    shows as (trace, scheduler, topology) with their `labels`, the reduction
+    applied to every scenario and the options passed to the layout.
+    """
+    name: str
+    layout: str
+    scenarios: tuple
+    labels: tuple = ()
+    reduction: tuple = REDUCTION
+    options: tuple = ()
+
+
+LAYOUTS = {
+    'active jobs': plotActiveJobs,
+    'energy cpu': plotEnergyCpu,
+    'combined': plotCombined,
+    'combined no density': plotCombinedNoDensity,
+    'energy cpu dist': plotEnergyCpuDist,
+    'dist': plotDist,
+    'energy totals': plotEnergyTotals,
+    'profile': plotProfile,
+}
+
+
+def scenarioFigures(scenario):
+    """Return the figures drawn for every single scenario."""
+    name = '-'.join(f'[{part}]' for part in scenario)
+    return [Figure(name, 'active jobs', (scenario,), reduction=ACTIVE_JOBS_REDUCTION)] + \
+        [Figure(name, layout, (scenario,)) for layout in ['energy cpu', 'combined', 'combined no density']]
+
+
+SCHEDULERS = ('naive', 'random', 'taskflow')
+TOPOLOGIES = ('heterogeneous', 'homogeneous')
+TRACES = ('askalon_ee', 'Pegasus_P1_parquet', 'Pegasus_P7_parquet')
+
+FIGURES = [
+    # Experiment 1: compute schedulers
+    *[Figure('[askalon_ee]-[multiple]-[heterogeneous]', layout,
+             tuple(('askalon_ee', scheduler, 'heterogeneous') for scheduler in SCHEDULERS), SCHEDULERS, options=options)
+      for layout, options in [('energy cpu dist', ()), ('dist', (('metric', 'energy'),)), ('dist', (('metric', 'cpuUtil'),))]],
+    # Experiment 2: topologies
+    *[Figure('[askalon_ee]-[taskflow]-[multiple]', layout,
+             tuple(('askalon_ee', 'taskflow', topology) for topology in TOPOLOGIES), TOPOLOGIES, options=options)
+      for layout, options in [('dist', (('metric', 'energy'), ('figsize', (7.5, 3)))),
+                              ('dist', (('metric', 'cpuUtil'), ('figsize', (7.5, 3)))),
+                              ('energy totals', ())]],
+    # Experiment 3: traces
+    Figure('[multiple]-[taskflow]-[heterogeneous]', 'energy totals',
+           tuple((trace, 'taskflow', 'heterogeneous') for trace in TRACES), TRACES),
+]
+
+
+def reduceKey(scenario, reduction=REDUCTION):
+    return ('reduce', scenario, reduction)
+
+
+def totalsOf(*repeats):
+    """Return the bootstrap summary of the totals of the loaded `repeats` of a scenario."""
+    return summarizeRepeats(stackRepeats(*repeats))
+
+
+def planTotals(graph, default_path, scenarios, cache=None):
+    """
+    Add the tasks that load every repeat of `scenarios` and summarize their
+    totals to `graph`, and return the key of the summary of every scenario.
+    The first repeat shares its load task with the figures.
+    """
+    keys = []
+    for scenario in scenarios:
+        paths = repeatPaths(default_path, *scenario)
+        if not paths:
+            raise ValueError(f'No result files of scenario {scenario} in {default_path}')
+        loads = [graph.add(('load', scenario, *((i,) if i else ())), loadScenario, path, cache=cache)
+                 for i, path in enumerate(paths)]
+        keys.append(graph.add(('totals', scenario), totalsOf, deps=loads))
+    return keys
+
+
+def availableFigures(figures, scenarios):
+    """
+    Return the `figures` of which every scenario is among the `scenarios` that
+    have result files, and warn about the figures that are left out.
+    """
+    found = set(scenarios)
+    available = []
+    for figure in figures:
+        missing = [scenario for scenario in figure.scenarios if scenario not in found]
+        if missing:
+            print(f"Skipping figure {figure.name} ({figure.layout}): no results of {', '.join(map(str, missing))}",
+                  file=sys.stderr)
+        else:
+            available.append(figure)
+    return available
+
+
+def renderFigure(*series, layout, rc=None, **options):
+    """Draw a figure with the given `layout` and `rc` parameters and return its render time in seconds."""
+    start = time.perf_counter()
+    with plt.rc_context(rc):
+        LAYOUTS[layout](*series, **options)
+    return time.perf_counter() - start
+
+
+def planProfiles(graph, default_path, scenarios, rc=None):
+    """
+    Add the tasks that load and render the profile of (the first repeat of)
+    every scenario in `scenarios` that was run with profiling to `graph`.
+    """
+    for scenario in scenarios:
+        path = scenarioPath(default_path, *scenario)
+        if not os.path.exists(profilePath(path)):
+            continue
+        figure = Figure('-'.join(f'[{part}]' for part in scenario), 'profile', (scenario,))
+        load = graph.add(('profile', scenario), getProfile, path)
+        graph.add(('render', figure), renderFigure, deps=[load], layout=figure.layout, rc=rc, name=figure.name)
+    return graph
+
+
+def planFigures(default_path, figures, cache=None, rc=None):
+    """
+    Plan the task graph that renders `figures` with the `rc` parameters. Every
+    result file is loaded once and every distinct reduction of it is computed
+    once, however many figures draw it. With a `cache`, the loaded and reduced
+    arrays are reused across runs.
+    """
+    graph = TaskGraph()
+    for figure in figures:
+        deps = []
+        for scenario in figure.scenarios:
+            path = scenarioPath(default_path, *scenario)
+            load = graph.add(('load', scenario), loadScenario, path, cache=cache)
+            deps.append(graph.add(reduceKey(scenario, figure.reduction), reduceScenario, path,
+                                  cache=cache, deps=[load], **dict(figure.reduction)))
+
+        options = dict(figure.options)
+        if figure.labels:
+            options['labels'] = figure.labels
+        graph.add(('render', figure), renderFigure, deps=deps, layout=figure.layout, rc=rc, name=figure.name, **options)
+    return graph
 
-    default_path = "../../../../../../../results/"
-    trace = "Pegasus_P7_parquet"
-    scheduler = "taskflow"
-    topology = "heterogeneous"
-    data = getData(f'{default_path}/{trace}/{scheduler}/{topology}.csv')
-    data_energy = [np.array(data['energyUsage'][0]).astype(float)]
-    data_cpuUtil = [np.array(data['cpuUtilization'][0]).astype(float)]
 
-    # Line plot of energy usage compared to cpu utilization over time.
-    fig = plt.figure(figsize=(12.5,3.5))
-    plt.rcParams.update({'font.size': 13})
-    ax = fig.subplots(2,1, gridspec_kw={'height_ratios': [2, 1], 'hspace':0.0})
-
-    def moving_average(a, n=3):
-        ret = np.cumsum(a, dtype=float)
-        ret[n:] = ret[n:] - ret[:-n]
-        return ret[n - 1:] / n
-    ax[0].plot(data_energy[0]/3600, color='red', alpha=0.1, zorder=10)
-    ax[0].plot(moving_average(data_energy[0]/3600, 15), color='red', alpha=0.85, zorder=10)
-    ax[0].set_ylabel("Energy usage (Wh)", color='red')
-    ax[0].set_ylim(bottom=0)
-    ax[0].hlines(np.max(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax[0].hlines(np.min(data_energy[0]/3600), -10, len(data_cpuUtil[0])+10, linestyles='--', color='grey', alpha=0.7, zorder=0)
-    ax002=ax[0].twinx()
-    ax002.plot(data_cpuUtil[0]*100, color='blue', alpha=0.1, zorder=5)
-    ax002.plot(moving_average(data_cpuUtil[0]*100, 15), color='blue', alpha=0.85, zorder=5)
-    ax002.set_ylabel("CPU Utilization (\%)", color='blue')
-    ax002.set_ylim(0,100)
-    ax[0].set_xlim(-10, len(data_cpuUtil[0])+10)
-    ax[0].set_xticklabels([])
-    ax[0].set_xticks([])
-    ax[0].set_xticks([], minor=True)
-
-    # Staircase plot showing the average active jobs over time
-    data_active_jobs = [np.array(data['guestsRunning'][0]).astype(float)]
-    def staircase_average(a, n=15):
-        steps = int(len(a)/n)
-        steps_remainder = int(len(a)%n)
-        staircase = np.zeros(len(a))
-        for i in range(steps):
-            staircase[i*n:(1+i)*n] = np.average(a[i*n:(1+i)*n])
-        staircase[steps:steps_remainder] = np.average(a[steps:steps_remainder])
-        return staircase
-
-    ax[1].plot(data_active_jobs[0], color='green', alpha=0.1, zorder=10)
-    staircase_avg = staircase_average(data_active_jobs[0], 25)
-    ax[1].plot(staircase_avg, color='green', alpha=1, zorder=10)
-    ax[1].fill_between([i for i in range(len(staircase_avg))], staircase_avg, [0 for i in range(len(staircase_avg))], color='lightgreen', alpha=0.75, zorder=10, edgecolor='green')
-    ax[1].set_xlabel("Scheduler Cycles")
-    ax[1].set_ylabel("Active tasks", color='green')
-    ax[1].set_ylim(bottom=0, top = (max(staircase_avg) + max(staircase_avg)*0.1))
-    ax[1].set_xlabel("Scheduler Cycles")
-    ax[1].set_xlim(-10, len(data_cpuUtil[0])+10)
-    labels = [str(int(i)) for i in ax[1].get_yticks()]
-    # labels[-1] = labels[-2] = ''
-    ax[1].set_yticklabels(labels)
-
-    plt.tight_layout()
-    ax[0].grid(False)
-    ax002.grid(False)
-    ax[1].grid(False)
-    plt.savefig(f'[{trace}]-[{scheduler}]-[{topology}]-[combined no density].pdf', transparent=True)
-    plt.show()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the figures of the lab results.")
+    parser.add_argument('--results', default="../../../../../../../results/", help="the results tree written by LabRunner")
+    parser.add_argument('--workers', type=int, default=None, help="the number of worker processes (0 to run in-process)")
+    parser.add_argument('--cache', default=None, help="the directory of the array cache (default: <results>/.cache)")
+    parser.add_argument('--cache-size', type=int, default=1024, help="the size cap of the array cache in MB")
+    parser.add_argument('--no-cache', action='store_true', help="parse and reduce every result file again")
+    parser.add_argument('--batch', action='store_true', help="render headless and write the render time of every figure to --timings")
+    parser.add_argument('--timings', default='render-timings.csv', help="the file to which batch mode writes the render timings")
+    parser.add_argument('--no-tex', action='store_true', help="typeset the text with mathtext instead of LaTeX")
+    parser.add_argument('--profile', action='store_true', help="also render the profile of every scenario that was run with profiling")
+    args = parser.parse_args()
+
+    if args.batch:
+        # Worker processes inherit the backend through the environment.
+        os.environ['MPLBACKEND'] = 'Agg'
+        plt.switch_backend('Agg')
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache or os.path.join(args.results, '.cache'), args.cache_size << 20)
+
+    scenarios = findScenarios(args.results)
+    comparisonFigures = availableFigures(FIGURES, scenarios)
+    figures = [figure for scenario in scenarios for figure in scenarioFigures(scenario)] + comparisonFigures
+    rc = {'text.usetex': False} if args.no_tex else None
+    graph = planFigures(args.results, figures, cache, rc)
+    if args.profile:
+        planProfiles(graph, args.results, scenarios, rc)
+    comparisons = list(dict.fromkeys((figure.scenarios, figure.labels) for figure in comparisonFigures))
+    totals = [planTotals(graph, args.results, scenarios, cache) for scenarios, _ in comparisons]
+    results = graph.run(args.workers)
+
+    for (_, labels), keys in zip(comparisons, totals):
+        printTotals([results[key] for key in keys], labels)
+
+    if args.batch:
+        timings = sorted(((key[1], seconds) for key, seconds in results.items() if key[0] == 'render'), key=lambda t: -t[1])
+        with open(args.timings, 'w') as f:
+            f.write('figure;layout;seconds\n')
+            for figure, seconds in timings:
+                f.write(f'{figure.name};{figure.layout};{seconds:.3f}\n')
+        print("Rendered", len(timings), "figures in", round(sum(seconds for _, seconds in timings), 1), "s (see", args.timings + ")")
@@ -0,0 +1,130 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.internal
+
+import io.mockk.coEvery
+import io.mockk.coVerify
+import io.mockk.mockk
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertSame
+import org.junit.jupiter.api.Test
+import org.opendc.compute.api.ComputeClient
+import org.opendc.compute.api.Server
+import org.opendc.compute.api.ServerRequest
+import org.opendc.compute.api.ServerState
+import org.opendc.compute.api.ServerWatcher
+import org.opendc.simulator.kotlin.runSimulation
+import org.opendc.workflow.api.Job
+import org.opendc.workflow.api.Task
+import org.opendc.workflow.api.WORKFLOW_TASK_CORES
+import org.opendc.workflow.api.WORKFLOW_TASK_DEADLINE
+import org.opendc.workflow.service.WorkflowService
+import org.opendc.workflow.service.scheduler.job.NullJobAdmissionPolicy
+import org.opendc.workflow.service.scheduler.job.SubmissionTimeJobOrderPolicy
+import org.opendc.workflow.service.scheduler.task.NullTaskEligibilityPolicy
+import org.opendc.workflow.service.scheduler.task.SubmissionTimeTaskOrderPolicy
+import java.time.Duration
+import java.util.UUID
+
+/**
+ * Test suite for the [WorkflowServiceImpl] class.
+ */
+internal class WorkflowServiceImplTest {
+    @Test
+    fun testBatchDispatch() = runSimulation {
+        val client = mockk<ComputeClient>()
+        val batches = mutableListOf<List<ServerRequest>>()
+        val shapes = mutableListOf<Pair<Int, Long>>()
+        val started = mutableListOf<String>()
+
+        coEvery { client.newImage(any(), any(), any()) } returns mockk()
+        coEvery { client.newFlavor(any(), any(), any(), any(), any()) } answers {
+            shapes += secondArg<Int>() to thirdArg<Long>()
+            mockk()
+        }
+        coEvery { client.newServers(any(), any(), any()) } answers {
+            val requests = firstArg<List<ServerRequest>>()
+            batches += requests
+            requests.map { mockServer(it, secondArg(), started) }
+        }
+
+        val service = WorkflowService(
+            coroutineContext,
+            clock,
+            client,
+            Duration.ofMillis(100),
+            NullJobAdmissionPolicy,
+            SubmissionTimeJobOrderPolicy(),
+            NullTaskEligibilityPolicy,
+            SubmissionTimeTaskOrderPolicy()
+        )
+
+        val roots = listOf(1, 2, 1, 2).mapIndexed { i, cores -> createTask(i, cores) }
+        val dependent = createTask(4, 1, setOf(roots[0]))
+        service.invoke(Job(UUID(0L, 0L), "test", (roots + dependent).toSet()))
+
+        val stats = service.getSchedulerStats()
+        service.close()
+
+        // The ready tasks of a scheduling cycle are dispatched in a single call, in task order
+        assertEquals(listOf(listOf("task-0", "task-1", "task-2", "task-3"), listOf("task-4")), batches.map { batch -> batch.map { it.name } })
+        assertEquals(listOf("task-0", "task-1", "task-2", "task-3", "task-4"), started)
+
+        // Tasks of the same shape share a flavor
+        assertEquals(listOf(1 to 1000L, 2 to 1000L), shapes)
+        assertSame(batches[0][0].flavor, batches[0][2].flavor)
+        assertSame(batches[0][1].flavor, batches[0][3].flavor)
+        assertSame(batches[0][0].flavor, batches[1][0].flavor)
+
+        coVerify(exactly = 2) { client.newServers(any(), any(), false) }
+        assertEquals(5, stats.tasksFinished)
+        assertEquals(0, stats.tasksRunning)
+        assertEquals(1, stats.workflowsFinished)
+    }
+
+    /**
+     * Create a [Task] with the specified number of [cores].
+     */
+    private fun createTask(id: Int, cores: Int, dependencies: Set<Task> = emptySet()): Task {
+        return Task(
+            UUID(0L, id.toLong()),
+            "task-$id",
+            dependencies,
+            mutableMapOf(WORKFLOW_TASK_CORES to cores, WORKFLOW_TASK_DEADLINE to 1000L)
+        )
+    }
+
+    /**
+     * Mock a [Server] that runs to completion as soon as it is started, reporting its state changes to [watcher] before
+     * [Server.start] returns.
+     */
+    private fun mockServer(request: ServerRequest, watcher: ServerWatcher, started: MutableList<String>): Server {
+        val server = mockk<Server>(relaxed = true)
+        coEvery { server.start() } answers {
+            started += request.name
+            watcher.onStateChanged(server, ServerState.RUNNING)
+            watcher.onStateChanged(server, ServerState.TERMINATED)
+        }
+        return server
+    }
+}
@@ -0,0 +1,68 @@
+"""
+A small task graph for the figure pipeline.
+
+Tasks are added under a key; adding the same key twice yields a single task,
+so a result file that feeds many figures is loaded only once. Each task is
+called with the results of its dependencies followed by its own arguments and
+runs as soon as all dependencies have finished.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class TaskGraph:
+    def __init__(self):
+        self.tasks = dict()
+
+    def add(self, key, fn, *args, deps=(), **kwargs):
+        """
+        Add a task under `key` that runs `fn(*deps results, *args, **kwargs)`
+        and return the key. If a task with the same key exists, it is reused.
+        """
+        if key not in self.tasks:
+            for dep in deps:
+                if dep not in self.tasks:
+                    raise KeyError(f'Unknown dependency {dep!r} of task {key!r}')
+            self.tasks[key] = (fn, args, kwargs, tuple(deps))
+        return key
+
+    def run(self, workers=None):
+        """
+        Run all tasks on a pool of `workers` processes (default: one per core)
+        and return a dictionary mapping each key to the result of its task.
+        With `workers=0` the tasks run one by one in the calling process.
+        """
+        if workers == 0:
+            results = dict()
+            for key in self.order():
+                fn, args, kwargs, deps = self.tasks[key]
+                results[key] = fn(*[results[dep] for dep in deps], *args, **kwargs)
+            return results
+
+        waiting = {key: set(deps) for key, (_, _, _, deps) in self.tasks.items()}
+        dependents = {key: [] for key in self.tasks}
+        for key, (_, _, _, deps) in self.tasks.items():
+            for dep in set(deps):
+                dependents[dep].append(key)
+
+        results = dict()
+        with ProcessPoolExecutor(workers) as pool:
+            def submit(key):
+                fn, args, kwargs, deps = self.tasks[key]
+                return pool.submit(fn, *[results[dep] for dep in deps], *args, **kwargs)
+
+            running = {submit(key): key for key, deps in waiting.items() if not deps}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    results[key] = future.result()
+                    for dependent in dependents[key]:
+                        waiting[dependent].discard(key)
+                        if not waiting[dependent]:
+                            running[submit(dependent)] = dependent
+        return results
+
+    def order(self):
+        """Return the keys of the tasks in an order in which they can run."""
+        # Dependencies must exist when a task is added, so insertion order is topological.
+        return list(self.tasks)
@@ -0,0 +1,127 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertTrue
+import org.junit.jupiter.api.Test
+import org.opendc.trace.Trace
+import org.opendc.trace.conv.TABLE_TASKS
+import org.opendc.trace.conv.TASK_ALLOC_NCPUS
+import org.opendc.trace.conv.TASK_ID
+import org.opendc.trace.conv.TASK_PARENTS
+import org.opendc.trace.conv.TASK_REQ_NCPUS
+import org.opendc.trace.conv.TASK_RUNTIME
+import org.opendc.trace.conv.TASK_SUBMIT_TIME
+import org.opendc.trace.conv.TASK_WORKFLOW_ID
+import org.opendc.workflow.api.WORKFLOW_TASK_CORES
+import org.opendc.workflow.api.WORKFLOW_TASK_DEADLINE
+import org.opendc.workflow.service.WorkflowServiceTest
+import java.nio.file.Paths
+import java.time.Instant
+import java.util.UUID
+import kotlin.math.min
+
+/**
+ * Test suite for the [JobTable].
+ */
+class JobTableTest {
+    private val trace = Trace.open(
+        Paths.get(checkNotNull(WorkflowServiceTest::class.java.getResource("/askalon_ee.gwf")).toURI()),
+        format = "gwf"
+    )
+
+    @Test
+    fun testSubmitOrder() {
+        val table = trace.toJobTable()
+
+        assertTrue((1 until table.size).all { table.submitTime(it - 1) <= table.submitTime(it) })
+    }
+
+    @Test
+    fun testSameJobs() {
+        val limit = Instant.ofEpochSecond(500)
+        val table = trace.toJobTable(limit)
+        val expected = readOracleJobs(trace, limit)
+        val actual = table.toList()
+
+        assertEquals(expected.keys, actual.map { it.uid }.toSet())
+        assertEquals(expected.values.sumOf { it.tasks.size }, table.taskCount)
+
+        for (job in actual) {
+            val other = expected.getValue(job.uid)
+            assertEquals(other.submitTime, job.metadata["WORKFLOW_SUBMIT_TIME"])
+
+            val otherTasks = other.tasks.associateBy { it.uid }
+            assertEquals(otherTasks.keys, job.tasks.map { it.uid }.toSet())
+
+            for (task in job.tasks) {
+                val otherTask = otherTasks.getValue(task.uid)
+                assertEquals(otherTask.dependencies, task.dependencies.map { it.uid }.toSet())
+                assertEquals(otherTask.flops, task.metadata["workload_flops"])
+                assertEquals(otherTask.cores, task.metadata[WORKFLOW_TASK_CORES])
+                assertEquals(otherTask.deadline, task.metadata[WORKFLOW_TASK_DEADLINE])
+            }
+        }
+    }
+
+    private data class OracleTask(val uid: UUID, val dependencies: Set<UUID>, val flops: Long, val cores: Int, val deadline: Long)
+
+    private class OracleJob(val uid: UUID, var submitTime: Long? = null, val tasks: MutableList<OracleTask> = mutableListOf())
+
+    /**
+     * Copy of the row-by-row trace loader that [JobTable] replaced, used as the reference for the columnar reader.
+     */
+    private fun readOracleJobs(trace: Trace, submitTimeLimit: Instant): Map<UUID, OracleJob> {
+        val reader = checkNotNull(trace.getTable(TABLE_TASKS)).newReader()
+        val jobs = mutableMapOf<UUID, OracleJob>()
+
+        try {
+            while (reader.nextRow()) {
+                // Bag of tasks without workflow ID all share the same workflow
+                val workflowId = if (reader.resolve(TASK_WORKFLOW_ID) != -1) reader.getString(TASK_WORKFLOW_ID)!!.toLong() else 0L
+                val job = jobs.computeIfAbsent(UUID(0L, workflowId)) { OracleJob(it) }
+
+                val id = reader.getString(TASK_ID)!!.toLong()
+                val grantedCpus = if (reader.resolve(TASK_ALLOC_NCPUS) != -1) {
+                    reader.getInt(TASK_ALLOC_NCPUS)
+                } else {
+                    reader.getInt(TASK_REQ_NCPUS)
+                }
+                val submitTime = reader.getInstant(TASK_SUBMIT_TIME)!!
+                if (submitTime > submitTimeLimit) {
+                    continue
+                }
+                val runtime = reader.getDuration(TASK_RUNTIME)!!
+                val parents = reader.getSet(TASK_PARENTS, String::class.java)!!.map { UUID(0L, it.toLong()) }.toSet()
+
+                job.tasks.add(OracleTask(UUID(0L, id), parents, 4000 * runtime.seconds * grantedCpus, grantedCpus, runtime.toMillis()))
+                job.submitTime = min(job.submitTime ?: Long.MAX_VALUE, submitTime.toEpochMilli())
+            }
+        } finally {
+            reader.close()
+        }
+
+        return jobs
+    }
+}
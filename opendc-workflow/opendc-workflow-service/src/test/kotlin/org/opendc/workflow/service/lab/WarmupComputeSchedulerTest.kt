@@ -0,0 +1,73 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab
+
+import io.mockk.every
+import io.mockk.mockk
+import io.mockk.verify
+import org.junit.jupiter.api.Assertions.assertSame
+import org.junit.jupiter.api.Test
+import org.opendc.compute.api.Server
+import org.opendc.compute.service.internal.HostView
+import org.opendc.compute.service.scheduler.ComputeScheduler
+import java.time.Clock
+
+/**
+ * Test suite for the [WarmupComputeScheduler].
+ */
+class WarmupComputeSchedulerTest {
+    @Test
+    fun testSwitchAfterWarmup() {
+        val clock = mockk<Clock>()
+        val server = mockk<Server>()
+        val warmupHost = mockk<HostView>()
+        val host = mockk<HostView>()
+        val warmup = mockk<ComputeScheduler> { every { select(server) } returns warmupHost }
+        val scheduler = mockk<ComputeScheduler> { every { select(server) } returns host }
+        val switching = WarmupComputeScheduler(warmup, scheduler, clock, 1000)
+
+        // The warm-up starts at the first selection
+        every { clock.millis() } returns 5000
+        assertSame(warmupHost, switching.select(server))
+        every { clock.millis() } returns 5999
+        assertSame(warmupHost, switching.select(server))
+        every { clock.millis() } returns 6000
+        assertSame(host, switching.select(server))
+    }
+
+    @Test
+    fun testHostsTrackedByBoth() {
+        val warmup = mockk<ComputeScheduler>(relaxUnitFun = true)
+        val scheduler = mockk<ComputeScheduler>(relaxUnitFun = true)
+        val host = mockk<HostView>()
+        val switching = WarmupComputeScheduler(warmup, scheduler, mockk(), 1000)
+
+        switching.addHost(host)
+        switching.removeHost(host)
+
+        verify { warmup.addHost(host) }
+        verify { scheduler.addHost(host) }
+        verify { warmup.removeHost(host) }
+        verify { scheduler.removeHost(host) }
+    }
+}
@@ -0,0 +1,78 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.cache
+
+import org.junit.jupiter.api.Assertions.assertArrayEquals
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertSame
+import org.junit.jupiter.api.Assertions.assertTrue
+import org.junit.jupiter.api.Test
+import org.junit.jupiter.api.io.TempDir
+import org.opendc.trace.Trace
+import org.opendc.workflow.service.WorkflowServiceTest
+import org.opendc.workflow.service.lab.JobTable
+import java.nio.file.Path
+import java.nio.file.Paths
+import kotlin.io.path.exists
+
+/**
+ * Test suite for the [TraceCache].
+ */
+class TraceCacheTest {
+    private val trace = Paths.get(checkNotNull(WorkflowServiceTest::class.java.getResource("/askalon_ee.gwf")).toURI())
+
+    @Test
+    fun testCompile(@TempDir path: Path) {
+        val cache = TraceCache(path)
+        val table = cache.load(trace, "gwf")
+
+        assertTrue(cache.pathOf(TraceCache.hash(trace, "gwf")).exists())
+        assertSame(table, cache.load(trace, "gwf"))
+        assertSameTable(JobTable.read(Trace.open(trace, format = "gwf")), table)
+    }
+
+    @Test
+    fun testReadCompiled(@TempDir path: Path) {
+        val expected = TraceCache(path).load(trace, "gwf")
+        val actual = TraceCache(path).load(trace, "gwf")
+
+        assertSameTable(expected, actual)
+    }
+
+    @Test
+    fun testHashFormat() {
+        assertTrue(TraceCache.hash(trace, "gwf") != TraceCache.hash(trace, "wtf"))
+    }
+
+    private fun assertSameTable(expected: JobTable, actual: JobTable) {
+        assertEquals(expected.size, actual.size)
+        assertArrayEquals(expected.jobIds, actual.jobIds)
+        assertArrayEquals(expected.submitTimes, actual.submitTimes)
+        assertArrayEquals(expected.taskOffsets, actual.taskOffsets)
+        assertArrayEquals(expected.taskIds, actual.taskIds)
+        assertArrayEquals(expected.taskCpus, actual.taskCpus)
+        assertArrayEquals(expected.taskRuntimes, actual.taskRuntimes)
+        assertArrayEquals(expected.parentOffsets, actual.parentOffsets)
+        assertArrayEquals(expected.parents, actual.parents)
+    }
+}
@@ -0,0 +1,154 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+package org.opendc.workflow.service.lab.query
+
+import io.mockk.every
+import io.mockk.mockk
+import org.junit.jupiter.api.Assertions.assertAll
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertFalse
+import org.junit.jupiter.api.Assertions.assertTrue
+import org.junit.jupiter.api.Test
+import org.junit.jupiter.api.io.TempDir
+import org.opendc.experiments.compute.export.parquet.ParquetComputeMonitor
+import org.opendc.experiments.compute.telemetry.table.ServiceTableReader
+import org.opendc.workflow.service.lab.sweep.SweepManifest
+import java.nio.file.Path
+import java.sql.ResultSet
+import java.time.Instant
+
+/**
+ * Test suite for the [LabResultsTraceFormat].
+ */
+class LabResultsTraceFormatTest {
+    @Test
+    fun testAggregate(@TempDir path: Path) {
+        writeResults(path)
+
+        val sql = """
+            SELECT scheduler, SUM(attempts_success) AS attempts
+            FROM service_counters
+            GROUP BY scheduler
+            ORDER BY scheduler
+        """.trimIndent()
+
+        query(path, sql) { rs ->
+            assertAll(
+                { assertTrue(rs.next()) },
+                { assertEquals("naive", rs.getString("scheduler")) },
+                { assertEquals(3, rs.getInt("attempts")) },
+                { assertTrue(rs.next()) },
+                { assertEquals("random", rs.getString("scheduler")) },
+                { assertEquals(5, rs.getInt("attempts")) },
+                { assertFalse(rs.next()) }
+            )
+        }
+    }
+
+    @Test
+    fun testPartitionFilter(@TempDir path: Path) {
+        writeResults(path)
+
+        query(path, "SELECT COUNT(*) AS samples FROM service_counters WHERE scheduler = 'naive' AND seed = 0") { rs ->
+            assertAll(
+                { assertTrue(rs.next()) },
+                { assertEquals(2, rs.getInt("samples")) }
+            )
+        }
+    }
+
+    @Test
+    fun testPartitionReader(@TempDir path: Path) {
+        writeResults(path)
+
+        val format = LabResultsTraceFormat()
+        val reader = format.newReader(
+            path,
+            LabResultsTraceFormat.TABLE_SERVICE_COUNTERS,
+            listOf("attempts_success"),
+            mapOf("scheduler" to "random")
+        )
+
+        reader.use {
+            assertAll(
+                { assertTrue(reader.nextRow()) },
+                { assertEquals("random", reader.getString(reader.resolve("scheduler"))) },
+                { assertEquals("default", reader.getString(reader.resolve("policies"))) },
+                { assertEquals(0L, reader.getLong(reader.resolve("seed"))) },
+                { assertEquals(5, reader.getInt(reader.resolve("attempts_success"))) },
+                { assertFalse(reader.nextRow()) }
+            )
+        }
+    }
+
+    @Test
+    fun testScenarios(@TempDir path: Path) {
+        writeResults(path)
+
+        query(path, "SELECT trace, topology, repeat FROM scenarios WHERE scheduler = 'random'") { rs ->
+            assertAll(
+                { assertTrue(rs.next()) },
+                { assertEquals("askalon_ee", rs.getString("trace")) },
+                { assertEquals("heterogeneous", rs.getString("topology")) },
+                { assertEquals(0, rs.getInt("repeat")) },
+                { assertFalse(rs.next()) }
+            )
+        }
+    }
+
+    /**
+     * Write the columnar output and manifest of two runs to the results directory at [path].
+     */
+    private fun writeResults(path: Path) {
+        val runs = mapOf("naive" to listOf(1, 2), "random" to listOf(5))
+        val manifest = SweepManifest(path.resolve("manifest.csv").toFile())
+
+        for ((scheduler, attempts) in runs) {
+            val partition = "trace=askalon_ee/scheduler=$scheduler/topology=heterogeneous/seed=0"
+            ParquetComputeMonitor(path.toFile(), partition, bufferSize = 16).use { monitor ->
+                for ((i, value) in attempts.withIndex()) {
+                    monitor.record(serviceSample(i * 60_000L, value))
+                }
+            }
+
+            val file = "askalon_ee/$scheduler/heterogeneous.csv"
+            manifest.record(
+                SweepManifest.Entry(scheduler, "askalon_ee", scheduler, "heterogeneous", "default", 0, 0, file, 0)
+            )
+        }
+    }
+
+    private fun serviceSample(timestamp: Long, attemptsSuccess: Int): ServiceTableReader {
+        val reader = mockk<ServiceTableReader>(relaxed = true)
+        every { reader.timestamp } returns Instant.ofEpochMilli(timestamp)
+        every { reader.attemptsSuccess } returns attemptsSuccess
+        return reader
+    }
+
+    private fun query(path: Path, query: String, block: (ResultSet) -> Unit) {
+        openLabResults(path.toFile()).use { connection ->
+            connection.createStatement().use { stmt ->
+                stmt.executeQuery(query).use(block)
+            }
+        }
+    }
+}
@@ -0,0 +1,79 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import com.fasterxml.jackson.databind.ObjectMapper
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Assertions.assertTrue
+import org.junit.jupiter.api.Test
+import org.junit.jupiter.api.io.TempDir
+import org.opendc.workflow.service.internal.SchedulingCycle
+import java.io.File
+
+/**
+ * Test suite for the [Profiler] and its [LatencyHistogram]s.
+ */
+class ProfilerTest {
+    @Test
+    fun testHistogramQuantiles() {
+        val histogram = LatencyHistogram()
+        for (i in 1..100L) {
+            histogram.record(i * 1000)
+        }
+
+        assertEquals(100L, histogram.count)
+        assertEquals(5_050_000L, histogram.total)
+        assertEquals(100_000L, histogram.max)
+        // The quantiles are the upper bounds of their power-of-two bucket
+        assertEquals(65_535L, histogram.quantile(0.5))
+        assertEquals(100_000L, histogram.quantile(0.99))
+    }
+
+    @Test
+    fun testEmptyHistogram() {
+        assertEquals(0L, LatencyHistogram().quantile(0.5))
+    }
+
+    @Test
+    fun testProfile(@TempDir directory: File) {
+        val profiler = Profiler(File(directory, "topology.csv"))
+        profiler.phase("load") { Thread.sleep(1) }
+        profiler.recordSelect(100, placed = true)
+        profiler.recordSelect(200, placed = false)
+        profiler.cycleFinished(SchedulingCycle(0, 1_000, 2, 1, 4, 3))
+        profiler.cycleFinished(SchedulingCycle(60_000, 2_000, 1, 1, 2, 2))
+        profiler.close()
+
+        val lines = File(directory, "topology.profile").readLines()
+        assertEquals(Profiler.HEADER.trimEnd(), lines[0])
+        assertEquals(3, lines.size)
+        assertEquals(listOf("60000", "2000", "1", "1", "2", "2", "1", "300", "0"), lines[2].split(';').let { it.take(1) + it.drop(2) })
+
+        val summary = ObjectMapper().readTree(File(directory, "topology.profile.json"))
+        assertEquals(60_000L, summary["simulatedMillis"].asLong())
+        assertEquals(2L, summary["counters"]["cycles"].asLong())
+        assertEquals(5L, summary["counters"]["tasksDispatched"].asLong())
+        assertEquals(4, summary["queues"]["maxIncomingTasks"].asInt())
+        assertTrue(summary["phases"]["load"].asLong() >= 1_000_000)
+    }
+}
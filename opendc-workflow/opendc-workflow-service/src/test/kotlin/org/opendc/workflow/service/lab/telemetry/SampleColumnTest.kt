@@ -0,0 +1,92 @@
+/*
+ * Copyright (c) 2022 AtLarge Research
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining a copy
+ * of this software and associated documentation files (the "Software"), to deal
+ * in the Software without restriction, including without limitation the rights
+ * to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ * copies of the Software, and to permit persons to whom the Software is
+ * furnished to do so, subject to the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be included in all
+ * copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ * IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ * FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ * AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ * LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ * OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+ * SOFTWARE.
+ */
+
+package org.opendc.workflow.service.lab.telemetry
+
+import org.junit.jupiter.api.Assertions.assertEquals
+import org.junit.jupiter.api.Test
+import org.junit.jupiter.api.assertThrows
+import org.junit.jupiter.api.io.TempDir
+import java.io.File
+
+/**
+ * Test suite for the [SampleColumn] implementations.
+ */
+class SampleColumnTest {
+    @Test
+    fun testInvalidChunkSize() {
+        assertThrows<IllegalArgumentException> { DoubleColumn(chunkSize = 0) }
+    }
+
+    @Test
+    fun testEmpty() {
+        val column = IntColumn()
+
+        assertEquals(0L, column.size)
+        assertEquals(listOf<Int>().toString(), column.toString())
+    }
+
+    @Test
+    fun testInMemory() {
+        val column = DoubleColumn(chunkSize = 4)
+        val expected = List(10) { it * 1.5 }
+
+        for (value in expected) {
+            column += value
+        }
+
+        assertEquals(10L, column.size)
+        assertEquals(expected.toString(), column.toString())
+    }
+
+    @Test
+    fun testSpill(@TempDir dir: File) {
+        val column = LongColumn(chunkSize = 4, spillDirectory = dir)
+        val expected = List(10) { it * 1000L }
+
+        for (value in expected) {
+            column += value
+        }
+
+        assertEquals(1, dir.listFiles()!!.size) { "Full chunks should be spilled to a single file" }
+        assertEquals(10L, column.size)
+        assertEquals(expected.toString(), column.toString())
+        assertEquals(expected.toString(), column.toString()) { "Column should be readable more than once" }
+
+        column.clear()
+
+        assertEquals(0, dir.listFiles()!!.size) { "Spilled chunks should be deleted" }
+        assertEquals(0L, column.size)
+    }
+
+    @Test
+    fun testExactChunk(@TempDir dir: File) {
+        val column = IntColumn(chunkSize = 5, spillDirectory = dir)
+        val expected = List(10) { it }
+
+        for (value in expected) {
+            column.add(value)
+        }
+
+        assertEquals(expected.toString(), column.toString())
+    }
+}
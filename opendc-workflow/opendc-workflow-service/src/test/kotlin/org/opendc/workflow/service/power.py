@@ -0,0 +1,257 @@
+"""
+Offline re-evaluation of the power draw of a lab run under other power models.
+
+The families of `org.opendc.simulator.compute.power.CpuPowerModels` are mirrored
+as `PowerModel`s that map a utilization array (0-1) to a power draw in W. Their
+parameters are broadcast against the utilization, so a parameter may be a
+scalar, an array per host (e.g. derived from the `hostSpecs` of the topology)
+or an array with leading variant axes, such as `linear(np.linspace(250, 450,
+200)[:, None, None], 200)` to evaluate 200 variants over a (time x host) matrix
+at once.
+
+The energy of a sample is the power at its utilization times the export
+interval. The recorded `cpuUtilization` is sampled at the end of an interval,
+whereas the recorded energy is integrated over it. As the topologies of
+LabRunner draw power linearly in the utilization, the mean utilization of every
+interval is recovered exactly from the recorded energy instead (see
+`loadUtilization`). Non-linear models are then evaluated at the mean, which
+ignores the variation within an interval.
+"""
+import argparse
+import csv
+import uuid
+
+import numpy as np
+
+from results import HOST_KEYS, getData, hostMatrices
+
+
+class PowerModel:
+    """A vectorized CPU power model: `model(utilization)` returns the power draw in W."""
+
+    def __init__(self, name, fn, **params):
+        self.name = name
+        self.fn = fn
+        self.params = params
+
+    def __call__(self, utilization):
+        return self.fn(np.asarray(utilization, dtype=float))
+
+    def __repr__(self):
+        return f"{self.name}[{','.join(f'{key}={value}' for key, value in self.params.items())}]"
+
+
+def constant(power):
+    """The power draw `power` at all times."""
+    return PowerModel('ConstantPowerModel', lambda u: np.zeros_like(u) + power, power=power)
+
+
+def sqrt(maxPower, idlePower):
+    """The square root model adapted from CloudSim."""
+    factor = (np.asarray(maxPower) - idlePower) / np.sqrt(100)
+    return PowerModel('SqrtPowerModel', lambda u: idlePower + factor * np.sqrt(u * 100), max=maxPower, idle=idlePower)
+
+
+def linear(maxPower, idlePower):
+    """The linear model adapted from CloudSim."""
+    factor = (np.asarray(maxPower) - idlePower) / 100
+    return PowerModel('LinearPowerModel', lambda u: idlePower + factor * u * 100, max=maxPower, idle=idlePower)
+
+
+def square(maxPower, idlePower):
+    """The square model adapted from CloudSim."""
+    factor = (np.asarray(maxPower) - idlePower) / 100 ** 2
+    return PowerModel('SquarePowerModel', lambda u: idlePower + factor * (u * 100) ** 2, max=maxPower, idle=idlePower)
+
+
+def cubic(maxPower, idlePower):
+    """The cubic model adapted from CloudSim."""
+    factor = (np.asarray(maxPower) - idlePower) / 100 ** 3
+    return PowerModel('CubicPowerModel', lambda u: idlePower + factor * (u * 100) ** 3, max=maxPower, idle=idlePower)
+
+
+def mse(maxPower, idlePower, calibrationFactor):
+    """The model of Fan et al. that is tuned to the measured power draw by `calibrationFactor`."""
+    factor = (np.asarray(maxPower) - idlePower) / 100
+    return PowerModel('MsePowerModel', lambda u: idlePower + factor * (2 * u - u ** calibrationFactor) * 100,
+                      max=maxPower, idle=idlePower, calibrationFactor=calibrationFactor)
+
+
+def asymptotic(maxPower, idlePower, asymUtil, dvfs):
+    """The asymptotic model adapted from GreenCloud, which is close to linear above `asymUtil`."""
+    half = (np.asarray(maxPower) - idlePower) / 2
+
+    def fn(u):
+        if dvfs:
+            return idlePower + half * (1 + u ** 3 - np.exp(-u ** 3 / asymUtil))
+        return idlePower + half * (1 + u - np.exp(-u / asymUtil))
+
+    return PowerModel('AsymptoticPowerModel', fn, max=maxPower, idle=idlePower, asymUtil=asymUtil, dvfs=dvfs)
+
+
+def interpolate(*powerLevels):
+    """
+    The linear interpolation over the power draw at 0%, 10%, ..., 100%
+    utilization, e.g. from the SPEC power benchmark. The levels may also be
+    given as one (host x 11) array, for a curve per host.
+    """
+    levels = np.asarray(powerLevels[0] if len(powerLevels) == 1 else powerLevels, dtype=float)
+
+    def fn(u):
+        scaled = np.clip(u, 0.0, 1.0) * 10
+        lo = np.minimum(np.floor(scaled).astype(np.int64), 9)
+        if levels.ndim == 1:
+            low, high = levels[lo], levels[lo + 1]
+        else:
+            hosts = np.arange(levels.shape[0])
+            low, high = levels[hosts, lo], levels[hosts, lo + 1]
+        return low + (high - low) * (scaled - lo)
+
+    return PowerModel('InterpolationPowerModel', fn, levels=levels.tolist())
+
+
+def zeroIdle(delegate):
+    """Decorate `delegate` such that a host without utilization draws no power."""
+    return PowerModel('ZeroIdlePowerDecorator', lambda u: np.where(u == 0.0, 0.0, delegate(u)), delegate=delegate)
+
+
+# The power model of the topologies of LabRunner (see `clusterTopology`).
+DEFAULT_MODEL = linear(350.0, 200.0)
+
+
+###########################################################################
+# Hosts of a topology.                                                    #
+###########################################################################
+
+def javaRandomLongs(seed, n):
+    """Return the first `n` values of `java.util.Random(seed).nextLong()`."""
+    mask = (1 << 48) - 1
+    state = (seed ^ 0x5DEECE66D) & mask
+
+    def next32():
+        nonlocal state
+        state = (state * 0x5DEECE66D + 0xB) & mask
+        bits = state >> 16
+        return bits - (1 << 32) if bits >= 1 << 31 else bits
+
+    values = []
+    for _ in range(n):
+        value = (next32() << 32) + next32()
+        values.append((value + (1 << 63)) % (1 << 64) - (1 << 63))
+    return values
+
+
+def hostSpecs(path, hostIds=None, seed=0):
+    """
+    Return the specs of the hosts of the topology file at `path` (see
+    `env/*.txt`) as arrays with an entry per host: 'id', 'cluster', 'cores',
+    'speed' (MHz) and 'memory' (MiB). The hosts are ordered like the columns of
+    the host matrices of a result file if its `hostIds` are given, and in the
+    order in which `clusterTopology` creates them with `seed` otherwise.
+    """
+    with open(path, newline='') as f:
+        clusters = [row for row in csv.DictReader((line for line in f if not line.startswith('#')), delimiter=';')]
+
+    counts = [int(c['numberOfHosts']) for c in clusters]
+    msbs = javaRandomLongs(seed, sum(counts))
+    specs = {
+        'id': np.array([str(uuid.UUID(int=((msb % (1 << 64)) << 64) | i)) for msb, i in zip(msbs, (i for n in counts for i in range(n)))]),
+        'cluster': np.repeat([c['ClusterID'] for c in clusters], counts),
+        'cores': np.repeat([int(c['coreCountPerHost']) for c in clusters], counts),
+        'speed': np.repeat([float(c['Speed']) * 1000 for c in clusters], counts),
+        'memory': np.repeat([float(c['memoryCapacityPerHost']) * 1000 for c in clusters], counts),
+    }
+    if hostIds is None:
+        return specs
+
+    order = {hostId: i for i, hostId in enumerate(specs['id'])}
+    try:
+        index = np.array([order[hostId] for hostId in hostIds], dtype=np.int64)
+    except KeyError as e:
+        raise ValueError(f'Host {e.args[0]} is not part of the topology at {path}') from None
+    return {key: values[index] for key, values in specs.items()}
+
+
+###########################################################################
+# Re-evaluation of result files.                                          #
+###########################################################################
+
+def loadUtilization(path, source='energy', model=DEFAULT_MODEL):
+    """
+    Load the per-host CPU utilization of a result file as its timestamps (ms),
+    the export interval of every row (s), the (time x host) utilization matrix
+    and the host ids of its columns (or `None` for files without host ids).
+
+    With `source='energy'`, the utilization is the mean of every interval,
+    derived from the recorded energy under the linear `model` the run used;
+    with `source='samples'`, it is the recorded `cpuUtilization`.
+    """
+    metric = 'energyUsage' if source == 'energy' else 'cpuUtilization'
+    data = getData(path, [metric, 'hostId', *HOST_KEYS])
+    times, matrices = hostMatrices(data, [metric])
+    if 'hostIndex' in data:
+        steps = np.diff(times, prepend=times[0] - (np.median(np.diff(times)) if len(times) > 1 else 0)) / 1000
+    else:
+        # Without timestamps, the rows are cycles of the default export interval
+        steps = np.full(len(times), 300.0)
+    hostIds = data['hostId'][0] if 'hostId' in data else None
+
+    utilization = matrices[metric]
+    if source == 'energy':
+        idle, full = model(0.0), model(1.0)
+        utilization = np.clip((utilization / steps[:, None] - idle) / (full - idle), 0.0, 1.0)
+    return times, steps, utilization, hostIds
+
+
+def energyOf(model, utilization, steps):
+    """
+    Return the energy (J) that every host draws in every row of the (time x
+    host) `utilization` matrix under `model`, where row i lasts `steps[i]`
+    seconds. Hosts without a sample in a row draw no energy.
+    """
+    power = model(np.nan_to_num(utilization))
+    return np.where(np.isnan(utilization), 0.0, power * np.asarray(steps)[:, None])
+
+
+def reevaluate(path, *models, source='energy'):
+    """
+    Return the cluster energy series (Wh per row, as drawn by the figures) of
+    the result file at `path` under each of `models`, from the utilization of
+    `source` (see `loadUtilization`). Models with variant axes give a series
+    per variant.
+    """
+    _, steps, utilization, _ = loadUtilization(path, source)
+    return [energyOf(model, utilization, steps).sum(axis=-1) / 3600 for model in models]
+
+
+def energyTotals(path, *models, source='energy'):
+    """Return the total energy (Wh) of the result file at `path` under each of `models`."""
+    return [series.sum(axis=-1) for series in reevaluate(path, *models, source=source)]
+
+
+MODELS = {
+    'constant': constant,
+    'sqrt': sqrt,
+    'linear': linear,
+    'square': square,
+    'cubic': cubic,
+    'mse': mse,
+    'asymptotic': asymptotic,
+    'interpolate': interpolate,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-evaluate the energy usage of a result file under other power models.")
+    parser.add_argument('result', help="the result file written by LabRunner")
+    parser.add_argument('--model', nargs='+', action='append', metavar='ARG',
+                        help="a power model as its family and parameters, e.g. --model square 350 200 (repeatable)")
+    parser.add_argument('--source', choices=['energy', 'samples'], default='energy',
+                        help="derive the utilization from the recorded energy or use the recorded samples")
+    args = parser.parse_args()
+
+    models = [DEFAULT_MODEL]
+    for family, *params in args.model or []:
+        models.append(MODELS[family](*(float(p) for p in params)))
+    for model, total in zip(models, energyTotals(args.result, *models, source=args.source)):
+        print(f'{model!r}: {float(total):.1f} Wh')
@@ -0,0 +1,219 @@
+"""
+Windowed reductions over time series.
+
+Every function reduces along the last axis, so it applies equally to a single
+series and to a (scenario x time) array of series of equal length, except for
+the decimation functions, which take a single series. All of them run in linear
+time in the length of the series, independent of the window, except for
+`movingPercentile`, which sorts every window.
+
+Windowed functions take a `mode`:
+
+ - 'valid': only full windows, so the result is `n - 1` samples shorter;
+ - 'trailing': the window ends at each sample, partial at the start;
+ - 'centered': the window is centered on each sample, partial at both ends.
+"""
+import numpy as np
+
+
+def blocks(a, n, fill=np.nan):
+    """
+    Return `a` reshaped into consecutive blocks of `n` samples, of shape
+    (..., ceil(t / n), n). The last block is padded with `fill`.
+    """
+    a = np.asarray(a, dtype=float)
+    if n < 1:
+        raise ValueError(f'Block size must be positive, got {n}')
+    t = a.shape[-1]
+    count = -(-t // n)
+    if count * n != t:
+        padding = np.full(a.shape[:-1] + (count * n - t,), fill)
+        a = np.concatenate([a, padding], axis=-1)
+    return a.reshape(a.shape[:-1] + (count, n))
+
+
+def blockAverage(a, n):
+    """Return the mean of every block of `n` samples, including the partial last block."""
+    return np.nanmean(blocks(a, n), axis=-1)
+
+
+def blockMin(a, n):
+    """Return the minimum of every block of `n` samples."""
+    return np.min(blocks(a, n, fill=np.inf), axis=-1)
+
+
+def blockMax(a, n):
+    """Return the maximum of every block of `n` samples."""
+    return np.max(blocks(a, n, fill=-np.inf), axis=-1)
+
+
+def blockPercentile(a, n, q):
+    """Return the `q`-th percentile of every block of `n` samples."""
+    return np.nanpercentile(blocks(a, n), q, axis=-1)
+
+
+def staircase(values, n, length):
+    """Expand the per-block `values` into a series of `length` samples that is constant per block."""
+    return np.repeat(values, n, axis=-1)[..., :length]
+
+
+def staircaseAverage(a, n):
+    """Return the series in which every sample is replaced by the mean of its block of `n` samples."""
+    return staircase(blockAverage(a, n), n, np.shape(a)[-1])
+
+
+def padding(n, mode):
+    """Return the number of samples before and after each sample covered by a window of `n` in `mode`."""
+    if n < 1:
+        raise ValueError(f'Window size must be positive, got {n}')
+    if mode == 'valid':
+        return 0, 0
+    elif mode == 'trailing':
+        return n - 1, 0
+    elif mode == 'centered':
+        return (n - 1) // 2, n // 2
+    raise ValueError(f'Unknown window mode {mode!r}')
+
+
+def pad(a, n, mode, fill):
+    before, after = padding(n, mode)
+    widths = [(0, 0)] * (a.ndim - 1) + [(before, after)]
+    return np.pad(a, widths, constant_values=fill)
+
+
+def movingAverage(a, n, mode='trailing'):
+    """Return the mean over a moving window of `n` samples. Partial windows average fewer samples."""
+    a = np.asarray(a, dtype=float)
+    padded = pad(a, n, mode, 0.0)
+    counts = pad(np.ones(a.shape[-1]), n, mode, 0.0)
+
+    def windowSums(x):
+        sums = np.cumsum(x, axis=-1)
+        sums[..., n:] = sums[..., n:] - sums[..., :-n]
+        return sums[..., n - 1:]
+
+    return windowSums(padded) / windowSums(counts)
+
+
+def movingExtreme(a, n, mode, extreme, fill):
+    """
+    Return the extreme over a moving window of `n` samples via the van Herk/Gil-Werman
+    algorithm: the extreme of a window is that of the suffix of the block in which
+    it starts and the prefix of the block in which it ends.
+    """
+    a = np.asarray(a, dtype=float)
+    padded = pad(a, n, mode, fill)
+    t = padded.shape[-1]
+    grouped = blocks(padded, n, fill=fill)
+    prefix = extreme.accumulate(grouped, axis=-1).reshape(grouped.shape[:-2] + (-1,))[..., :t]
+    suffix = np.flip(extreme.accumulate(np.flip(grouped, axis=-1), axis=-1), axis=-1).reshape(grouped.shape[:-2] + (-1,))[..., :t]
+    return extreme(suffix[..., :t - n + 1], prefix[..., n - 1:])
+
+
+def movingMin(a, n, mode='trailing'):
+    """Return the minimum over a moving window of `n` samples."""
+    return movingExtreme(a, n, mode, np.minimum, np.inf)
+
+
+def movingMax(a, n, mode='trailing'):
+    """Return the maximum over a moving window of `n` samples."""
+    return movingExtreme(a, n, mode, np.maximum, -np.inf)
+
+
+def movingPercentile(a, n, q, mode='trailing', chunk=1 << 20):
+    """
+    Return the `q`-th percentile over a moving window of `n` samples. Partial
+    windows take the percentile of fewer samples. The windows are evaluated in
+    batches of about `chunk` samples, to bound the memory of the sorted copies.
+    """
+    a = np.asarray(a, dtype=float)
+    windows = np.lib.stride_tricks.sliding_window_view(pad(a, n, mode, np.nan), n, axis=-1)
+    t = windows.shape[-2]
+    step = max(1, chunk // n)
+    result = np.empty(windows.shape[:-1])
+    for start in range(0, t, step):
+        result[..., start:start + step] = np.nanpercentile(windows[..., start:start + step, :], q, axis=-1)
+    return result
+
+
+def ewma(a, alpha):
+    """
+    Return the exponentially weighted moving average `y[t] = alpha * a[t] + (1 - alpha) * y[t - 1]`
+    starting from `y[0] = a[0]`.
+
+    The recurrence is evaluated in closed form per segment, with segments short enough
+    for the weights `(1 - alpha) ** -t` to stay below 1e150, so the number of segments
+    is proportional to the length of the series times `-log(1 - alpha)`. The values of
+    a segment are scaled by their largest magnitude before they are weighted, such
+    that the weighted sums stay finite for inputs of any magnitude.
+    """
+    a = np.asarray(a, dtype=float)
+    if not 0 < alpha <= 1:
+        raise ValueError(f'Smoothing factor must be in (0, 1], got {alpha}')
+    if alpha == 1 or a.shape[-1] == 0:
+        return a.copy()
+
+    decay = 1 - alpha
+    segment = max(1, int(150 / -np.log10(decay)))
+    weights = decay ** -np.arange(min(segment, a.shape[-1]), dtype=float)
+    result = np.empty_like(a)
+    previous = a[..., 0]
+    for start in range(0, a.shape[-1], segment):
+        x = a[..., start:start + segment]
+        w = weights[:x.shape[-1]]
+        magnitude = np.max(np.abs(np.nan_to_num(x)), axis=-1, keepdims=True)
+        magnitude[magnitude == 0] = 1
+        weighted = magnitude * (np.cumsum(x / magnitude * w, axis=-1) / w)
+        result[..., start:start + segment] = decay * previous[..., None] / w + alpha * weighted
+        previous = result[..., start + x.shape[-1] - 1]
+    return result
+
+
+def minMaxDecimate(a, buckets):
+    """
+    Reduce the series `a` to the minimum and maximum of each of `buckets` equally
+    sized buckets, in order of occurrence. Returns the indices and values of the
+    retained samples, so the extremes of the series are preserved exactly.
+    """
+    a = np.asarray(a, dtype=float)
+    t = a.shape[-1]
+    if t <= 2 * buckets:
+        return np.arange(t), a
+
+    n = -(-t // buckets)
+    grouped = blocks(a, n)
+    missing = np.isnan(grouped)
+    lo = np.where(missing, np.inf, grouped).argmin(axis=-1)
+    hi = np.where(missing, -np.inf, grouped).argmax(axis=-1)
+    offsets = np.arange(grouped.shape[-2]) * n
+    indices = np.sort(np.stack([lo, hi], axis=-1), axis=-1) + offsets[:, None]
+    indices = np.minimum(indices.reshape(-1), t - 1)
+    return indices, a[indices]
+
+
+def lttb(a, buckets):
+    """
+    Reduce the series `a` to `buckets + 2` samples with the Largest-Triangle-Three-Buckets
+    algorithm, which retains the samples that span the largest triangle with the neighbouring
+    buckets. Returns the indices and values of the retained samples.
+    """
+    a = np.asarray(a, dtype=float)
+    t = a.shape[-1]
+    if t <= buckets + 2:
+        return np.arange(t), a
+
+    edges = np.linspace(1, t - 1, buckets + 1).astype(int)
+    indices = np.empty(buckets + 2, dtype=int)
+    indices[0], indices[-1] = 0, t - 1
+    for i in range(buckets):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < buckets:
+            nextX = (edges[i + 1] + edges[i + 2] - 1) / 2
+            nextY = a[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            nextX, nextY = t - 1, a[t - 1]
+        prevX, prevY = indices[i], a[indices[i]]
+        x = np.arange(start, end)
+        area = np.abs((prevX - nextX) * (a[start:end] - prevY) - (prevX - x) * (nextY - prevY))
+        indices[i + 1] = start + np.argmax(area)
+    return indices, a[indices]
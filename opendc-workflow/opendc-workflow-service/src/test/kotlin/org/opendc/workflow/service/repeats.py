@@ -0,0 +1,60 @@
+"""
+Aggregation of the repeats (seeds) of a scenario.
+
+The series of N repeats are stacked into (repeat x time) arrays, padded with NaN
+where a run is shorter than the longest one, and summarized with bootstrap
+confidence intervals. The bootstrap draws all resamples at once as an index
+array, so its cost does not involve a Python loop per resample or repeat.
+"""
+import numpy as np
+
+
+def stackRepeats(*series, metrics=('energy', 'cpuUtil', 'activeJobs')):
+    """
+    Stack the loaded series of the repeats of a scenario. Returns the (repeat x
+    time) array of every metric, plus the per-repeat 'energyTotal' and 'uptime'.
+    """
+    if not series:
+        raise ValueError('Cannot stack the repeats of a scenario without any loaded repeat')
+    length = max(len(s[metrics[0]]) for s in series)
+    stacked = dict()
+    for metric in metrics:
+        stacked[metric] = np.full((len(series), length), np.nan)
+        for i, s in enumerate(series):
+            stacked[metric][i, :len(s[metric])] = s[metric]
+    stacked['energyTotal'] = np.nansum(stacked['energy'], axis=1)
+    stacked['uptime'] = np.array([s['uptime'] for s in series], dtype=float)
+    return stacked
+
+
+def bootstrap(values, resamples=10000, confidence=0.95, seed=0, chunk=1 << 24):
+    """
+    Return the mean of `values` over its first axis (the repeats) and the
+    percentile bootstrap confidence interval of that mean, as (mean, low, high).
+    The resamples are drawn in chunks of at most `chunk` elements.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    mean = np.nanmean(values, axis=0)
+    if n < 2:
+        return mean, mean, mean
+
+    rng = np.random.default_rng(seed)
+    width = max(1, values[0].size)
+    step = max(1, chunk // (n * width))
+    means = np.empty((resamples,) + values.shape[1:])
+    for start in range(0, resamples, step):
+        indices = rng.integers(0, n, size=(min(step, resamples - start), n))
+        means[start:start + len(indices)] = np.nanmean(values[indices], axis=1)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(means, [alpha, 1 - alpha], axis=0)
+    return mean, low, high
+
+
+def summarizeRepeats(stacked, metrics=('energyTotal', 'uptime'), resamples=10000, confidence=0.95, seed=0):
+    """Return the number of repeats and the (mean, low, high) bootstrap interval of every per-repeat metric."""
+    summary = {'repeats': len(stacked[metrics[0]])}
+    for metric in metrics:
+        summary[metric] = tuple(float(v) for v in bootstrap(stacked[metric], resamples, confidence, seed))
+    return summary
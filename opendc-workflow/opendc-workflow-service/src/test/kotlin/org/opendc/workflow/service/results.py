@@ -0,0 +1,395 @@
+"""
+Loaders for the results written by `LabRunner`: the summary files of
+`TestComputeMonitor` (`<trace>/<scheduler>/<topology>.csv`), the columnar
+Parquet output of `ParquetComputeMonitor` (in full or as aggregates), the
+profiles written by `Profiler` and the manifest of the runs that `LabSweep` has
+finished.
+"""
+import csv
+import functools
+import glob
+import json
+import os
+
+import numpy as np
+
+# Element types of the list-valued metrics written by TestComputeMonitor; any
+# other list-valued metric is parsed as float.
+METRIC_DTYPES = {
+    'guestsRunning': np.int64,
+    'timestamp': np.int64,
+    'hostIndex': np.int64,
+    'hostId': str,
+    'tickTimestamp': np.int64,
+}
+
+
+def parseList(value, dtype=float):
+    """Parse a Kotlin `List.toString()` blob such as `[1.0, 2.0]` into a NumPy array."""
+    if dtype is str:
+        return np.array([v.strip() for v in value[1:-1].split(',')] if len(value) > 2 else [], dtype=str)
+    return np.fromstring(value[1:-1], dtype=dtype, sep=',')
+
+
+def getData(path, metrics=None):
+    """
+    Load the metrics of a result file written by `TestComputeMonitor.toFile`.
+
+    The file is streamed line by line and list-valued metrics are parsed straight
+    into typed NumPy arrays. Scalar metrics are kept as strings. If `metrics` is
+    given, only those metrics are parsed and returned.
+    """
+    data = dict()
+    with open(path, 'r') as f:
+        next(f, None)  # Skip the header
+        for line in f:
+            content = line.split(';', 2)
+            if len(content) != 3 or ';' not in content[2]:
+                continue
+            metric = content[1].strip()
+            if metrics is not None and metric not in metrics:
+                continue
+            value, unit = content[2].rsplit(';', 1)
+            value = value.strip()
+            unit = unit.strip()
+            if value[:1] == '[' and value[-1:] == ']':
+                value = parseList(value, METRIC_DTYPES.get(metric, float))
+            data[metric] = [value, unit]
+    return data
+
+
+def columnToNumpy(column):
+    """
+    Convert a pyarrow column into a NumPy array.
+
+    Columns that consist of a single chunk are returned as views on the Arrow
+    buffers: timestamps become int64 milliseconds and fixed size binary columns
+    (such as `host_id`) become `V<width>` arrays.
+    """
+    import pyarrow as pa
+
+    if column.num_chunks != 1:
+        column = column.combine_chunks()
+    else:
+        column = column.chunk(0)
+
+    if pa.types.is_timestamp(column.type):
+        column = column.view(pa.int64())
+    if pa.types.is_fixed_size_binary(column.type):
+        width = column.type.byte_width
+        return np.frombuffer(column.buffers()[1], dtype=f'V{width}', count=len(column), offset=column.offset * width)
+    return column.to_numpy(zero_copy_only=False)
+
+
+def getColumns(path, columns=None):
+    """
+    Load the columns of a Parquet file written by `ParquetComputeMonitor`.
+
+    The file is memory-mapped and each column is returned as a NumPy array
+    (see `columnToNumpy`). If `columns` is given, only those columns are read.
+    """
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return {name: columnToNumpy(table.column(name)) for name in table.column_names}
+
+
+def getTable(base, table, columns=None, **partitions):
+    """
+    Load a `host`, `server` or `service` table from the columnar results tree
+    written by `LabRunner`, e.g. `getTable(base, 'host', trace='askalon_ee')`.
+
+    The tree is partitioned as `<base>/<table>/<key>=<value>/.../data.parquet`;
+    the keyword arguments select the partitions to read.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(f'{base}/{table}', format='parquet', partitioning='hive')
+    result = dataset.to_table(columns=columns, filter=partitionFilter(partitions))
+    return {name: columnToNumpy(result.column(name)) for name in result.column_names}
+
+
+def partitionFilter(partitions):
+    """Return the expression that selects the `partitions` of a columnar table, or `None` to select all."""
+    import pyarrow.dataset as ds
+
+    condition = None
+    for key, value in partitions.items():
+        condition = ds.field(key) == value if condition is None else condition & (ds.field(key) == value)
+    return condition
+
+
+def aggregateTable(base, table, aggregates, by=('trace', 'scheduler', 'topology'), **partitions):
+    """
+    Aggregate a table of the columnar results tree at `base` (see `getTable`)
+    per group of the columns `by`, like a `GROUP BY` query over the tables of
+    `LabResultsTraceFormat`. For instance, the total energy (J) of every
+    scenario is
+
+        aggregateTable(base, 'host', [('power_total', 'sum')])
+
+    The `aggregates` are (column, function) pairs of Arrow hash aggregations,
+    such as 'sum', 'mean', 'min', 'max' or 'count'. Only the partitions that
+    the keyword arguments select and only the columns that are grouped by or
+    aggregated are scanned, and the batches are aggregated as they are read,
+    so no table is held in memory in full. Returns an array per column of `by`
+    and per aggregate, which is named `<column>_<function>`.
+    """
+    import pyarrow.acero as ac
+    import pyarrow.dataset as ds
+
+    by = list(by)
+    dataset = ds.dataset(f'{base}/{table}', format='parquet', partitioning='hive')
+    condition = partitionFilter(partitions)
+    columns = list(dict.fromkeys([*by, *(column for column, _ in aggregates)]))
+    # The filter of the scan only prunes the partitions, so it is applied again on the rows
+    nodes = [ac.Declaration('scan', ac.ScanNodeOptions(dataset, columns=columns, filter=condition))]
+    if condition is not None:
+        nodes.append(ac.Declaration('filter', ac.FilterNodeOptions(condition)))
+    nodes.append(ac.Declaration('aggregate', ac.AggregateNodeOptions(
+        [(column, f'hash_{function}' if by else function, None, f'{column}_{function}') for column, function in aggregates],
+        keys=by)))
+    result = ac.Declaration.from_sequence(nodes).to_table()
+    if by:
+        result = result.sort_by([(key, 'ascending') for key in by])
+    return {name: columnToNumpy(result.column(name)) for name in result.column_names}
+
+
+# The columns of the per-cycle profile written by `Profiler`, in nanoseconds of
+# wall time except for the simulated timestamp (ms) and the counts.
+PROFILE_COLUMNS = ['timestamp', 'wallTime', 'cycleTime', 'incomingJobs', 'jobQueue', 'incomingTasks',
+                   'taskQueue', 'placements', 'selectTime', 'recordTime']
+
+
+def profilePath(path):
+    """Return the path of the per-cycle profile of the run whose result file is at `path`."""
+    return os.path.splitext(path)[0] + '.profile'
+
+
+def getProfile(path):
+    """
+    Load the profile of the run whose result file is at `path`, as written by
+    `Profiler` next to it: every column of the per-cycle profile as an int64
+    array, plus its summary under 'summary'. Returns `None` if the run was not
+    profiled.
+    """
+    cycles = profilePath(path)
+    if not os.path.exists(cycles):
+        return None
+    rows = np.loadtxt(cycles, dtype=np.int64, delimiter=';', skiprows=1, ndmin=2).reshape(-1, len(PROFILE_COLUMNS))
+    profile = {column: rows[:, i] for i, column in enumerate(PROFILE_COLUMNS)}
+    try:
+        with open(cycles + '.json') as f:
+            profile['summary'] = json.load(f)
+    except FileNotFoundError:
+        # The run has not finished yet
+        profile['summary'] = None
+    return profile
+
+
+# Metrics needed by `hostMatrices` to place each host sample in its row and column.
+HOST_KEYS = ['timestamp', 'hostIndex', 'hostsUp', 'hostsDown', 'tickTimestamp', 'changeThreshold']
+
+# Host metrics that accumulate over the cycles since the previous sample of a
+# host, as opposed to gauges that hold the state at the time of the sample.
+CUMULATIVE_METRICS = {'energyUsage'}
+
+# How the per-host samples of a metric are reduced into a cluster-level value per tick.
+CLUSTER_REDUCTIONS = {
+    'energyUsage': np.nansum,
+    'powerUsage': np.nansum,
+    'cpuUtilization': np.nanmean,
+    'guestsRunning': np.nansum,
+    'power_total': np.nansum,
+    'guests_running': np.nansum,
+}
+
+
+def hostMatrix(timestamps, hosts, values, fill=np.nan):
+    """
+    Arrange per-host samples into a (time x host) matrix.
+
+    `hosts` identifies the host of every sample (indices or ids). Returns the
+    sorted unique timestamps and the matrix, where missing samples are `fill`.
+    """
+    times, rows = np.unique(timestamps, return_inverse=True)
+    _, columns = np.unique(hosts, return_inverse=True)
+    matrix = np.full((len(times), columns.max(initial=-1) + 1), fill, dtype=float)
+    matrix[rows, columns] = values
+    return times, matrix
+
+
+def expandSamples(grid, timestamps, hosts, values, cumulative=False):
+    """
+    Expand the change-driven samples of a metric (see `ComputeMetricReader`)
+    into a (time x host) matrix over the cycles at the timestamps `grid`.
+
+    A host is only sampled when its state changed, so a gauge holds its value
+    until the next sample of its host, while a `cumulative` value covers the
+    cycles since the previous sample of its host and is spread evenly over
+    them. Cycles before the first sample of a host are NaN.
+    """
+    rows = np.searchsorted(grid, timestamps)
+    _, columns = np.unique(hosts, return_inverse=True)
+    order = np.lexsort((rows, columns))
+    rows, columns, values = rows[order], columns[order], np.asarray(values, dtype=float)[order]
+
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = columns[1:] != columns[:-1]
+    last = np.roll(first, -1)
+    if cumulative:
+        # A sample covers the cycles after the previous sample of its host up to its own
+        start = np.where(first, rows, np.roll(rows, 1) + 1)
+        spans = rows - start + 1
+        values = values / spans
+    else:
+        # A sample holds until the next sample of its host
+        start = rows
+        spans = np.where(last, 1, np.roll(rows, -1) - rows)
+
+    offsets = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    matrix = np.full((len(grid), columns.max(initial=-1) + 1), np.nan)
+    matrix[np.repeat(start, spans) + offsets, np.repeat(columns, spans)] = np.repeat(values, spans)
+    return matrix
+
+
+def hostMatrices(data, metrics):
+    """
+    Arrange the per-host samples of `metrics` in `data` (see `getData`, which
+    must also have loaded `HOST_KEYS`) into (time x host) matrices.
+
+    Returns the timestamps of the rows and a dictionary of matrices. Result files
+    written before the samples were keyed only hold the interleaved series; as
+    the hosts report in the same order every cycle, these are reshaped by host
+    count instead and the rows are numbered by cycle. The samples of result
+    files written with change-driven sampling are expanded to every cycle here,
+    only for the requested `metrics` (see `expandSamples`).
+    """
+    if 'changeThreshold' in data:
+        grid = data['tickTimestamp'][0]
+        timestamps = data['timestamp'][0]
+        hosts = data['hostIndex'][0]
+        matrices = {}
+        for metric in metrics:
+            matrices[metric] = expandSamples(grid, timestamps, hosts, data[metric][0], metric in CUMULATIVE_METRICS)
+        return grid, matrices
+
+    if 'hostIndex' in data:
+        timestamps = data['timestamp'][0]
+        hosts = data['hostIndex'][0]
+        matrices = {}
+        for metric in metrics:
+            times, matrices[metric] = hostMatrix(timestamps, hosts, data[metric][0])
+        return times, matrices
+
+    hostCount = int(data['hostsUp'][0]) + int(data['hostsDown'][0])
+    matrices = {metric: data[metric][0].reshape(-1, hostCount).astype(float) for metric in metrics}
+    times = np.arange(len(data[metrics[0]][0]) // hostCount)
+    return times, matrices
+
+
+def clusterSeries(data, metrics):
+    """
+    Reduce the per-host samples of `metrics` into one cluster-level value per
+    tick using `CLUSTER_REDUCTIONS` (e.g. total power, mean utilization).
+    """
+    times, matrices = hostMatrices(data, metrics)
+    return times, {metric: CLUSTER_REDUCTIONS[metric](matrix, axis=1) for metric, matrix in matrices.items()}
+
+
+# The index of the finished runs written by `LabSweep` in the results tree.
+MANIFEST = 'manifest.csv'
+
+# The name of the default workflow policy set of a sweep.
+DEFAULT_POLICIES = 'default'
+
+
+@functools.lru_cache(maxsize=8)
+def parseManifest(path, mtime):
+    runs = dict()
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            # Skip a line that was cut off by a crash
+            if None in row.values():
+                continue
+            row['seed'] = int(row['seed'])
+            row['repeat'] = int(row['repeat'])
+            row['duration'] = int(row['duration'])
+            runs[row['hash']] = row
+    return tuple(runs.values())
+
+
+def readManifest(base):
+    """
+    Return the runs recorded in the manifest of the results tree at `base` as
+    dictionaries of its columns (hash, trace, scheduler, topology, policies,
+    seed, repeat, path and duration), or `None` if the tree has no manifest.
+    The paths are made relative to the working directory and runs whose result
+    file no longer exists are left out.
+    """
+    path = os.path.join(base, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    runs = [dict(run, path=os.path.join(base, run['path'])) for run in parseManifest(path, mtime)]
+    return [run for run in runs if os.path.exists(run['path'])]
+
+
+def findRuns(base, **filters):
+    """
+    Return the finished runs in the manifest of the results tree at `base` that
+    match the `filters` on its columns, e.g. `findRuns(base, trace='askalon_ee',
+    scheduler='taskflow')`, ordered by scenario and repeat.
+    """
+    runs = [run for run in readManifest(base) or [] if all(run[key] == value for key, value in filters.items())]
+    return sorted(runs, key=lambda run: (run['trace'], run['scheduler'], run['topology'], run['policies'], run['repeat']))
+
+
+def scenarioPath(base, trace, scheduler, topology, policies=DEFAULT_POLICIES):
+    """Return the path of the result file of (the first repeat of) a scenario in the results tree at `base`."""
+    paths = repeatPaths(base, trace, scheduler, topology, policies)
+    return paths[0] if paths else f'{base}/{trace}/{scheduler}/{topology}.csv'
+
+
+def repeatPaths(base, trace, scheduler, topology, policies=DEFAULT_POLICIES):
+    """
+    Return the paths of the result files of all repeats of a scenario, ordered
+    by repeat. They are looked up in the manifest if the tree has one; otherwise
+    the tree is searched, where LabRunner writes the first repeat to
+    `<topology>.csv` and the following ones to `<topology>.<iteration>.csv`.
+    """
+    manifest = readManifest(base)
+    if manifest is not None:
+        runs = findRuns(base, trace=trace, scheduler=scheduler, topology=topology, policies=policies)
+        return [run['path'] for run in runs]
+
+    first = f'{base}/{trace}/{scheduler}/{topology}.csv'
+    repeats = []
+    for path in glob.glob(f'{base}/{trace}/{scheduler}/{glob.escape(topology)}.*.csv'):
+        iteration = os.path.basename(path)[len(topology) + 1:-len('.csv')]
+        if iteration.isdigit():
+            repeats.append((int(iteration), path))
+    return ([first] if os.path.exists(first) else []) + [path for _, path in sorted(repeats)]
+
+
+def findScenarios(base, policies=DEFAULT_POLICIES):
+    """
+    Return the (trace, scheduler, topology) of every scenario in the results
+    tree at `base`, from its manifest if it has one.
+    """
+    manifest = readManifest(base)
+    if manifest is not None:
+        runs = findRuns(base, policies=policies)
+        return list(dict.fromkeys((run['trace'], run['scheduler'], run['topology']) for run in runs))
+
+    scenarios = []
+    for path in sorted(glob.glob(f'{base}/*/*/*.csv')):
+        scheduler_dir, file = os.path.split(path)
+        trace_dir, scheduler = os.path.split(scheduler_dir)
+        topology = os.path.splitext(file)[0]
+        # Skip the files of the repeats after the first
+        if os.path.splitext(topology)[1][1:].isdigit():
+            continue
+        scenarios.append((os.path.basename(trace_dir), scheduler, topology))
+    return scenarios
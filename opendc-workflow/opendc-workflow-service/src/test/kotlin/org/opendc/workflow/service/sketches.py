@@ -0,0 +1,252 @@
+"""
+Mergeable sketches of the distribution of a series.
+
+A `DistributionSketch` summarizes any number of samples in bounded memory: a
+t-digest for the quantiles and whiskers of the box plots and a binned KDE for
+the violins. Sketches are built once per scenario, can be merged across repeats
+and seeds, and produce the statistics that `Axes.bxp` and `Axes.violin` draw, so
+the distribution figures no longer sort and convolve every sample.
+"""
+import math
+
+import numpy as np
+
+
+class TDigest:
+    """
+    A merging t-digest (Dunning): the samples are summarized by centroids whose
+    size is bounded by the arcsine scale function, so the quantiles near the
+    tails are the most accurate. `compression` bounds the number of centroids.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other):
+        if other.weights.size == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def compress(self, means, weights):
+        """Replace the centroids by the compression of the centroids (`means`, `weights`)."""
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        if total == 0:
+            self.means, self.weights = np.zeros(0), np.zeros(0)
+            return
+        # Assign every centroid to a unit interval of the scale function at the center of its weight, such that
+        # the quantile range covered by a merged centroid is at most one unit of the scale function.
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        clusters = np.floor(k - k[0]).astype(np.int64)
+        _, clusters = np.unique(clusters, return_inverse=True)
+        self.weights = np.bincount(clusters, weights)
+        self.means = np.bincount(clusters, weights * means) / self.weights
+
+    def quantile(self, q):
+        """Return the estimates of the quantiles `q` (in [0, 1])."""
+        q = np.asarray(q, dtype=float)
+        if self.weights.size == 0:
+            return np.full(q.shape, math.nan)
+        total = self.weights.sum()
+        # Interpolate between the centroid centers, anchored at the exact extremes
+        centers = np.concatenate([[0], np.cumsum(self.weights) - self.weights / 2, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * total, centers, values)
+
+    @property
+    def mean(self):
+        return np.sum(self.means * self.weights) / self.weights.sum() if self.weights.size else math.nan
+
+
+class KdeSketch:
+    """
+    A kernel density estimate over counts binned at a fixed `width`. The bins
+    grow to cover the observed range; beyond `maxBins` bins, pairs of bins are
+    merged and the width doubles, so sketches of the same metric always have
+    widths that differ by a power of two and can be merged.
+    """
+
+    def __init__(self, width, maxBins=4096):
+        self.width = width
+        self.maxBins = maxBins
+        self.origin = None
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        bins = np.floor(values / self.width).astype(np.int64)
+        self.add(bins.min(), np.bincount(bins - bins.min()))
+
+    def merge(self, other):
+        if other.origin is None:
+            return
+        other = other.copy()
+        while other.width < self.width:
+            other.coarsen()
+        while self.width < other.width:
+            self.coarsen()
+        self.add(other.origin, other.counts)
+
+    def add(self, origin, counts):
+        """Add the `counts` of the bins starting at bin `origin`."""
+        if self.origin is None:
+            self.origin, self.counts = origin, np.zeros(0, dtype=np.int64)
+        low = min(self.origin, origin)
+        high = max(self.origin + self.counts.size, origin + counts.size)
+        merged = np.zeros(high - low, dtype=np.int64)
+        merged[self.origin - low:self.origin - low + self.counts.size] += self.counts
+        merged[origin - low:origin - low + counts.size] += counts
+        self.origin, self.counts = low, merged
+        while self.counts.size > self.maxBins:
+            self.coarsen()
+
+    def coarsen(self):
+        """Merge pairs of bins, doubling the bin width."""
+        if self.origin is not None:
+            counts = self.counts
+            if self.origin % 2:
+                counts = np.concatenate([[0], counts])
+            if counts.size % 2:
+                counts = np.concatenate([counts, [0]])
+            self.origin = math.floor(self.origin / 2)
+            self.counts = counts.reshape(-1, 2).sum(axis=1)
+        self.width *= 2
+
+    def copy(self):
+        sketch = KdeSketch(self.width, self.maxBins)
+        sketch.origin, sketch.counts = self.origin, self.counts.copy()
+        return sketch
+
+    def density(self, points, bandwidth=None):
+        """Return the Gaussian KDE of the sketch at `points` (default bandwidth: Scott's rule)."""
+        points = np.asarray(points, dtype=float)
+        total = self.counts.sum()
+        if total == 0:
+            return np.zeros_like(points)
+        centers = (self.origin + np.arange(self.counts.size) + 0.5) * self.width
+        if bandwidth is None:
+            mean = np.sum(self.counts * centers) / total
+            std = math.sqrt(np.sum(self.counts * (centers - mean) ** 2) / total)
+            bandwidth = max(std * total ** (-1 / 5), self.width)
+        z = (points[:, None] - centers[None, :]) / bandwidth
+        return np.exp(-0.5 * z ** 2) @ self.counts / (total * bandwidth * math.sqrt(2 * math.pi))
+
+
+class DistributionSketch:
+    """The t-digest and binned KDE of a series, from which box and violin statistics are drawn."""
+
+    def __init__(self, width, compression=200):
+        self.digest = TDigest(compression)
+        self.kde = KdeSketch(width)
+
+    @classmethod
+    def of(cls, values, width, compression=200):
+        sketch = cls(width, compression)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def isEmpty(self):
+        return self.digest.weights.size == 0
+
+    def update(self, values):
+        self.digest.update(values)
+        self.kde.update(values)
+
+    def merge(self, other):
+        self.digest.merge(other.digest)
+        self.kde.merge(other.kde)
+        return self
+
+    def boxStats(self, whis=1.5, label=None):
+        """
+        Return the statistics of a box plot as accepted by `Axes.bxp`. The whiskers
+        extend to `whis` times the interquartile range, clamped to the extremes.
+        """
+        if self.isEmpty:
+            raise ValueError('Cannot draw the box plot of an empty sketch')
+        q1, med, q3 = self.digest.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return {
+            'label': label,
+            'mean': self.digest.mean,
+            'med': med,
+            'q1': q1,
+            'q3': q3,
+            'iqr': iqr,
+            'whislo': max(self.digest.min, q1 - whis * iqr),
+            'whishi': min(self.digest.max, q3 + whis * iqr),
+            'fliers': np.zeros(0),
+        }
+
+    def violinStats(self, points=100):
+        """Return the statistics of a violin as accepted by `Axes.violin`."""
+        if self.isEmpty:
+            raise ValueError('Cannot draw the violin of an empty sketch')
+        coords = np.linspace(self.digest.min, self.digest.max, points)
+        return {
+            'coords': coords,
+            'vals': self.kde.density(coords),
+            'mean': self.digest.mean,
+            'median': float(self.digest.quantile(0.5)),
+            'min': self.digest.min,
+            'max': self.digest.max,
+        }
+
+    def toArrays(self):
+        """Return the state of the sketch as a dictionary of arrays and scalars, e.g. to cache it."""
+        return {
+            'means': self.digest.means,
+            'weights': self.digest.weights,
+            'compression': self.digest.compression,
+            'min': float(self.digest.min),
+            'max': float(self.digest.max),
+            'width': self.kde.width,
+            'origin': self.kde.origin,
+            'counts': self.kde.counts,
+        }
+
+    @classmethod
+    def fromArrays(cls, state):
+        sketch = cls(state['width'], state['compression'])
+        sketch.digest.means = np.asarray(state['means'])
+        sketch.digest.weights = np.asarray(state['weights'])
+        sketch.digest.min, sketch.digest.max = state['min'], state['max']
+        sketch.kde.origin = None if state['origin'] is None else int(state['origin'])
+        sketch.kde.counts = np.asarray(state['counts'])
+        return sketch
+
+
+def mergeSketches(sketches):
+    """Return the merge of the `sketches`, e.g. of the repeats or seeds of a scenario."""
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError('Cannot merge an empty list of sketches')
+    merged = DistributionSketch(sketches[0].kde.width, sketches[0].digest.compression)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -0,0 +1,285 @@
+"""
+Streaming analysis of a lab run while it is in progress.
+
+LabRunner appends every host sample to a `.stream` file (see StreamComputeMonitor).
+`tailStream` follows such a file and `StreamStats` keeps online aggregates of the
+per-cycle cluster series drawn by the figures: running sums, Welford mean and
+variance, P-square quartiles for the box plots, a binned KDE sketch for the
+violins and a rolling window for the moving averages. Every sample is read once.
+"""
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+from sketches import KdeSketch
+
+STREAM_COLUMNS = ['timestamp', 'hostIndex', 'energyUsage', 'powerUsage', 'cpuUtilization', 'guestsRunning']
+
+
+def tailStream(path, poll=1.0, follow=True):
+    """
+    Yield the rows appended to the stream at `path` as (n x columns) arrays, as
+    soon as they are complete. If `follow` is set, wait for new rows every `poll`
+    seconds; otherwise stop at the end of the stream. Yields `None` when the
+    stream is truncated because the runner started a new run.
+    """
+    offset = 0
+    partial = None
+    while True:
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0
+        if size < offset:
+            offset, partial = 0, None
+            yield None
+
+        chunk = b''
+        if size > offset:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read(size - offset)
+            offset += len(chunk)
+
+        if partial is None:
+            # Skip the header of the stream, once it is complete
+            if b'\n' not in chunk:
+                offset = 0
+                chunk = b''
+            else:
+                partial = b''
+                chunk = chunk[chunk.index(b'\n') + 1:]
+
+        text = (partial or b'') + chunk
+        end = text.rfind(b'\n') + 1
+        if partial is not None:
+            partial = text[end:]
+        if end > 0:
+            rows = np.fromstring(text[:end - 1].replace(b'\n', b';').decode(), dtype=float, sep=';')
+            yield rows.reshape(-1, len(STREAM_COLUMNS))
+        elif not follow:
+            return
+        else:
+            time.sleep(poll)
+
+
+class Welford:
+    """Running count, sum, mean, variance and extremes, updated in batches."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            return
+        # Merge the moments of the batch with the running moments (Chan et al.)
+        count = values.size
+        mean = values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        delta = mean - self.mean
+        total = self.count + count
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.total += values.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """The P-square estimate of the `p`-quantile (Jain and Chlamtac), in constant memory."""
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, values):
+        for x in np.asarray(values, dtype=float).ravel():
+            self.add(x)
+
+    def add(self, x):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Piecewise-parabolic prediction, falling back to linear if it leaves the neighbours
+                h = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = h
+                n[i] += d
+
+    @property
+    def value(self):
+        q = self.heights
+        if len(q) < 5:
+            return float(np.percentile(q, self.p * 100)) if q else math.nan
+        return q[2]
+
+
+class RollingWindow:
+    """The last `n` values of a series in a ring buffer, with their running sum."""
+
+    def __init__(self, n):
+        self.buffer = np.zeros(n)
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)[-self.buffer.size:]
+        n = self.buffer.size
+        for value in values:
+            slot = self.count % n
+            self.total += value - self.buffer[slot]
+            self.buffer[slot] = value
+            self.count += 1
+
+    def values(self):
+        n = self.buffer.size
+        if self.count < n:
+            return self.buffer[:self.count].copy()
+        return np.roll(self.buffer, -(self.count % n))
+
+    @property
+    def mean(self):
+        return self.total / min(self.count, self.buffer.size) if self.count else math.nan
+
+
+class SeriesStats:
+    """The online aggregates of a single per-cycle series."""
+
+    def __init__(self, width, window=15):
+        self.moments = Welford()
+        self.quartiles = [P2Quantile(p) for p in (0.25, 0.5, 0.75)]
+        self.kde = KdeSketch(width)
+        self.rolling = RollingWindow(window)
+
+    def update(self, values):
+        self.moments.update(values)
+        for quartile in self.quartiles:
+            quartile.update(values)
+        self.kde.update(values)
+        self.rolling.update(values)
+
+
+class StreamStats:
+    """
+    Online aggregates of the per-cycle cluster series of a stream: the energy
+    usage (Wh), the CPU utilization (%) and the number of active jobs, as drawn
+    by the figures. The samples of the last cycle are held back until the cycle
+    is complete.
+    """
+
+    def __init__(self, window=15):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.cycles = 0
+        self.pending = np.zeros((0, len(STREAM_COLUMNS)))
+        self.series = {
+            'energy': SeriesStats(1.0, self.window),
+            'cpuUtil': SeriesStats(1.0, self.window),
+            'activeJobs': SeriesStats(1.0, self.window),
+        }
+
+    def update(self, rows, final=False):
+        """Add the stream `rows`; with `final`, the last cycle is considered complete as well."""
+        rows = np.concatenate([self.pending, rows])
+        timestamps = rows[:, 0]
+        complete = len(rows) if final else np.searchsorted(timestamps, timestamps[-1]) if len(rows) else 0
+        self.pending = rows[complete:]
+        rows = rows[:complete]
+        if len(rows) == 0:
+            return
+
+        cycles, inverse = np.unique(rows[:, 0], return_inverse=True)
+        hosts = np.bincount(inverse)
+        energy = np.bincount(inverse, rows[:, 2]) / 3600
+        cpuUtil = np.bincount(inverse, rows[:, 4]) / hosts * 100
+        activeJobs = np.bincount(inverse, rows[:, 5])
+        self.series['energy'].update(energy)
+        self.series['cpuUtil'].update(cpuUtil)
+        self.series['activeJobs'].update(activeJobs)
+        self.cycles += len(cycles)
+
+    def summary(self):
+        """Return the current aggregates of every series as a dictionary."""
+        return {
+            name: {
+                'total': s.moments.total,
+                'mean': s.moments.mean,
+                'std': math.sqrt(s.moments.variance),
+                'min': s.moments.min,
+                'max': s.moments.max,
+                'quartiles': [q.value for q in s.quartiles],
+                'rolling': s.rolling.mean,
+            } for name, s in self.series.items()
+        }
+
+
+def followStream(path, poll=1.0, follow=True, window=15):
+    """Follow the stream at `path`, yielding its `StreamStats` after every batch of complete rows."""
+    stats = StreamStats(window)
+    for rows in tailStream(path, poll, follow):
+        if rows is None:
+            stats.reset()
+            continue
+        stats.update(rows)
+        yield stats
+    stats.update(np.zeros((0, len(STREAM_COLUMNS))), final=True)
+    yield stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow the host samples that LabRunner streams during a run.")
+    parser.add_argument('stream', help="the .stream file written by LabRunner")
+    parser.add_argument('--poll', type=float, default=1.0, help="the interval in seconds at which the stream is polled")
+    parser.add_argument('--once', action='store_true', help="summarize the stream once instead of following it")
+    args = parser.parse_args()
+
+    for stats in followStream(args.stream, args.poll, follow=not args.once):
+        energy = stats.summary()['energy']
+        cpuUtil = stats.summary()['cpuUtil']
+        print(f"cycles {stats.cycles}",
+              f"energy {energy['total']:.1f} Wh (mean {energy['mean']:.2f} std {energy['std']:.2f}"
+              f" min {energy['min']:.2f} max {energy['max']:.2f})",
+              f"cpu {cpuUtil['mean']:.1f}% (quartiles {', '.join(f'{q:.1f}' for q in cpuUtil['quartiles'])})",
+              sep=' | ', flush=True)
@@ -0,0 +1,34 @@
+"""Tests of the benchmarks of the figure pipeline in `benchmark`."""
+import pytest
+
+from benchmark import COLUMNS, STAGES, readRows, regressions, runBenchmarks, writeRows
+
+
+@pytest.fixture(scope='module')
+def rows():
+    return runBenchmarks([2], [50, 100], repeats=1)
+
+
+def test_run_all_stages(rows):
+    assert [(row['stage'], row['cycles']) for row in rows] == [(stage, c) for c in (50, 100) for stage in STAGES]
+    for row in rows:
+        assert row['samples'] == 2 * row['cycles']
+        assert row['seconds'] > 0
+        assert row['peakMB'] > 0
+
+
+def test_run_selected_stages():
+    rows = runBenchmarks([2], [50], repeats=1, only=('reduce',))
+    assert [row['stage'] for row in rows] == ['reduce']
+
+
+def test_regressions(rows, tmp_path):
+    path = tmp_path / 'baseline.csv'
+    writeRows(path, rows)
+    baseline = readRows(path)
+    assert list(baseline[0]) == COLUMNS
+
+    assert regressions(rows, baseline, 0.25) == []
+
+    slower = [{**row, 'seconds': row['seconds'] * 2} for row in rows]
+    assert [row for row, _ in regressions(slower, baseline, 0.25)] == slower
@@ -0,0 +1,62 @@
+"""Tests of the windowed reductions in `reductions`."""
+import numpy as np
+import pytest
+
+from reductions import ewma, movingMax, movingMin, movingPercentile, padding
+
+
+def recursiveEwma(a, alpha):
+    """The exponentially weighted moving average, evaluated one sample at a time."""
+    result = np.empty_like(a)
+    result[..., 0] = a[..., 0]
+    for t in range(1, a.shape[-1]):
+        result[..., t] = alpha * a[..., t] + (1 - alpha) * result[..., t - 1]
+    return result
+
+
+@pytest.mark.parametrize('alpha', [0.01, 0.05, 0.1, 0.5, 0.9])
+@pytest.mark.parametrize('magnitude', [1.0, 1e7, 1e9, 1e200])
+def test_ewma_matches_recursion(alpha, magnitude):
+    rng = np.random.default_rng(0)
+    a = rng.random((3, 20000)) * magnitude
+    expected = recursiveEwma(a, alpha)
+    actual = ewma(a, alpha)
+    assert np.all(np.isfinite(actual))
+    np.testing.assert_allclose(actual, expected, rtol=1e-9)
+
+
+def test_ewma_constant():
+    np.testing.assert_allclose(ewma(np.full(20000, 1e7), 0.05), 1e7, rtol=1e-12)
+
+
+def test_ewma_zeros():
+    np.testing.assert_array_equal(ewma(np.zeros(1000), 0.1), 0.0)
+
+
+def naiveWindows(a, n, mode, reduce):
+    """The reduction of every window of `n` samples in `mode`, evaluated one window at a time."""
+    before, after = padding(n, mode)
+    t = a.shape[-1]
+    return np.stack([reduce(a[..., max(0, s):s + n]) for s in range(-before, t - n + 1 + after)], axis=-1)
+
+
+@pytest.mark.parametrize('mode', ['valid', 'trailing', 'centered'])
+@pytest.mark.parametrize('n', [1, 2, 7, 50])
+def test_moving_windows_match_naive(mode, n):
+    a = np.random.default_rng(2).random((2, 300))
+
+    np.testing.assert_array_equal(movingMin(a, n, mode), naiveWindows(a, n, mode, lambda w: w.min(axis=-1)))
+    np.testing.assert_array_equal(movingMax(a, n, mode), naiveWindows(a, n, mode, lambda w: w.max(axis=-1)))
+    for q in (0, 25, 50, 90, 100):
+        np.testing.assert_allclose(movingPercentile(a, n, q, mode),
+                                   naiveWindows(a, n, mode, lambda w: np.percentile(w, q, axis=-1)))
+
+
+def test_moving_percentile_chunks():
+    a = np.random.default_rng(3).random(1000)
+    np.testing.assert_array_equal(movingPercentile(a, 10, 75, chunk=64), movingPercentile(a, 10, 75))
+
+
+def test_moving_percentile_window_of_one():
+    a = np.random.default_rng(4).random(100)
+    np.testing.assert_array_equal(movingPercentile(a, 1, 30), a)
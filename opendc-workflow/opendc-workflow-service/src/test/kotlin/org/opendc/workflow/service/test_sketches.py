@@ -0,0 +1,76 @@
+"""Tests of the mergeable distribution sketches in `sketches`."""
+import numpy as np
+import pytest
+
+from sketches import DistributionSketch, mergeSketches
+
+QUANTILES = np.array([0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999])
+
+
+def rankError(samples, estimates, q):
+    """Return the largest distance between the ranks of the `estimates` in `samples` and the quantiles `q`."""
+    ranks = np.searchsorted(np.sort(samples), estimates) / len(samples)
+    return np.max(np.abs(ranks - q))
+
+
+@pytest.mark.parametrize('distribution', ['normal', 'exponential', 'uniform'])
+def test_quantile_accuracy(distribution):
+    samples = getattr(np.random.default_rng(0), distribution)(size=100000)
+    sketch = DistributionSketch.of(samples, 0.1)
+
+    assert rankError(samples, sketch.digest.quantile(QUANTILES), QUANTILES) < 0.005
+    assert sketch.digest.count == samples.size
+    assert sketch.digest.min == samples.min()
+    assert sketch.digest.max == samples.max()
+    assert sketch.digest.mean == pytest.approx(samples.mean())
+
+
+def test_merge_order_independent():
+    samples = np.random.default_rng(1).normal(size=100000)
+    parts = [DistributionSketch.of(part, 0.1) for part in np.array_split(samples, 7)]
+
+    forward = mergeSketches(parts)
+    backward = mergeSketches(parts[::-1])
+
+    for merged in (forward, backward):
+        assert merged.digest.count == samples.size
+        assert (merged.digest.min, merged.digest.max) == (samples.min(), samples.max())
+        assert rankError(samples, merged.digest.quantile(QUANTILES), QUANTILES) < 0.005
+    np.testing.assert_array_equal(forward.kde.counts, backward.kde.counts)
+    assert forward.kde.origin == backward.kde.origin
+
+
+@pytest.mark.parametrize('order', [1, -1])
+def test_merge_empty(order):
+    sketches = [DistributionSketch.of([], 0.1), DistributionSketch.of(np.arange(10.), 0.1)][::order]
+
+    merged = mergeSketches(sketches)
+
+    assert merged.digest.quantile(0.5) == 4.5
+    assert merged.digest.count == 10
+
+
+def test_merge_all_empty():
+    merged = mergeSketches([DistributionSketch.of([], 0.1), DistributionSketch.of([], 0.1)])
+
+    assert merged.isEmpty
+    assert np.isnan(merged.digest.quantile(0.5))
+
+
+def test_empty_statistics():
+    sketch = DistributionSketch.of([np.nan], 0.1)
+
+    assert sketch.isEmpty
+    with pytest.raises(ValueError):
+        sketch.boxStats()
+    with pytest.raises(ValueError):
+        sketch.violinStats()
+    with pytest.raises(ValueError):
+        mergeSketches([])
+
+
+def test_empty_round_trip():
+    sketch = DistributionSketch.fromArrays(DistributionSketch.of([], 0.1).toArrays())
+
+    assert sketch.isEmpty
+    assert mergeSketches([sketch, DistributionSketch.of([1.0, 2.0], 0.1)]).digest.count == 2